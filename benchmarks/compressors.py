@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+CPU per message and compression ratio of frame codecs on FastoCloud payloads
+
+python3 -m benchmarks.compressors [--seconds 0.2]
+"""
+import argparse
+import json
+import time
+
+from benchmarks.payloads import corpus
+from pyfastocloud.compressor_zlib import CompressorZlib, CompressorZlibThreshold
+
+
+def codecs() -> dict:
+    return {
+        'gzip-9': CompressorZlib(True),
+        'gzip-6': CompressorZlib(True, 6),
+        'gzip-1': CompressorZlib(True, 1),
+        'zlib-6': CompressorZlib(False, 6),
+        'deflate-6': CompressorZlib(False, 6, raw=True),
+        'gzip-9/1<1k': CompressorZlibThreshold(True),
+        'gzip-6/1<4k': CompressorZlibThreshold(True, 6, 4096),
+    }
+
+
+def measure(codec, data: bytes, seconds: float) -> (float, float, float):
+    compressed = codec.compress(data)
+    count = 0
+    start = time.process_time()
+    elapsed = 0.0
+    while elapsed < seconds:
+        for _ in range(32):
+            codec.compress(data)
+        count += 32
+        elapsed = time.process_time() - start
+    compress_us = elapsed / count * 1e6
+
+    count = 0
+    start = time.process_time()
+    elapsed = 0.0
+    while elapsed < seconds:
+        for _ in range(32):
+            codec.decompress(compressed)
+        count += 32
+        elapsed = time.process_time() - start
+    decompress_us = elapsed / count * 1e6
+    return compress_us, decompress_us, len(data) / len(compressed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compression codecs benchmark')
+    parser.add_argument('--seconds', type=float, default=0.2, help='CPU time per measurement')
+    args = parser.parse_args()
+
+    print('{0:<18} {1:<14} {2:>8} {3:>12} {4:>14} {5:>8}'.format('payload', 'codec', 'bytes', 'compress_us',
+                                                                  'decompress_us', 'ratio'))
+    for payload_name, message in corpus().items():
+        data = json.dumps(message.to_dict()).encode()
+        for codec_name, codec in codecs().items():
+            compress_us, decompress_us, ratio = measure(codec, data, args.seconds)
+            print('{0:<18} {1:<14} {2:>8} {3:>12.2f} {4:>14.2f} {5:>8.2f}'.format(
+                payload_name, codec_name, len(data), compress_us, decompress_us, ratio))
+
+
+if __name__ == '__main__':
+    main()
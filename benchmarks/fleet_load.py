@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Client stack throughput and latency against local node simulator, all nodes driven by one event loop
+
+python3 -m benchmarks.fleet_load [--nodes 100] [--streams 100] [--seconds 10]
+"""
+import argparse
+import asyncio
+import time
+
+from pyfastocloud.client_asyncio import AsyncioClient
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.node_simulator import NodeSimulator
+
+
+class _CountingHandler(IClientHandler):
+    def __init__(self):
+        self.notifications = 0
+
+    def process_response(self, client, req, resp):
+        pass
+
+    def process_request(self, client, req):
+        self.notifications += 1
+
+    def on_client_state_changed(self, client, status):
+        pass
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+async def _ping_loop(client: AsyncioClient, latencies: list, deadline: float):
+    command_id = 1
+    while time.monotonic() < deadline:
+        command_id += 1
+        start = time.perf_counter()
+        resp = await client.ping(command_id)
+        if resp and not resp.is_error():
+            latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    node = NodeSimulator(streams_count=args.streams, statistic_interval=args.statistic_interval,
+                         ml_rate=args.ml_rate)
+    port = await node.start()
+    handler = _CountingHandler()
+    clients = [AsyncioClient(FastoCloudClient, '127.0.0.1', port, handler) for _ in range(args.nodes)]
+    await asyncio.gather(*[client.connect() for client in clients])
+    await asyncio.gather(*[client.activate(0, 'license') for client in clients])
+
+    latencies = []
+    start = time.monotonic()
+    await asyncio.gather(*[_ping_loop(client, latencies, start + args.seconds) for client in clients])
+    elapsed = time.monotonic() - start
+
+    print('nodes: {0}, streams per node: {1}, seconds: {2:.1f}'.format(args.nodes, args.streams, elapsed))
+    print('requests/s: {0:.0f}'.format(len(latencies) / elapsed))
+    print('notifications/s: {0:.0f}'.format(handler.notifications / elapsed))
+    print('rtt ms p50: {0:.3f} p99: {1:.3f} max: {2:.3f}'.format(
+        _percentile(latencies, 0.5) * 1000, _percentile(latencies, 0.99) * 1000, max(latencies or [0]) * 1000))
+
+    for client in clients:
+        client.disconnect()
+    await node.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fleet load test against node simulator')
+    parser.add_argument('--nodes', type=int, default=100)
+    parser.add_argument('--streams', type=int, default=100, help='synthetic streams per node')
+    parser.add_argument('--statistic-interval', type=float, default=1)
+    parser.add_argument('--ml-rate', type=float, default=0)
+    parser.add_argument('--seconds', type=float, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
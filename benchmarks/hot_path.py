@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Per message pipeline benchmark:
+encode: to_dict -> serializer.dumps -> compress -> length prefix
+decode: FrameDecoder -> decompress -> parse_responses_or_requests
+
+python3 -m benchmarks.hot_path [--seconds 0.5] [--save baseline.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import platform
+import struct
+import sys
+import time
+import tracemalloc
+
+from benchmarks.payloads import corpus
+from pyfastocloud.client import Client
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.frame_decoder import FrameDecoder
+from pyfastocloud.json_rpc import parse_responses_or_requests
+from pyfastocloud.json_serializer import JsonStdSerializer, make_json_serializer
+
+REGRESSION_THRESHOLD = 0.15
+
+
+class Pipeline:
+    def __init__(self, serializer, compressor):
+        self.serializer = serializer
+        self.compressor = compressor
+        self.decoder = FrameDecoder(Client.MAX_PACKET_SIZE)
+
+    def encode(self, message) -> bytes:
+        compressed = self.compressor.compress(self.serializer.dumps(message.to_dict()))
+        return struct.pack('>I', len(compressed)) + compressed
+
+    def decode(self, frame: bytes) -> list:
+        self.decoder.feed(frame)
+        body = self.decoder.next_frame()
+        return parse_responses_or_requests(self.compressor.decompress(body), self.serializer)
+
+
+def _rate(func, arg, seconds: float) -> float:
+    count = 0
+    batch = 1
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        for _ in range(batch):
+            func(arg)
+        count += batch
+        batch = min(batch * 2, 1024)
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def _peak_bytes(func, arg) -> int:
+    func(arg)
+    tracemalloc.start()
+    try:
+        func(arg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(seconds: float) -> dict:
+    pipelines = {
+        '{0}+gzip-9'.format(make_json_serializer().name()): Pipeline(make_json_serializer(), CompressorZlib(True)),
+        'json+gzip-9': Pipeline(JsonStdSerializer(), CompressorZlib(True)),
+    }
+    results = {}
+    for pipeline_name, pipeline in pipelines.items():
+        for payload_name, message in corpus().items():
+            frame = pipeline.encode(message)
+            payload_size = len(pipeline.serializer.dumps(message.to_dict()))
+            encode_rate = _rate(pipeline.encode, message, seconds)
+            decode_rate = _rate(pipeline.decode, frame, seconds)
+            results['{0}/{1}'.format(pipeline_name, payload_name)] = {
+                'payload_bytes': payload_size,
+                'frame_bytes': len(frame),
+                'encode_msgs_per_sec': encode_rate,
+                'encode_bytes_per_sec': encode_rate * payload_size,
+                'encode_peak_bytes': _peak_bytes(pipeline.encode, message),
+                'decode_msgs_per_sec': decode_rate,
+                'decode_bytes_per_sec': decode_rate * payload_size,
+                'decode_peak_bytes': _peak_bytes(pipeline.decode, frame),
+            }
+    return results
+
+
+def report(results: dict, baseline=None) -> int:
+    regressions = 0
+    print('{0:<40} {1:>9} {2:>12} {3:>10} {4:>12} {5:>10} {6:>10}'.format(
+        'case', 'bytes', 'enc_msg/s', 'enc_MB/s', 'dec_msg/s', 'dec_MB/s', 'peak_KB'))
+    for name, result in results.items():
+        line = '{0:<40} {1:>9} {2:>12.0f} {3:>10.1f} {4:>12.0f} {5:>10.1f} {6:>10.1f}'.format(
+            name, result['payload_bytes'], result['encode_msgs_per_sec'], result['encode_bytes_per_sec'] / 1e6,
+            result['decode_msgs_per_sec'], result['decode_bytes_per_sec'] / 1e6,
+            max(result['encode_peak_bytes'], result['decode_peak_bytes']) / 1024)
+        if baseline and name in baseline:
+            old = baseline[name]
+            deltas = []
+            for key in ('encode_msgs_per_sec', 'decode_msgs_per_sec'):
+                delta = result[key] / old[key] - 1
+                deltas.append('{0:+.0%}'.format(delta))
+                if delta < -REGRESSION_THRESHOLD:
+                    regressions += 1
+            line += '  enc {0} dec {1}'.format(*deltas)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Message hot path benchmark')
+    parser.add_argument('--seconds', type=float, default=0.5, help='wall time per measurement')
+    parser.add_argument('--save', help='write results as baseline json')
+    parser.add_argument('--compare', help='baseline json, exit code 1 if throughput dropped')
+    args = parser.parse_args()
+
+    results = run(args.seconds)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    regressions = report(results, baseline)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version, 'platform': platform.platform(), 'results': results}, f, indent=2)
+
+    if regressions:
+        print('{0} regressions over {1:.0%}'.format(regressions, REGRESSION_THRESHOLD))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Representative FastoCloud JSON-RPC messages used by benchmarks
+"""
+from pyfastocloud.json_rpc import Request, Response
+
+
+def ping_request() -> Request:
+    return Request('0000000000000001', 'ping_service', {'timestamp': 1610534848000})
+
+
+def pong_response() -> Response:
+    return Response('0000000000000001', {'timestamp': 1610534848012})
+
+
+def stream_config(sid: int) -> dict:
+    return {
+        'id': '5ffee0e6d1e6ba6e7d5d{0:04d}'.format(sid),
+        'type': 1,
+        'output': [{'id': 0, 'uri': 'http://0.0.0.0:8000/master.m3u8', 'http_root': '/hls/{0}'.format(sid),
+                    'hls_type': 'pull', 'chunk_duration': 10}],
+        'input': [{'id': 0, 'uri': 'udp://239.0.0.{0}:1234'.format(sid % 255),
+                   'user_agent': 0, 'stream_link': False}],
+        'have_video': True,
+        'have_audio': True,
+        'audio_select': -1,
+        'auto_exit_time': 0,
+        'loop': False,
+        'avformat': False,
+        'restart_attempts': 10,
+        'feedback_directory': '/home/fastocloud/streamer/feedback/{0}'.format(sid),
+        'log_level': 6,
+        'video_codec': 'x264enc',
+        'audio_codec': 'faac',
+        'volume': 1.0,
+        'frame_rate': {'num': 25, 'den': 1},
+        'size': {'width': 1280, 'height': 720},
+        'video_bitrate': 4000000,
+        'audio_bitrate': 128000,
+    }
+
+
+def start_stream_request(sid: int) -> Request:
+    return Request('{0:016x}'.format(sid), 'start_stream', {'config': stream_config(sid)})
+
+
+def sync_service_request(count: int) -> Request:
+    return Request('00000000000000ff', 'sync_service', {'streams': [stream_config(i) for i in range(count)]})
+
+
+def statistic_stream_request(sid: int) -> Request:
+    return Request(None, 'statistic_stream', {
+        'id': '5ffee0e6d1e6ba6e7d5d{0:04d}'.format(sid),
+        'type': 1,
+        'cpu': 12.5,
+        'rss': 104857600,
+        'status': 4,
+        'loop_start_time': 1610534000000,
+        'restarts': 0,
+        'start_time': 1610534000000,
+        'timestamp': 1610534848000,
+        'idle_time': 0,
+        'quality': 100,
+        'input_streams': [{'id': 0, 'last_update': 1610534848000, 'prev_total_bytes': 1048576000,
+                           'total_bytes': 1049076000, 'bps': 500000, 'dbps': 500000}],
+        'output_streams': [{'id': 0, 'last_update': 1610534848000, 'prev_total_bytes': 1048576000,
+                            'total_bytes': 1049076000, 'bps': 480000, 'dbps': 480000}],
+    })
+
+
+def statistic_service_request() -> Request:
+    return Request(None, 'statistic_service', {
+        'id': '5ffee0e6d1e6ba6e7d5d0000',
+        'cpu': 23.7,
+        'gpu': 0,
+        'load_average': '1.12 0.97 0.90',
+        'memory_total': 16691740672,
+        'memory_free': 10252439552,
+        'hdd_total': 502468108288,
+        'hdd_free': 309543342080,
+        'bandwidth_in': 12500000,
+        'bandwidth_out': 48000000,
+        'uptime': 864000,
+        'timestamp': 1610534848000,
+        'total_bytes_in': 1099511627776,
+        'total_bytes_out': 4398046511104,
+        'online_users': {'daemon': 2, 'http': 120, 'vods': 14, 'cods': 0},
+    })
+
+
+def quit_status_stream_request(sid: int) -> Request:
+    return Request(None, 'quit_status_stream', {'id': '5ffee0e6d1e6ba6e7d5d{0:04d}'.format(sid), 'exit_status': 0,
+                                                'signal': 15})
+
+
+def vods_response(count: int) -> Response:
+    vods = [{'name': 'Movie {0}'.format(i), 'path': '/home/fastocloud/vods/movie_{0}.mp4'.format(i),
+             'icon': 'https://fastocloud.com/images/unknown_channel.png', 'duration': 5400000 + i,
+             'description': 'Movie {0} description'.format(i)} for i in range(count)]
+    return Response('0000000000000003', {'vods': vods})
+
+
+def ml_notification_request(boxes: int) -> Request:
+    images = [{'unique_component_id': 1, 'class_id': i % 4, 'object_id': 1000 + i, 'confidence': 0.87,
+               'left': 10 * i, 'top': 20 + i, 'width': 64, 'height': 128} for i in range(boxes)]
+    return Request(None, 'ml_notification_stream', {'id': '5ffee0e6d1e6ba6e7d5d0001', 'images': images})
+
+
+def ffprobe_response() -> Response:
+    streams = [
+        {'index': 0, 'codec_name': 'h264', 'codec_type': 'video', 'profile': 'Main', 'width': 1280, 'height': 720,
+         'pix_fmt': 'yuv420p', 'r_frame_rate': '30/1', 'avg_frame_rate': '30/1', 'time_base': '1/15360',
+         'duration': '74.033333', 'bit_rate': '4451073', 'nb_frames': '2221',
+         'tags': {'language': 'und', 'handler_name': 'ISO Media file produced by Google Inc.'}},
+        {'index': 1, 'codec_name': 'aac', 'codec_type': 'audio', 'profile': 'LC', 'sample_fmt': 'fltp',
+         'sample_rate': '44100', 'channels': 2, 'channel_layout': 'stereo', 'r_frame_rate': '0/0',
+         'avg_frame_rate': '0/0', 'time_base': '1/44100', 'duration': '74.048435', 'bit_rate': '128037',
+         'tags': {'language': 'und', 'handler_name': 'ISO Media file produced by Google Inc.'}},
+    ]
+    fmt = {'filename': 'http://example.com/movie.mp4', 'nb_streams': 2, 'nb_programs': 0,
+           'format_name': 'mov,mp4,m4a,3gp,3g2,mj2', 'format_long_name': 'QuickTime / MOV',
+           'start_time': '0.000000', 'duration': '74.048372', 'size': '42414042', 'bit_rate': '4582306',
+           'probe_score': 100}
+    return Response('0000000000000002', {'streams': streams, 'format': fmt})
+
+
+def corpus() -> dict:
+    """
+    name: json-rpc message
+    """
+    return {
+        'ping': ping_request(),
+        'pong': pong_response(),
+        'start_stream': start_stream_request(1),
+        'statistic_stream': statistic_stream_request(1),
+        'ml_notification': ml_notification_request(16),
+        'ffprobe': ffprobe_response(),
+        'statistic_service': statistic_service_request(),
+        'quit_status_stream': quit_status_stream_request(1),
+        'sync_service_200': sync_service_request(200),
+        'scan_folder_vods_1000': vods_response(1000),
+    }
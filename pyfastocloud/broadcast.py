@@ -0,0 +1,110 @@
+import time
+
+try:
+    from gevent.pool import Pool
+except ImportError:
+    Pool = None
+
+from pyfastocloud.client import generate_json_rpc_response_error
+from pyfastocloud.json_rpc import Response, JsonRPCErrorCode
+
+
+class BroadcastResult:
+    """
+    Responses of broadcast per client, local failures (not sent, timeout, connection lost)
+    are error responses with server, timeout and connection error codes
+    """
+
+    def __init__(self):
+        self.successes = {}  # client: Response
+        self.errors = {}  # client: Response
+        self.latencies = {}  # client: seconds from send to response
+        self.elapsed = 0.0
+
+    def __len__(self):
+        return len(self.successes) + len(self.errors)
+
+    def is_ok(self) -> bool:
+        return not self.errors
+
+    def mean_latency(self) -> float:
+        return sum(self.latencies.values()) / len(self.latencies) if self.latencies else 0.0
+
+    def max_latency(self) -> float:
+        return max(self.latencies.values(), default=0.0)
+
+
+class Broadcast:
+    """
+    Sends one command to many clients concurrently from gevent pool (at most concurrency nodes in flight)
+    and collects responses, every node waits timeout seconds for response.
+    Clients must use gevent socket_mod, be connected (activated for service commands)
+    and not be read by other greenlets (ClientPool) during broadcast.
+
+    broadcast = Broadcast(concurrency=100, timeout=10)
+    result = broadcast.send(clients, 'stop_service', 0)
+    result = broadcast.send(clients, lambda client: client.get_log_service(client.next_command_id(), url))
+    """
+    DEFAULT_CONCURRENCY = 64
+    DEFAULT_TIMEOUT = 10
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, clock=time.monotonic):
+        if Pool is None:
+            raise ImportError('gevent package required')
+
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._clock = clock
+
+    def send(self, clients, command, *args, **kwargs) -> BroadcastResult:
+        """
+        command is client method name called as method(client.next_command_id(), *args, **kwargs)
+        or callable(client) returning RequestReturn
+        """
+        result = BroadcastResult()
+        start = self._clock()
+        pool = Pool(self.concurrency)
+        for client in clients:
+            pool.spawn(self._send_one, result, client, command, args, kwargs)
+        pool.join()
+        result.elapsed = self._clock() - start
+        return result
+
+    # private
+    def _send_one(self, result: BroadcastResult, client, command, args: tuple, kwargs: dict):
+        cid = None
+        sent = self._clock()
+        try:
+            if isinstance(command, str):
+                res, cid = getattr(client, command)(client.next_command_id(), *args, **kwargs)
+            else:
+                res, cid = command(client)
+            if not res or cid is None:
+                result.errors[client] = generate_json_rpc_response_error('Send failed',
+                                                                         JsonRPCErrorCode.JSON_RPC_SERVER_ERROR, cid)
+                return
+
+            resp = client.wait_response(cid, self.timeout)
+        except Exception as ex:
+            # failure of one node must not escape greenlet and drop node from result
+            result.latencies[client] = self._clock() - sent
+            result.errors[client] = generate_json_rpc_response_error(str(ex), JsonRPCErrorCode.JSON_RPC_INTERNAL_ERROR,
+                                                                     cid)
+            return
+
+        if resp is None:
+            result.errors[client] = Broadcast._local_error(client, cid)
+            return
+
+        result.latencies[client] = self._clock() - sent
+        if resp.is_error():
+            result.errors[client] = resp
+        else:
+            result.successes[client] = resp
+
+    @staticmethod
+    def _local_error(client, cid: str) -> Response:
+        # request left in client queue, expires later through handler
+        if client.is_connected():
+            return generate_json_rpc_response_error('Request timeout', JsonRPCErrorCode.JSON_RPC_TIMEOUT_ERROR, cid)
+        return generate_json_rpc_response_error('Connection lost', JsonRPCErrorCode.JSON_RPC_CONNECTION_ERROR, cid)
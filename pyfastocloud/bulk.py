@@ -0,0 +1,145 @@
+import time
+from collections import deque
+
+from pyfastocloud.client import Client, generate_json_rpc_response_error
+from pyfastocloud.json_rpc import Response, JsonRPCErrorCode
+
+
+class BulkItem:
+    __slots__ = ('command_id', 'sent', 'latency', 'response')
+
+    def __init__(self, sent: float):
+        self.command_id = None
+        self.sent = sent
+        self.latency = None  # seconds from send to response
+        self.response = None
+
+    def is_done(self) -> bool:
+        return self.response is not None
+
+    def is_ok(self) -> bool:
+        return self.response is not None and self.response.is_message()
+
+
+class BulkOperation:
+    """
+    Requests of one bulk call pipelined without waiting for round trips, every reply is correlated to its item.
+    Requests are sent while client flow control window is open, the rest as responses and timeouts release credits.
+    Items which can't be sent get error response at once, lost connection fails all pending items.
+
+    op = client.restart_streams(stream_ids)
+    op.wait(30)  # sync clients with socket_mod, AsyncioClient returns awaitable resolved by operation
+    for sid, item in op.results.items():
+        ...
+    """
+
+    def __init__(self, client: Client, clock=time.monotonic):
+        self._client = client
+        self._clock = clock
+        self._items = {}  # key: BulkItem
+        self._unsent = deque()  # (key, send) send(command_id) -> RequestReturn
+        self._pending = 0
+        self._pumping = False
+        self._callbacks = []
+        self.started = clock()
+        self.elapsed = None  # seconds until last response
+
+    def __len__(self):
+        return len(self._items) + len(self._unsent)
+
+    @property
+    def results(self) -> dict:
+        return self._items
+
+    def is_done(self) -> bool:
+        return not self._unsent and not self._pending
+
+    def successes(self) -> dict:
+        return {key: item.response for key, item in self._items.items() if item.is_ok()}
+
+    def errors(self) -> dict:
+        return {key: item.response for key, item in self._items.items() if item.is_done() and not item.is_ok()}
+
+    def add(self, key, send):
+        self._unsent.append((key, send))
+
+    def start(self) -> 'BulkOperation':
+        self.resume()
+        return self
+
+    def resume(self):
+        """
+        Sends unsent items if window is open, needed when credits were released by other requests of client
+        """
+        if self._unsent:
+            self._pump()
+        self._check_done()
+
+    def add_done_callback(self, callback):
+        """
+        callback(operation) is called once all items are done
+        """
+        if self.elapsed is not None:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Blocks until all items are done, see Client.wait_until
+        """
+        def done():
+            self.resume()
+            return self.is_done()
+
+        return self._client.wait_until(done, timeout)
+
+    # private
+    def _pump(self):
+        if self._pumping:
+            return
+
+        # frames of one round are coalesced into gather writes
+        client = self._client
+        autoflush = client.autoflush
+        self._pumping = True
+        client.autoflush = False
+        try:
+            while self._unsent and client.is_window_open():
+                key, send = self._unsent.popleft()
+                self._send(key, send)
+        finally:
+            client.autoflush = autoflush
+            self._pumping = False
+        if autoflush:
+            client.flush()
+
+    def _send(self, key, send):
+        item = BulkItem(self._clock())
+        self._items[key] = item
+        res, cid = send(self._client.next_command_id())
+        if not res or cid is None or not self._client.watch_response(cid, lambda resp: self._on_response(item, resp)):
+            item.response = generate_json_rpc_response_error('Send failed', JsonRPCErrorCode.JSON_RPC_SERVER_ERROR,
+                                                             cid)
+            return
+
+        item.command_id = cid
+        self._pending += 1
+
+    def _on_response(self, item: BulkItem, resp: Response):
+        item.response = resp
+        item.latency = self._clock() - item.sent
+        self._pending -= 1
+        if self._unsent:
+            self._pump()
+        self._check_done()
+
+    def _check_done(self):
+        if self.elapsed is not None or not self.is_done():
+            return
+
+        self.elapsed = self._clock() - self.started
+        callbacks = self._callbacks
+        self._callbacks = []
+        for callback in callbacks:
+            callback(self)
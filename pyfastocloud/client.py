@@ -1,13 +1,24 @@
-import json
 import socket
 import struct
-from abc import ABC, abstractmethod
+import time
+from abc import ABC
+from collections import deque
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
 from datetime import datetime
 
-from pyfastocloud.client_constants import ClientStatus, RequestReturn
+from pyfastocloud.client_constants import ClientStatus, RequestReturn, WindowPolicy
 from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.compressor import ICompressor
 from pyfastocloud.compressor_zlib import CompressorZlib
-from pyfastocloud.json_rpc import Request, Response, parse_response_or_request, JSON_RPC_OK_RESULT, JsonRPCErrorCode
+from pyfastocloud.frame_decoder import FrameDecoder
+from pyfastocloud.json_rpc import Request, Response, parse_responses_or_requests, JSON_RPC_OK_RESULT, \
+    JsonRPCErrorCode
+from pyfastocloud.json_serializer import IJsonSerializer, make_json_serializer
+from pyfastocloud.json_stream import StreamedArray, response_id
+from pyfastocloud.metrics import MetricsRegistry
+from pyfastocloud.outbound_buffer import OutboundBuffer
+from pyfastocloud.request_queue import RequestQueue
 
 
 def make_utc_timestamp_seconds() -> int:
@@ -15,7 +26,7 @@ def make_utc_timestamp_seconds() -> int:
 
 
 def make_utc_timestamp_msec() -> int:
-    return make_utc_timestamp_seconds() * 1000
+    return int(datetime.now().timestamp() * 1000)
 
 
 def generate_seq_id(command_id):  # uint64_t
@@ -26,6 +37,22 @@ def generate_seq_id(command_id):  # uint64_t
     return converted_bytes.hex()
 
 
+def decode_frame(compressor: ICompressor, serializer: IJsonSerializer, data: bytes,
+                 decoded_data: bytes = None) -> (list, int, float):
+    # runs on decode executor (thread or process pool): (messages, json size, seconds)
+    start = time.perf_counter()
+    if decoded_data is None:
+        decoded_data = compressor.decompress(data)
+    messages = parse_responses_or_requests(decoded_data, serializer)
+    return messages, len(decoded_data), time.perf_counter() - start
+
+
+def _recorded(chunks, inflated: list):
+    for chunk in chunks:
+        inflated.append(chunk)
+        yield chunk
+
+
 def generate_json_rpc_response_message(result, command_id: str) -> Response:
     return Response(command_id, result)
 
@@ -36,9 +63,19 @@ def generate_json_rpc_response_error(message: str, code: int, command_id: str) -
 
 class Client(ABC):
     """
-    Base client class for pyfastocloud connection
+    Base client class for pyfastocloud connection.
+    Incoming messages are dispatched by JSON-RPC method through dict tables:
+    class level _REQUEST_HOOKS/_RESPONSE_HOOKS (protocol handling, method: function(client, ...))
+    and per client routes registered by caller (route()), other requests go to handler.process_request.
     """
     MAX_PACKET_SIZE = 64 * 1024 * 1024
+    MAX_BATCH_SIZE = 1000
+    DEFAULT_OFFLOAD_THRESHOLD = 1024 * 1024
+    DEFAULT_STREAM_THRESHOLD = 1024 * 1024
+    OUTBOUND_HIGH_WATERMARK = 1024 * 1024
+    AUTO_COMMAND_ID_FLAG = 1 << 63
+    _REQUEST_HOOKS = {}
+    _RESPONSE_HOOKS = {}
 
     def is_active(self) -> bool:
         return self._state == ClientStatus.ACTIVE
@@ -52,7 +89,7 @@ class Client(ABC):
         def closure(self, *args, **kwargs):
             if not self.is_active():
                 return False, None
-            return function(self, *args, *kwargs)
+            return function(self, *args, **kwargs)
 
         return closure
 
@@ -73,57 +110,471 @@ class Client(ABC):
     def socket(self):
         return self._socket
 
+    def attach_socket(self, sock):
+        """
+        Attach already connected socket-like object (send/close) to client
+        """
+        self._socket = sock
+        self._set_state(ClientStatus.CONNECTED)
+
     def read_command(self):
+        """
+        Blocking read of one frame, returns None if connection closed or broken
+        """
         if not self.is_connected():
             return None
 
         try:
-            data_size_bytes = self._recv(4)
-        except socket.error:
+            frame = self._decoder.next_frame()
+            while frame is None:
+                # only missing bytes of current frame, next frames stay in socket so select loops see it readable
+                if not self._decoder.recv_into(self._socket, self._decoder.missing()):
+                    return None
+                frame = self._decoder.next_frame()
+        except (socket.error, ValueError):
             return None
+        return frame
 
-        if not data_size_bytes:
+    def read_commands(self):
+        """
+        One read from socket, returns all complete frames already buffered (may be empty list),
+        None if connection closed or broken. Frames are valid until next read call.
+        """
+        if not self.is_connected():
             return None
 
-        data_size = struct.unpack('>I', data_size_bytes)[0]
-        if data_size > Client.MAX_PACKET_SIZE:
+        try:
+            frames = self._decoder.frames()
+            if frames:
+                return frames
+
+            if not self._decoder.recv_into(self._socket):
+                return None
+            return self._decoder.frames()
+        except BlockingIOError:
+            # spurious readiness of non-blocking socket
+            return []
+        except (socket.error, ValueError):
             return None
 
+    @property
+    def autoflush(self) -> bool:
+        return self._autoflush
+
+    @autoflush.setter
+    def autoflush(self, value: bool):
+        """
+        If disabled frames are queued until flush() call or outbound buffer reaches high watermark
+        """
+        self._autoflush = value
+
+    def flush(self) -> bool:
+        """
+        Writes queued frames with gather writes, returns False on socket error
+        """
+        if not self.is_connected():
+            return False
+
         try:
-            data = self._recv(data_size)
+            self._outbound.flush(self._socket)
         except socket.error:
+            return False
+        return True
+
+    def has_pending_output(self) -> bool:
+        return len(self._outbound) > 0
+
+    @property
+    def send_calls(self) -> int:
+        return self._outbound.send_calls
+
+    def next_command_id(self) -> int:
+        """
+        Sequential command id with top bit set, out of range of ids passed to requests by caller
+        """
+        self._command_id += 1
+        return Client.AUTO_COMMAND_ID_FLAG | self._command_id
+
+    @property
+    def pending_requests_count(self) -> int:
+        return len(self._request_queue)
+
+    @property
+    def last_seen(self) -> float:
+        """
+        time.monotonic() of last received frame
+        """
+        return self._last_seen
+
+    @property
+    def rtt(self) -> int:
+        """
+        Round trip time of last ping, msec
+        """
+        return self._rtt
+
+    @property
+    def clock_offset(self) -> int:
+        """
+        Node clock minus local clock estimated from last ping, msec
+        """
+        return self._clock_offset
+
+    @property
+    def in_flight_bytes(self) -> int:
+        return self._request_queue.bytes
+
+    @property
+    def connect_timeout(self):
+        """
+        Seconds to wait for connect, None if not limited
+        """
+        return self._connect_timeout
+
+    def is_window_open(self) -> bool:
+        """
+        False while max_in_flight requests or max_in_flight_bytes of request frames wait for response
+        """
+        if self._max_in_flight is not None and len(self._request_queue) >= self._max_in_flight:
+            return False
+        if self._max_in_flight_bytes is not None and self._request_queue.bytes >= self._max_in_flight_bytes:
+            return False
+        return True
+
+    @property
+    def request_stats(self) -> dict:
+        """
+        Send -> reply latency per JSON-RPC method, method: RequestStats
+        """
+        return self._request_queue.stats
+
+    def send_request(self, req: Request) -> RequestReturn:
+        """
+        Sends prepared request keeping its id (replay after reconnect), response is routed as usual
+        """
+        if not self.is_connected():
+            return False, None
+
+        return self._send(req)
+
+    def watch_response(self, command_id: str, callback) -> bool:
+        """
+        callback(resp) is called once with response of pending request (before handler),
+        or with timeout or connection error response. False if request is not pending
+        """
+        if command_id not in self._request_queue:
+            return False
+
+        self._watchers[command_id] = callback
+        return True
+
+    def wait_until(self, predicate, timeout: float) -> bool:
+        """
+        Blocks until predicate() is true processing incoming frames as usual, returns last predicate() value.
+        Requires socket_mod (gevent sockets yield), client must not be read from elsewhere while waiting.
+        """
+        if self._socket_mod is None:
+            return predicate()
+
+        if self._batch:
+            self._send_batch()
+        if not self.flush():
+            return predicate()
+
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._poll(min(remaining, RequestQueue.RESOLUTION)):
+                return predicate()
+        return True
+
+    def wait_response(self, command_id: str, timeout: float) -> Response:
+        """
+        Blocks until response of sent request arrives (it is passed to handler as well),
+        connection error response if connection is lost, None if timeout passed first
+        """
+        responses = []
+        if not self.watch_response(command_id, responses.append):
+            return None
+
+        if not self.wait_until(lambda: responses, timeout):
+            self._watchers.pop(command_id, None)
             return None
-        return data
+        return responses[0]
+
+    def expire_requests(self) -> int:
+        """
+        Delivers requests without response in time to handler as timeout errors, should be called periodically
+        """
+        expired = self._request_queue.expire()
+        self._fail_requests(expired, 'Request timeout', JsonRPCErrorCode.JSON_RPC_TIMEOUT_ERROR)
+        return len(expired)
+
+    @contextmanager
+    def batch(self):
+        """
+        Requests sent inside block are written as JSON-RPC batch (one array per frame) on exit,
+        each response is routed separately
+        with client.batch():
+            for config in configs:
+                client.start_stream(next_id(), config)
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = []
+        try:
+            yield
+        finally:
+            self._send_batch()
+            self._batch = None
+
+    def route(self, method: str, callback, decoder=None):
+        """
+        Requests (notifications) of method are passed to callback(client, req, params) instead of
+        handler.process_request, params are decoder(req.params) if decoder given.
+        Requests with params decoder can't parse go to handler.
+
+        client.route(Commands.STATISTIC_STREAM_COMMAND, on_statistic, StreamStatistic.make_entry)
+        """
+        self._routes[method] = (callback, decoder)
+
+    def unroute(self, method: str):
+        self._routes.pop(method, None)
+
+    def stream_results(self, method: str, path: tuple):
+        """
+        Responses of method in frames of stream_threshold bytes or more are not parsed,
+        result is StreamedArray yielding items of array at path inflated chunk by chunk:
+
+        client.stream_results(Commands.SCAN_FOLDER_VODS_COMMAND, ('result', 'vods'))
+        ...
+        def process_response(self, client, req, resp):
+            for vod in resp.result:
+                ...
+        """
+        self._streamed[method] = path
 
-    @abstractmethod
     def process_commands(self, data: bytes):
-        pass
+        """
+        With decode_executor frames of offload_threshold bytes or more are decompressed and parsed on executor,
+        later frames wait for them so messages are always processed in order of arrival
+        """
+        if not data:
+            return
+
+        self._last_seen = time.monotonic()
+        decoded_data = None
+        if self._streamed and len(data) >= self._stream_threshold:
+            messages, decoded_data = self._decode_streamed(data)
+            if messages is not None:
+                self._decoding.append((messages, len(data)))
+                self.process_decoded()
+                return
+
+        if self._decode_executor is None:
+            self._dispatch(self._decode_responses_or_requests(data, decoded_data))
+            return
+
+        if len(data) >= self._offload_threshold:
+            # frame buffer is reused by next read
+            future = self._decode_executor.submit(decode_frame, self._compressor, self._serializer,
+                                                  bytes(data) if decoded_data is None else b'', decoded_data)
+            if self._decoded_callback:
+                future.add_done_callback(self._on_decoded)
+            self._decoding.append((future, len(data)))
+        elif self._decoding:
+            self._decoding.append((self._decode_responses_or_requests(data, decoded_data), len(data)))
+        else:
+            self._dispatch(self._decode_responses_or_requests(data, decoded_data))
+            return
+
+        self.process_decoded()
+
+    def has_pending_decodes(self) -> bool:
+        return len(self._decoding) > 0
+
+    def process_decoded(self) -> int:
+        """
+        Processes messages of offloaded frames decoded so far in order, returns number of processed frames.
+        Must be called from thread owning client, e.g. after decoded callback
+        """
+        processed = 0
+        while self._decoding:
+            item, frame_size = self._decoding[0]
+            if isinstance(item, Future):
+                if not item.done():
+                    break
+
+                try:
+                    messages, payload_size, seconds = item.result()
+                except Exception:  # pylint: disable=broad-except
+                    # worker failed (broken pool, corrupted frame), frame is dropped as unparsable
+                    messages, payload_size, seconds = [], 0, 0
+                if self._metrics is not None:
+                    self._metrics.on_decode(frame_size + 4, payload_size, seconds)
+            else:
+                messages = item
+
+            self._decoding.popleft()
+            self._dispatch(messages)
+            processed += 1
+        return processed
+
+    def set_decoded_callback(self, callback):
+        """
+        callback() is called from executor thread when offloaded frame is decoded, driver should schedule
+        process_decoded() on client thread (loop.call_soon_threadsafe, wakeup pipe)
+        """
+        self._decoded_callback = callback
 
     def create_tcp_socket(self):
         return self._socket_mod.create_tcp_socket()
 
     def create_tcp_connection(self, host: str, port: int):
+        sock = None
         try:
             sock = self.create_tcp_socket()
+            if self._connect_timeout is not None:
+                sock.settimeout(self._connect_timeout)
             sock.connect((host, port))
+            if self._connect_timeout is not None:
+                sock.settimeout(None)
         except socket.error:
+            if sock is not None:
+                sock.close()
             return None
 
         return sock
 
     # protected
-    def __init__(self, sock, state: ClientStatus, handler: IClientHandler, socket_mod):
+    def __init__(self, sock, state: ClientStatus, handler: IClientHandler, socket_mod,
+                 request_timeout=RequestQueue.DEFAULT_TIMEOUT, max_pending_requests=RequestQueue.DEFAULT_MAX_SIZE,
+                 compressor: ICompressor = None, autoflush=True, serializer: IJsonSerializer = None,
+                 metrics: MetricsRegistry = None, decode_executor: Executor = None,
+                 offload_threshold=DEFAULT_OFFLOAD_THRESHOLD, stream_threshold=DEFAULT_STREAM_THRESHOLD,
+                 max_in_flight=None, max_in_flight_bytes=None, window_policy=WindowPolicy.REJECT,
+                 connect_timeout=None):
         self._handler = handler
         self._socket = sock
-        self._request_queue = {}
+        self._request_queue = RequestQueue(request_timeout, max_pending_requests,
+                                           buckets=metrics.rtt_buckets if metrics is not None else None)
         self._state = state
-        self._gzip_compress = CompressorZlib(True)
+        self._compressor = compressor if compressor else CompressorZlib(True)
+        self._serializer = serializer if serializer else make_json_serializer()
+        self._decoder = FrameDecoder(Client.MAX_PACKET_SIZE)
+        self._outbound = OutboundBuffer()
+        self._autoflush = autoflush
         self._socket_mod = socket_mod
+        self._batch = None
+        self._command_id = 0
+        self._last_seen = 0
+        self._rtt = None
+        self._clock_offset = None
+        self._metrics = metrics.register(self) if metrics is not None else None
+        self._routes = {}  # method: (callback, decoder)
+        self._decode_executor = decode_executor
+        self._offload_threshold = offload_threshold
+        self._decoding = deque()  # (future or decoded messages, frame size) in order of arrival
+        self._decoded_callback = None
+        self._streamed = {}  # method: result path
+        self._stream_threshold = stream_threshold
+        # flow control window, credits are released by responses, timeouts and disconnect
+        self._max_in_flight = max_in_flight
+        self._max_in_flight_bytes = max_in_flight_bytes
+        self._window_policy = window_policy
+        self._watchers = {}  # command id: callback(resp)
+        self._connect_timeout = connect_timeout  # seconds, None blocks until os gives up
+
+    def _dispatch(self, messages: list):
+        for req, resp in messages:
+            if req:
+                self._process_request(req)
+            elif resp:
+                self._process_response(resp)
+
+    def _on_decoded(self, future: Future):
+        callback = self._decoded_callback
+        if callback:
+            callback()
+
+    def _process_request(self, req: Request):
+        hook = self._REQUEST_HOOKS.get(req.method)
+        if hook:
+            hook(self, req)
+
+        route = self._routes.get(req.method)
+        if route:
+            callback, decoder = route
+            if decoder is None:
+                callback(self, req, req.params)
+                return
+
+            try:
+                params = decoder(req.params)
+            except (ValueError, TypeError, KeyError):
+                params = None
+            if params is not None:
+                callback(self, req, params)
+                return
+
+        if self._handler:
+            self._handler.process_request(self, req)
+
+    def _process_response(self, resp: Response):
+        saved_req = self._request_queue.pop(resp.id, None)
+        watcher = self._watchers.pop(resp.id, None)
+        if watcher:
+            watcher(resp)
+        if saved_req:
+            hook = self._RESPONSE_HOOKS.get(saved_req.method)
+            if hook:
+                hook(self, saved_req, resp)
+
+        if self._handler:
+            self._handler.process_response(self, saved_req, resp)
+
+    # hooks
+    def _on_client_ping(self, req: Request):
+        if self.is_active():
+            self._send_response(req.id, {'timestamp': make_utc_timestamp_msec()})
+
+    def _on_activated(self, req: Request, resp: Response):
+        if resp.is_message():
+            self._set_state(ClientStatus.ACTIVE)
+
+    def _on_service_stopped(self, req: Request, resp: Response):
+        if resp.is_message():
+            self._reset()
+
+    def _on_pong(self, req: Request, resp: Response):
+        # ping request and response carry sender timestamps, msec
+        if not resp.is_message() or not isinstance(resp.result, dict) or not req.params:
+            return
+
+        sent = req.params.get('timestamp')
+        remote = resp.result.get('timestamp')
+        if not isinstance(sent, int) or not isinstance(remote, int):
+            return
+
+        received = make_utc_timestamp_msec()
+        self._rtt = received - sent
+        self._clock_offset = remote - (sent + received) // 2
 
     def _reset(self):
         self._socket.close()
         self._socket = None
+        self._decoder.reset()
+        self._outbound.clear()
+        for item, _ in self._decoding:
+            if isinstance(item, Future):
+                item.cancel()
+        self._decoding.clear()
         self._set_state(ClientStatus.INIT)
+        # requests in flight are never answered by new connection
+        lost = self._request_queue.clear()
+        self._fail_requests(lost, 'Connection lost', JsonRPCErrorCode.JSON_RPC_CONNECTION_ERROR)
 
     def _set_state(self, status: ClientStatus):
         self._state = status
@@ -134,64 +585,145 @@ class Client(ABC):
         if not self.is_connected():
             return False, None
 
-        cid = generate_seq_id(command_id)
-        req = Request(cid, method, params)
+        return self._send(Request(generate_seq_id(command_id), method, params))
 
-        data = json.dumps(req.to_dict())
-        data_to_send_bytes = self._generate_data_to_send(data)
-        if not req.is_notification():
-            self._request_queue[cid] = req
-        try:
-            self._socket.send(data_to_send_bytes)
-        except socket.error:
+    def _send(self, req: Request) -> RequestReturn:
+        cid = req.id
+        notification = req.is_notification()
+        if not notification and not self.is_window_open():
+            if self._window_policy != WindowPolicy.BLOCK or self._socket_mod is None or not self._wait_window():
+                return False, None
+
+        if self._batch is not None:
+            # batch frame size is unknown yet, batched requests hold count credits only
+            if not notification and not self._request_queue.push(cid, req):
+                return False, None
+
+            self._batch.append(req)
+            if len(self._batch) >= Client.MAX_BATCH_SIZE:
+                self._send_batch()
+            return True, cid
+
+        data_to_send_bytes = self._encode(req.to_dict())
+        if not notification and not self._request_queue.push(cid, req, size=len(data_to_send_bytes)):
+            return False, None
+
+        if not self._write_frame(data_to_send_bytes):
+            self._request_queue.remove(cid)
             return False, None
         return True, cid
 
-    def _generate_data_to_send(self, data: str) -> bytes:
-        compressed = self._gzip_compress.compress(data.encode())
+    def _wait_window(self) -> bool:
+        # blocked sender reads and processes incoming frames until window opens,
+        # not reentrant: must not be called from handler callbacks of this client
+        if self._batch:
+            self._send_batch()
+        if not self.flush():
+            return False
+
+        while not self.is_window_open():
+            if not self._poll(RequestQueue.RESOLUTION):
+                return False
+        return True
+
+    def _poll(self, timeout: float) -> bool:
+        # one wait for incoming frames, False if connection lost
+        readable, _, _ = self._socket_mod.Select([self._socket], [], [], timeout)
+        if readable:
+            frames = self.read_commands()
+            if frames is None:
+                self.disconnect()
+                return False
+            for frame in frames:
+                self.process_commands(frame)
+        self.process_decoded()
+        self.expire_requests()
+        return self.is_connected()
+
+    def _send_batch(self) -> bool:
+        requests = self._batch
+        if not requests:
+            return True
+
+        self._batch = []
+        data_to_send_bytes = self._encode([req.to_dict() for req in requests])
+        if self.is_connected() and self._write_frame(data_to_send_bytes):
+            return True
+
+        # callers already got ids, failures are reported through handler
+        failed = [self._request_queue.remove(req.id) for req in requests if not req.is_notification()]
+        self._fail_requests([req for req in failed if req], 'Send failed', JsonRPCErrorCode.JSON_RPC_SERVER_ERROR)
+        return False
+
+    def _fail_requests(self, requests: list, message: str, code: int):
+        for req in requests:
+            resp = generate_json_rpc_response_error(message, code, req.id)
+            watcher = self._watchers.pop(req.id, None)
+            if watcher:
+                watcher(resp)
+            if self._handler:
+                self._handler.process_response(self, req, resp)
+
+    def _encode(self, obj) -> bytes:
+        metrics = self._metrics
+        if metrics is None:
+            return self._generate_data_to_send(self._serializer.dumps(obj))
+
+        start = time.perf_counter()
+        data = self._serializer.dumps(obj)
+        data_to_send_bytes = self._generate_data_to_send(data)
+        metrics.on_encode(len(data), len(data_to_send_bytes), time.perf_counter() - start)
+        return data_to_send_bytes
+
+    def _generate_data_to_send(self, data: bytes) -> bytes:
+        compressed = self._compressor.compress(data)
         compressed_len = len(compressed)
         array = struct.pack('>I', compressed_len)
         return array + compressed
 
+    def _write_frame(self, data: bytes) -> bool:
+        self._outbound.append(data)
+        if self._autoflush or len(self._outbound) >= Client.OUTBOUND_HIGH_WATERMARK:
+            return self.flush()
+        return True
+
     def _send_notification(self, method: str, params) -> RequestReturn:
         return self._send_request(None, method, params)
 
     def _send_response(self, command_id: str, params) -> bool:
         resp = generate_json_rpc_response_message(params, command_id)
-        data = json.dumps(resp.to_dict())
-        data_to_send_bytes = self._generate_data_to_send(data)
-        try:
-            self._socket.send(data_to_send_bytes)
-        except socket.error:
-            return False
-        return True
+        return self._write_frame(self._encode(resp.to_dict()))
 
     def _send_response_ok(self, command_id: str) -> bool:
         return self._send_response(command_id, JSON_RPC_OK_RESULT)
 
     def _send_response_fail(self, command_id: str, error: str) -> bool:
         resp = generate_json_rpc_response_error(error, JsonRPCErrorCode.JSON_RPC_SERVER_ERROR, command_id)
-        data = json.dumps(resp.to_dict())
-        data_to_send_bytes = self._generate_data_to_send(data)
-        try:
-            self._socket.send(data_to_send_bytes)
-        except socket.error:
-            return False
-        return True
-
-    def _recv(self, n: int):
-        # Helper function to recv n bytes or return None if EOF is hit
-        data = b''
-        while len(data) < n:
-            try:
-                packet = self._socket.recv(n - len(data))
-            except socket.error:
-                return None
-            if not packet:
-                return None
-            data += packet
-        return data
-
-    def _decode_response_or_request(self, data: bytes) -> (Request, Response):
-        decoded_data = self._gzip_compress.decompress(data)
-        return parse_response_or_request(decoded_data.decode())
+        return self._write_frame(self._encode(resp.to_dict()))
+
+    def _decode_streamed(self, data: bytes) -> (list, bytes):
+        # id is read without parsing result: (messages, None) for response of streamed method,
+        # otherwise (None, decompressed frame) finished from chunks inflated while looking for id
+        chunks = self._compressor.decompress_chunks(data, StreamedArray.DEFAULT_CHUNK_SIZE)
+        inflated = []
+        cid = response_id(_recorded(chunks, inflated))
+        req = self._request_queue.get(cid) if isinstance(cid, str) else None
+        path = self._streamed.get(req.method) if req else None
+        if path is None:
+            inflated.extend(chunks)
+            return None, b''.join(inflated)
+
+        return [(None, Response(cid, StreamedArray(self._compressor, bytes(data), path)))], None
+
+    def _decode_responses_or_requests(self, data: bytes, decoded_data: bytes = None) -> list:
+        if self._metrics is None:
+            if decoded_data is None:
+                decoded_data = self._compressor.decompress(data)
+            return parse_responses_or_requests(decoded_data, self._serializer)
+
+        start = time.perf_counter()
+        if decoded_data is None:
+            decoded_data = self._compressor.decompress(data)
+        result = parse_responses_or_requests(decoded_data, self._serializer)
+        self._metrics.on_decode(len(data) + 4, len(decoded_data), time.perf_counter() - start)
+        return result
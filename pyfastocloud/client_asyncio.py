@@ -0,0 +1,254 @@
+import asyncio
+from collections import deque
+
+from pyfastocloud.bulk import BulkOperation
+from pyfastocloud.client import Client
+from pyfastocloud.client_constants import ClientStatus, WindowPolicy
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.frame_decoder import FrameDecoder
+from pyfastocloud.json_rpc import Request, Response
+
+
+class _TransportSocket:
+    """
+    Socket-like adapter over asyncio transport, used by Client to send frames
+    """
+
+    def __init__(self, transport: asyncio.Transport):
+        self._transport = transport
+
+    def send(self, data: bytes) -> int:
+        self._transport.write(data)
+        return len(data)
+
+    def sendmsg(self, buffers: list) -> int:
+        self._transport.writelines(buffers)
+        return sum(len(buffer) for buffer in buffers)
+
+    def close(self):
+        self._transport.close()
+
+
+class _FrameProtocol(asyncio.BufferedProtocol):
+    def __init__(self, owner):
+        self._owner = owner
+        self._decoder = FrameDecoder(Client.MAX_PACKET_SIZE)
+
+    def connection_made(self, transport: asyncio.Transport):
+        self._owner._on_connection_made(transport)
+
+    def get_buffer(self, sizehint: int):
+        return self._decoder.get_buffer()
+
+    def buffer_updated(self, nbytes: int):
+        self._decoder.buffer_updated(nbytes)
+        try:
+            frames = self._decoder.frames()
+        except ValueError:
+            self._owner.disconnect()
+            return
+
+        for frame in frames:
+            self._owner._on_frame(frame)
+
+    def connection_lost(self, exc):
+        self._owner._on_connection_lost()
+
+
+class AsyncioClient(IClientHandler):
+    """
+    Asyncio transport for pyfastocloud clients, one event loop drives any number of nodes.
+    Request methods of the wrapped client return awaitables resolved by the matching Response,
+    or None if request can't be sent or connection was lost.
+
+    client = AsyncioClient(FastoCloudClient, host, port, handler)
+    await client.connect()
+    resp = await client.activate(0, license_key)
+
+    With autoflush=False queued frames are written every flush_interval seconds.
+    With max_in_flight/max_in_flight_bytes requests sent while window is full wait in FIFO
+    and are sent when responses or timeouts release credits (window_policy is always REJECT).
+    """
+    EXPIRE_INTERVAL = 1
+    DEFAULT_FLUSH_INTERVAL = 0.005
+
+    def __init__(self, client_cls, host: str, port: int, handler: IClientHandler, loop=None,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, **kwargs):
+        kwargs['window_policy'] = WindowPolicy.REJECT  # blocking would stall event loop
+        self._client = client_cls(host, port, self, None, **kwargs)
+        self._handler = handler
+        self._loop = loop
+        self._pending = {}
+        self._waiting = deque()  # (method, args, kwargs, future) rejected by full window
+        self._bulk = set()  # bulk operations with items waiting for window
+        self._flush_interval = flush_interval
+        self._expire_timer = None
+        self._flush_timer = None
+
+    @property
+    def client(self) -> Client:
+        return self._client
+
+    async def connect(self) -> bool:
+        if self._client.is_connected():
+            return True
+
+        loop = self._get_loop()
+        try:
+            await loop.create_connection(lambda: _FrameProtocol(self), self._client.host, self._client.port)
+        except OSError:
+            return False
+        return True
+
+    def disconnect(self):
+        self._client.disconnect()
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def request(*args, **kwargs):
+            # only requests refused by full window are deferred, other calls return their result
+            result = attr(*args, **kwargs)
+            if self._is_window_rejected(result):
+                return self._defer(attr, args, kwargs)
+            return self._wrap_request(result)
+
+        return request
+
+    # handler
+    def process_response(self, client, req: Request, resp: Response):
+        future = self._pending.pop(resp.id, None)
+        if future and not future.done():
+            future.set_result(resp)
+
+        if self._handler:
+            self._handler.process_response(self, req, resp)
+
+        self._resume()
+
+    def process_request(self, client, req: Request):
+        if self._handler:
+            self._handler.process_request(self, req)
+
+    def on_client_state_changed(self, client, status: ClientStatus):
+        if status == ClientStatus.INIT:
+            self._cancel_pending()
+
+        if self._handler:
+            self._handler.on_client_state_changed(self, status)
+
+    # private
+    def _get_loop(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def _wrap_request(self, result, future=None):
+        if isinstance(result, BulkOperation):
+            return self._wrap_bulk(result, future)
+        if not isinstance(result, tuple) or len(result) != 2:
+            if future is not None:
+                future.set_result(result)
+            return result
+
+        if future is None:
+            future = self._get_loop().create_future()
+        res, cid = result
+        if not res or cid is None:
+            future.set_result(None)
+            return future
+
+        self._pending[cid] = future
+        return future
+
+    def _wrap_bulk(self, op: BulkOperation, future=None):
+        if future is None:
+            future = self._get_loop().create_future()
+        if not op.is_done():
+            self._bulk.add(op)
+
+        def done(_):
+            self._bulk.discard(op)
+            if not future.done():
+                future.set_result(op)
+
+        op.add_done_callback(done)
+        return future
+
+    def _is_window_rejected(self, result) -> bool:
+        return isinstance(result, tuple) and len(result) == 2 and not result[0] and \
+            self._client.is_connected() and not self._client.is_window_open()
+
+    def _defer(self, method, args, kwargs):
+        future = self._get_loop().create_future()
+        self._waiting.append((method, args, kwargs, future))
+        return future
+
+    def _resume(self):
+        # credits released, bulk operations resolve on their own responses
+        for op in list(self._bulk):
+            op.resume()
+        if self._waiting:
+            self._send_waiting()
+
+    def _send_waiting(self):
+        while self._waiting and self._client.is_window_open():
+            method, args, kwargs, future = self._waiting.popleft()
+            if future.done():
+                # cancelled by caller
+                continue
+
+            result = method(*args, **kwargs)
+            if self._is_window_rejected(result):
+                self._waiting.appendleft((method, args, kwargs, future))
+                return
+            self._wrap_request(result, future)
+
+    def _cancel_pending(self):
+        pending = self._pending
+        self._pending = {}
+        for future in pending.values():
+            if not future.done():
+                future.set_result(None)
+
+        waiting = self._waiting
+        self._waiting = deque()
+        for _, _, _, future in waiting:
+            if not future.done():
+                future.set_result(None)
+
+    def _on_connection_made(self, transport: asyncio.Transport):
+        self._client.attach_socket(_TransportSocket(transport))
+        self._client.set_decoded_callback(self._on_decoded)
+        self._expire_timer = self._loop.call_later(AsyncioClient.EXPIRE_INTERVAL, self._on_expire_timer)
+
+        if not self._client.autoflush:
+            self._flush_timer = self._loop.call_later(self._flush_interval, self._on_flush_timer)
+
+    def _on_expire_timer(self):
+        self._client.expire_requests()
+        self._resume()
+        self._expire_timer = self._loop.call_later(AsyncioClient.EXPIRE_INTERVAL, self._on_expire_timer)
+
+    def _on_flush_timer(self):
+        self._client.flush()
+        self._flush_timer = self._loop.call_later(self._flush_interval, self._on_flush_timer)
+
+    def _on_decoded(self):
+        # decode executor thread
+        self._loop.call_soon_threadsafe(self._client.process_decoded)
+
+    def _on_frame(self, frame: memoryview):
+        self._client.process_commands(frame)
+
+    def _on_connection_lost(self):
+        for timer in (self._expire_timer, self._flush_timer):
+            if timer:
+                timer.cancel()
+        self._expire_timer = None
+        self._flush_timer = None
+
+        if self._client.is_connected():
+            self._client.disconnect()
@@ -7,3 +7,8 @@ class ClientStatus(IntEnum):
     INIT = 0
     CONNECTED = 1
     ACTIVE = 2
+
+
+class WindowPolicy(IntEnum):
+    REJECT = 0  # send returns (False, None) while window is full
+    BLOCK = 1  # send processes incoming frames until responses or timeouts free window
@@ -0,0 +1,319 @@
+import errno
+import selectors
+import socket
+import time
+
+from pyfastocloud.client import Client
+from pyfastocloud.heartbeat import Heartbeat
+from pyfastocloud.managed_session import ManagedSession
+
+
+class _PendingConnect:
+    __slots__ = ('client', 'sock', 'deadline')
+
+    def __init__(self, client: Client, sock, deadline: float):
+        self.client = client
+        self.sock = sock
+        self.deadline = deadline
+
+
+class ClientPool:
+    """
+    Reactor for many clients of any type (stream, LB, EPG) driven by one selector (epoll on Linux).
+    Sockets are non-blocking: connects are finished by selector within connect_timeout,
+    readable sockets are dispatched to client process_commands, closed connections are reset,
+    queued output is flushed when socket is writable and pending requests are expired on every poll.
+
+    pool = ClientPool(socket_mod)
+    for node in nodes:
+        pool.connect(FastoCloudClient(node.host, node.port, handler, socket_mod))
+    pool.run_forever()
+
+    Client is connected during poll (handler gets CONNECTED state), requests are sent from there on.
+
+    Clients of managed sessions (add_session) are reconnected by pool,
+    with heartbeat all clients are pinged and dead peers disconnected.
+    Frames offloaded to client decode_executor wake the pool up when decoded.
+    """
+    DEFAULT_POLL_TIMEOUT = 0.5
+    DEFAULT_CONNECT_TIMEOUT = 5
+    EXPIRE_INTERVAL = 1
+
+    def __init__(self, socket_mod, heartbeat: Heartbeat = None, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+        self._selector = socket_mod.Selector()
+        self._heartbeat = heartbeat
+        self._connect_timeout = connect_timeout
+        self._clients = {}  # client: registered socket
+        self._connecting = {}  # client: _PendingConnect
+        self._sessions = {}  # client: ManagedSession
+        self._running = False
+        self._next_expire = 0
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+
+    def __len__(self):
+        return len(self._clients)
+
+    def __contains__(self, client: Client):
+        return client in self._clients
+
+    @property
+    def clients(self) -> list:
+        return list(self._clients)
+
+    def add(self, client: Client):
+        """
+        Adds client to pool, socket is watched while client is connected
+        """
+        if client in self._clients:
+            return
+
+        self._clients[client] = None
+        client.set_decoded_callback(self._wakeup)
+        if self._heartbeat is not None:
+            self._heartbeat.add(client)
+        self._sync(client)
+
+    def add_session(self, session: ManagedSession):
+        self._sessions[session.client] = session
+        self.add(session.client)
+
+    def remove(self, client: Client):
+        if client not in self._clients:
+            return
+
+        self._cancel_connect(client)
+        self._unregister(client)
+        del self._clients[client]
+        client.set_decoded_callback(None)
+        self._sessions.pop(client, None)
+        if self._heartbeat is not None:
+            self._heartbeat.remove(client)
+
+    def is_connecting(self, client: Client) -> bool:
+        return client in self._connecting
+
+    def connect(self, client: Client) -> bool:
+        """
+        Starts non-blocking connect finished by poll, False if it failed at once
+        """
+        self.add(client)
+        if client.is_connected() or client in self._connecting:
+            return True
+
+        sock = None
+        try:
+            sock = client.create_tcp_socket()
+            sock.setblocking(False)
+            err = sock.connect_ex((client.host, client.port))
+        except socket.error:
+            if sock is not None:
+                sock.close()
+            self._on_connect_failed(client)
+            return False
+
+        if err == 0:
+            self._on_connected(client, sock)
+            return True
+        if err not in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+            sock.close()
+            self._on_connect_failed(client)
+            return False
+
+        timeout = client.connect_timeout if client.connect_timeout is not None else self._connect_timeout
+        pending = _PendingConnect(client, sock, time.monotonic() + timeout)
+        self._connecting[client] = pending
+        self._register(sock, selectors.EVENT_WRITE, pending)
+        return True
+
+    def connect_all(self) -> int:
+        """
+        Starts connects of all disconnected clients, returns number of started
+        """
+        started = 0
+        for client in self.clients:
+            if self.connect(client):
+                started += 1
+        return started
+
+    def disconnect_all(self):
+        for client in self.clients:
+            self._cancel_connect(client)
+            client.disconnect()
+            self._sync(client)
+
+    def poll(self, timeout=DEFAULT_POLL_TIMEOUT) -> int:
+        """
+        One reactor iteration, returns number of processed frames
+        """
+        for client in self.clients:
+            self._sync(client)
+
+        processed = 0
+        for key, events in self._selector.select(timeout):
+            client = key.data
+            if client is None:
+                self._drain_wakeup()
+                continue
+            if isinstance(client, _PendingConnect):
+                self._finish_connect(client)
+                continue
+            if events & selectors.EVENT_READ:
+                processed += self._read(client)
+            if events & selectors.EVENT_WRITE and client.is_connected():
+                client.flush()
+
+        for client in self.clients:
+            if client.has_pending_decodes():
+                processed += client.process_decoded()
+
+        self._maintain()
+        return processed
+
+    def run_forever(self, timeout=DEFAULT_POLL_TIMEOUT):
+        self._running = True
+        while self._running:
+            self.poll(timeout)
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        self.stop()
+        for client in self.clients:
+            self.remove(client)
+        self._selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+    # private
+    def _read(self, client: Client) -> int:
+        frames = client.read_commands()
+        if frames is None:
+            client.disconnect()
+            self._sync(client)
+            return 0
+
+        for frame in frames:
+            if not client.is_connected():
+                break
+            client.process_commands(frame)
+        return len(frames)
+
+    def _finish_connect(self, pending: _PendingConnect):
+        client = pending.client
+        self._cancel_connect(client, False)
+        err = pending.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            pending.sock.close()
+            self._on_connect_failed(client)
+            return
+
+        self._on_connected(client, pending.sock)
+
+    def _cancel_connect(self, client: Client, close=True):
+        pending = self._connecting.pop(client, None)
+        if pending is None:
+            return
+
+        try:
+            self._selector.unregister(pending.sock)
+        except (KeyError, ValueError):
+            pass
+        if close:
+            pending.sock.close()
+
+    def _on_connected(self, client: Client, sock):
+        client.attach_socket(sock)
+        session = self._sessions.get(client)
+        if session is not None:
+            session.connected()
+        self._sync(client)
+
+    def _on_connect_failed(self, client: Client):
+        # refused and timed out connects feed backoff of session
+        session = self._sessions.get(client)
+        if session is not None:
+            session.connect_failed()
+
+    def _wakeup(self):
+        # decode executor thread
+        try:
+            self._wakeup_w.send(b'\0')
+        except OSError:
+            pass
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def _maintain(self):
+        now = time.monotonic()
+        expire = now >= self._next_expire
+        if expire:
+            self._next_expire = now + ClientPool.EXPIRE_INTERVAL
+        if self._heartbeat is not None:
+            self._heartbeat.tick(now)
+
+        for client, pending in list(self._connecting.items()):
+            if now >= pending.deadline:
+                self._cancel_connect(client)
+                self._on_connect_failed(client)
+
+        for client in self.clients:
+            if not client.is_connected():
+                session = self._sessions.get(client)
+                if session and client not in self._connecting and session.is_due(now):
+                    self.connect(client)
+                continue
+
+            # queued output is written on EVENT_WRITE only
+            if expire:
+                client.expire_requests()
+
+    def _sync(self, client: Client):
+        # keep selector registration in line with client connection state
+        registered = self._clients.get(client)
+        sock = client.socket if client.is_connected() else None
+        if registered is not sock:
+            self._unregister(client)
+            if sock is None:
+                return
+
+            self._register(sock, self._events(client), client)
+            self._clients[client] = sock
+            return
+
+        if sock is not None:
+            events = self._events(client)
+            if self._selector.get_key(sock).events != events:
+                self._selector.modify(sock, events, client)
+
+    def _register(self, sock, events: int, data):
+        stale = self._selector.get_map().get(sock.fileno())
+        if stale is not None:
+            # descriptor of closed socket reused by new connection
+            self._unregister(stale.data)
+        self._selector.register(sock, events, data)
+
+    def _unregister(self, client: Client):
+        registered = self._clients.get(client)
+        if registered is None:
+            return
+
+        try:
+            self._selector.unregister(registered)
+        except (KeyError, ValueError):
+            pass
+        self._clients[client] = None
+
+    @staticmethod
+    def _events(client: Client) -> int:
+        if client.has_pending_output():
+            return selectors.EVENT_READ | selectors.EVENT_WRITE
+        return selectors.EVENT_READ
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+
+# codec for frames body
+class ICompressor(ABC):
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        pass
+
+    def decompress_chunks(self, data: bytes, chunk_size: int):
+        """
+        Generator of decompressed data pieces of at most chunk_size bytes if codec supports streaming
+        """
+        yield self.decompress(data)
+
+    @abstractmethod
+    def name(self) -> str:
+        pass
@@ -1,28 +1,68 @@
 import zlib
 
+from pyfastocloud.compressor import ICompressor
 
-class CompressorZlib:
-    def __init__(self, gzip=False):
-        zl = zlib.MAX_WBITS | 16 if gzip else zlib.MAX_WBITS
-        c = zlib.compressobj(9, zlib.DEFLATED, zl)
-        self.c_context = c.copy()
+_MIN_WINDOW_BITS = 9
 
-        d = zlib.decompressobj(zl)
-        self.d_context = d.copy()
-        self.is_gzlip = gzip
+
+class CompressorZlib(ICompressor):
+    """
+    Gzip or zlib stream per frame, raw deflate if raw=True
+    """
+    DEFAULT_LEVEL = 9
+
+    def __init__(self, gzip=False, level=DEFAULT_LEVEL, raw=False):
+        if raw:
+            zl = -zlib.MAX_WBITS
+        else:
+            zl = zlib.MAX_WBITS | 16 if gzip else zlib.MAX_WBITS
+        self.wbits = zl
+        self.level = level
+        self.is_gzlip = gzip and not raw
+        self.is_raw = raw
 
     def compress(self, data: bytes) -> bytes:
-        c = self.c_context.copy()
-        t = c.compress(data)
-        t2 = c.flush(zlib.Z_FINISH)
-        return t + t2
+        return self._compress(data, self.level)
 
     def decompress(self, data: bytes) -> bytes:
-        d = self.d_context.copy()
-        t = d.decompress(data)
-        while d.unconsumed_tail:
-            t += d.decompress(d.unconsumed_tail)
-        return t
+        return zlib.decompress(data, self.wbits)
+
+    def decompress_chunks(self, data: bytes, chunk_size: int):
+        d = zlib.decompressobj(self.wbits)
+        data = d.decompress(data, chunk_size)
+        while data:
+            yield data
+            if d.eof:
+                return
+            data = d.decompress(d.unconsumed_tail, chunk_size)
 
     def name(self):
+        if self.is_raw:
+            return 'deflate'
         return 'gzip' if self.is_gzlip else 'zlib'
+
+    # protected
+    def _compress(self, data: bytes, level: int) -> bytes:
+        # window and hash sized to payload, full size deflate state (~270KB) costs more than compressing small frame
+        window_bits = min(max(len(data).bit_length(), _MIN_WINDOW_BITS), zlib.MAX_WBITS)
+        wbits = self.wbits - zlib.MAX_WBITS + window_bits if self.wbits > 0 else -window_bits
+        c = zlib.compressobj(level, zlib.DEFLATED, wbits, window_bits - 7)
+        return c.compress(data) + c.flush(zlib.Z_FINISH)
+
+
+class CompressorZlibThreshold(CompressorZlib):
+    """
+    Same stream format as CompressorZlib, but messages smaller than threshold use cheaper level
+    """
+    DEFAULT_THRESHOLD = 1024
+    DEFAULT_SMALL_LEVEL = 1
+
+    def __init__(self, gzip=False, level=CompressorZlib.DEFAULT_LEVEL, threshold=DEFAULT_THRESHOLD,
+                 small_level=DEFAULT_SMALL_LEVEL, raw=False):
+        super(CompressorZlibThreshold, self).__init__(gzip, level, raw)
+        self.threshold = threshold
+        self.small_level = small_level
+
+    def compress(self, data: bytes) -> bytes:
+        level = self.small_level if len(data) < self.threshold else self.level
+        return self._compress(data, level)
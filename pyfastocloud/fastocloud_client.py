@@ -1,6 +1,9 @@
+from pyfastocloud.bulk import BulkOperation
 from pyfastocloud.client import Client, make_utc_timestamp_msec
 from pyfastocloud.client_constants import ClientStatus, RequestReturn
 from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.json_rpc import Request, Response
+from pyfastocloud.streams_sync import StreamsSyncState
 
 
 class Commands:
@@ -43,6 +46,8 @@ class Fields:
     PROXY_DIRECTORY = 'proxy_directory'
     DATA_DIRECTORY = 'data_directory'
     STREAMS = 'streams'
+    REMOVED_STREAMS = 'removed_streams'
+    DELTA = 'delta'
     STREAM_ID = 'id'
     FORCE = 'force'
     CHANNEL_ID = 'channel_id'
@@ -57,10 +62,11 @@ class Fields:
 
 
 class FastoCloudClient(Client):
-    def __init__(self, host: str, port: int, handler: IClientHandler, socket_mod):
-        super(FastoCloudClient, self).__init__(None, ClientStatus.INIT, handler, socket_mod)
+    def __init__(self, host: str, port: int, handler: IClientHandler, socket_mod, **kwargs):
+        super(FastoCloudClient, self).__init__(None, ClientStatus.INIT, handler, socket_mod, **kwargs)
         self._host = host
         self._port = port
+        self._sync_state = StreamsSyncState(Fields.STREAM_ID)
 
     @property
     def host(self) -> str:
@@ -107,9 +113,22 @@ class FastoCloudClient(Client):
         return self._send_request(command_id, Commands.PREPARE_SERVICE_COMMAND, command_args)
 
     @Client.is_active_decorator
-    def sync_service(self, command_id: int, streams: list) -> RequestReturn:
-        command_args = {Fields.STREAMS: streams}
-        return self._send_request(command_id, Commands.SYNC_SERVICE_COMMAND, command_args)
+    def sync_service(self, command_id: int, streams: list, delta=False) -> RequestReturn:
+        """
+        delta=True sends only added/changed configs and removed ids compared to last confirmed sync,
+        full list is sent while node state is unknown (first sync, reconnect, failed sync)
+        """
+        if delta and self._sync_state.is_known():
+            changed, removed, snapshot = self._sync_state.diff(streams)
+            command_args = {Fields.STREAMS: changed, Fields.REMOVED_STREAMS: removed, Fields.DELTA: True}
+        else:
+            snapshot = self._sync_state.snapshot(streams)
+            command_args = {Fields.STREAMS: streams}
+
+        res, cid = self._send_request(command_id, Commands.SYNC_SERVICE_COMMAND, command_args)
+        if res:
+            self._sync_state.begin(cid, snapshot)
+        return res, cid
 
     @Client.is_active_decorator
     def stop_service(self, command_id: int, delay: int) -> RequestReturn:
@@ -171,30 +190,51 @@ class FastoCloudClient(Client):
         command_args = {Fields.STREAM_ID: stream_id, Fields.FEEDBACK_DIRECTORY: feedback_directory, Fields.PATH: path}
         return self._send_request(command_id, Commands.GET_PIPELINE_STREAM_COMMAND, command_args)
 
-    def process_commands(self, data: bytes):
-        if not data:
-            return
-
-        req, resp = self._decode_response_or_request(data)
-        if req:
-            if req.method == Commands.CLIENT_PING_COMMAND:
-                self.__pong(req.id)
-
-            if self._handler:
-                self._handler.process_request(self, req)
-        elif resp:
-            saved_req = self._request_queue.pop(resp.id, None)
-            if saved_req:
-                if saved_req.method == Commands.ACTIVATE_COMMAND and resp.is_message():
-                    self._set_state(ClientStatus.ACTIVE)
-                elif saved_req.method == Commands.STOP_SERVICE_COMMAND and resp.is_message():
-                    self._reset()
-
-            if self._handler:
-                self._handler.process_response(self, saved_req, resp)
-
-    # private
-    @Client.is_active_decorator
-    def __pong(self, command_id: str):
-        ts = make_utc_timestamp_msec()
-        self._send_response(command_id, {Fields.TIMESTAMP: ts})
+    # bulk, results keyed by stream id
+    def start_streams(self, configs) -> BulkOperation:
+        op = BulkOperation(self)
+        for config in configs:
+            op.add(config[Fields.STREAM_ID], lambda command_id, config=config: self.start_stream(command_id, config))
+        return op.start()
+
+    def stop_streams(self, stream_ids, force=False) -> BulkOperation:
+        op = BulkOperation(self)
+        for sid in stream_ids:
+            op.add(sid, lambda command_id, sid=sid: self.stop_stream(command_id, sid, force))
+        return op.start()
+
+    def restart_streams(self, stream_ids) -> BulkOperation:
+        op = BulkOperation(self)
+        for sid in stream_ids:
+            op.add(sid, lambda command_id, sid=sid: self.restart_stream(command_id, sid))
+        return op.start()
+
+    def change_input_sources(self, channels) -> BulkOperation:
+        """
+        channels: dict or pairs of stream id, channel id
+        """
+        op = BulkOperation(self)
+        items = channels.items() if isinstance(channels, dict) else channels
+        for sid, channel_id in items:
+            op.add(sid, lambda command_id, sid=sid, channel_id=channel_id:
+                   self.change_input_source_stream(command_id, sid, channel_id))
+        return op.start()
+
+    # protected
+    def _on_synced(self, req: Request, resp: Response):
+        if resp.is_message():
+            self._sync_state.commit(resp.id)
+        else:
+            self._sync_state.abort(resp.id)
+
+    def _reset(self):
+        self._sync_state.invalidate()
+        super(FastoCloudClient, self)._reset()
+
+    _REQUEST_HOOKS = {Commands.CLIENT_PING_COMMAND: Client._on_client_ping}
+    _RESPONSE_HOOKS = {
+        Commands.ACTIVATE_COMMAND: Client._on_activated,
+        Commands.STOP_SERVICE_COMMAND: Client._on_service_stopped,
+        Commands.SERVICE_PING_COMMAND: Client._on_pong,
+        Commands.SYNC_SERVICE_COMMAND: _on_synced
+    }
@@ -35,8 +35,8 @@ class Fields:
 
 
 class FastoCloudLbClient(Client):
-    def __init__(self, host: str, port: int, handler: IClientHandler, socket_mod):
-        super(FastoCloudLbClient, self).__init__(None, ClientStatus.INIT, handler, socket_mod)
+    def __init__(self, host: str, port: int, handler: IClientHandler, socket_mod, **kwargs):
+        super(FastoCloudLbClient, self).__init__(None, ClientStatus.INIT, handler, socket_mod, **kwargs)
         self._host = host
         self._port = port
 
@@ -95,29 +95,10 @@ class FastoCloudLbClient(Client):
         command_args = {Fields.PATH: path}
         return self._send_request(command_id, Commands.GET_LOG_SERVICE_COMMAND, command_args)
 
-    def process_commands(self, data: bytes):
-        if not data:
-            return
-
-        req, resp = self._decode_response_or_request(data)
-        if req:
-            if req.method == Commands.CLIENT_PING_COMMAND:
-                self.__pong(req.id)
-
-            if self._handler:
-                self._handler.process_request(self, req)
-        elif resp:
-            saved_req = self._request_queue.pop(resp.id, None)
-            if saved_req and saved_req.method == Commands.ACTIVATE_COMMAND and resp.is_message():
-                self._set_state(ClientStatus.ACTIVE)
-            elif saved_req and saved_req.method == Commands.STOP_SERVICE_COMMAND and resp.is_message():
-                self._reset()
-
-            if self._handler:
-                self._handler.process_response(self, saved_req, resp)
-
-    # private
-    @Client.is_active_decorator
-    def __pong(self, command_id: str):
-        ts = make_utc_timestamp_msec()
-        self._send_response(command_id, {Fields.TIMESTAMP: ts})
+    # protected
+    _REQUEST_HOOKS = {Commands.CLIENT_PING_COMMAND: Client._on_client_ping}
+    _RESPONSE_HOOKS = {
+        Commands.ACTIVATE_COMMAND: Client._on_activated,
+        Commands.STOP_SERVICE_COMMAND: Client._on_service_stopped,
+        Commands.SERVICE_PING_COMMAND: Client._on_pong
+    }
@@ -0,0 +1,117 @@
+import struct
+
+_HEADER = struct.Struct('>I')
+
+
+class FrameDecoder:
+    """
+    Incremental decoder of length prefixed frames (4 bytes big-endian size + body) over preallocated buffer.
+    Frames are returned as memoryview slices of internal buffer without copying,
+    they are valid only until next get_buffer/recv_into/feed call.
+    """
+    HEADER_SIZE = _HEADER.size
+    INITIAL_SIZE = 64 * 1024
+    MIN_READ_SIZE = 4 * 1024
+
+    def __init__(self, max_frame_size: int, initial_size=INITIAL_SIZE):
+        self._max_frame_size = max_frame_size
+        self._initial_size = initial_size
+        self._buffer = bytearray(initial_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    def reset(self):
+        self._start = 0
+        self._end = 0
+        if len(self._buffer) != self._initial_size:
+            self._allocate(self._initial_size)
+
+    def buffered(self) -> int:
+        return self._end - self._start
+
+    def get_buffer(self) -> memoryview:
+        # writable free space at the end of buffer, big enough for rest of current frame
+        self._reserve()
+        return self._view[self._end:]
+
+    def buffer_updated(self, nbytes: int):
+        self._end += nbytes
+
+    def recv_into(self, sock, limit=0) -> int:
+        buffer = self.get_buffer()
+        nbytes = sock.recv_into(buffer[:limit] if limit else buffer)
+        self._end += nbytes
+        return nbytes
+
+    def missing(self) -> int:
+        """
+        Bytes needed to complete current frame, header size while header is incomplete
+        """
+        available = self._end - self._start
+        if available < FrameDecoder.HEADER_SIZE:
+            return FrameDecoder.HEADER_SIZE - available
+
+        data_size = min(_HEADER.unpack_from(self._buffer, self._start)[0], self._max_frame_size)
+        return max(0, FrameDecoder.HEADER_SIZE + data_size - available)
+
+    def feed(self, data: bytes):
+        size = len(data)
+        self._reserve(size)
+        self._view[self._end:self._end + size] = data
+        self._end += size
+
+    def next_frame(self):
+        available = self._end - self._start
+        if available < FrameDecoder.HEADER_SIZE:
+            return None
+
+        data_size = _HEADER.unpack_from(self._buffer, self._start)[0]
+        if data_size > self._max_frame_size:
+            raise ValueError('Frame size {0} exceeds limit {1}'.format(data_size, self._max_frame_size))
+
+        if available < FrameDecoder.HEADER_SIZE + data_size:
+            return None
+
+        begin = self._start + FrameDecoder.HEADER_SIZE
+        self._start = begin + data_size
+        return self._view[begin:self._start]
+
+    def frames(self) -> list:
+        result = []
+        frame = self.next_frame()
+        while frame is not None:
+            result.append(frame)
+            frame = self.next_frame()
+        return result
+
+    # private
+    def _reserve(self, extra=MIN_READ_SIZE):
+        pending = self._end - self._start
+        if not pending:
+            self._start = self._end = 0
+            if len(self._buffer) > self._initial_size * 16:
+                self._allocate(self._initial_size)
+
+        frame_size = FrameDecoder.HEADER_SIZE
+        if pending >= FrameDecoder.HEADER_SIZE:
+            frame_size += min(_HEADER.unpack_from(self._buffer, self._start)[0], self._max_frame_size)
+        required = max(frame_size, pending + extra)
+
+        if self._start + required <= len(self._buffer):
+            return
+
+        if required <= len(self._buffer):
+            self._view[:pending] = self._view[self._start:self._end]
+        else:
+            old_view = self._view
+            limit = self._max_frame_size + FrameDecoder.HEADER_SIZE + extra
+            self._allocate(max(required, min(len(self._buffer) * 2, limit)))
+            self._view[:pending] = old_view[self._start:self._end]
+        self._start = 0
+        self._end = pending
+
+    def _allocate(self, size: int):
+        # new buffer instead of resize, frames handed out keep old one alive
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
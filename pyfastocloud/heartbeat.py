@@ -0,0 +1,112 @@
+import time
+
+from pyfastocloud.client import Client
+
+
+class _Beat:
+    __slots__ = ('slot', 'sent', 'missed')
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.sent = None  # time of last ping
+        self.missed = 0
+
+
+class Heartbeat:
+    """
+    Pings all registered active clients every interval seconds from one timer wheel.
+    Clients are spread over wheel slots so pings are not sent in bursts.
+    A beat is missed if nothing was received from node since previous ping,
+    after max_missed beats peer is dead: on_dead(client) is called, or client is disconnected.
+    RTT and clock offset of last ping are available as client.rtt and client.clock_offset.
+
+    heartbeat = Heartbeat(interval=5, max_missed=3)
+    pool = ClientPool(socket_mod, heartbeat=heartbeat)
+    """
+    DEFAULT_INTERVAL = 5
+    DEFAULT_MAX_MISSED = 3
+    RESOLUTION = 0.1
+
+    def __init__(self, interval=DEFAULT_INTERVAL, max_missed=DEFAULT_MAX_MISSED, on_dead=None,
+                 clock=time.monotonic):
+        self.interval = interval
+        self.max_missed = max_missed
+        self._on_dead = on_dead
+        self._clock = clock  # same time base as client.last_seen
+        self._slots = [set() for _ in range(max(1, int(round(interval / Heartbeat.RESOLUTION))))]
+        self._beats = {}  # client: _Beat
+        self._next_slot = 0
+        self._tick = self._to_tick(clock())
+
+    def __len__(self):
+        return len(self._beats)
+
+    def __contains__(self, client: Client):
+        return client in self._beats
+
+    def add(self, client: Client):
+        if client in self._beats:
+            return
+
+        # round robin placement, clients added together are pinged at different ticks
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % len(self._slots)
+        self._beats[client] = _Beat(slot)
+        self._slots[slot].add(client)
+
+    def remove(self, client: Client):
+        beat = self._beats.pop(client, None)
+        if beat:
+            self._slots[beat.slot].discard(client)
+
+    def missed(self, client: Client) -> int:
+        beat = self._beats.get(client)
+        return beat.missed if beat else 0
+
+    def tick(self, now=None) -> list:
+        """
+        Processes elapsed wheel slots, returns clients found dead
+        """
+        if now is None:
+            now = self._clock()
+
+        current = self._to_tick(now)
+        if current <= self._tick:
+            return []
+
+        first = max(self._tick + 1, current - len(self._slots) + 1)
+        self._tick = current
+        dead = []
+        for tick in range(first, current + 1):
+            for client in list(self._slots[tick % len(self._slots)]):
+                if not self._beat(client, now):
+                    dead.append(client)
+        return dead
+
+    # private
+    def _beat(self, client: Client, now: float) -> bool:
+        beat = self._beats[client]
+        if not client.is_active():
+            beat.sent = None
+            beat.missed = 0
+            return True
+
+        if beat.sent is not None:
+            beat.missed = 0 if client.last_seen >= beat.sent else beat.missed + 1
+            if beat.missed >= self.max_missed:
+                beat.sent = None
+                beat.missed = 0
+                if self._on_dead:
+                    self._on_dead(client)
+                else:
+                    client.disconnect()
+                return False
+
+        res, _ = client.ping(client.next_command_id())
+        if res:
+            beat.sent = now
+        return True
+
+    @staticmethod
+    def _to_tick(ts: float) -> int:
+        return int(ts / Heartbeat.RESOLUTION)
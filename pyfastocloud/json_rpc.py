@@ -19,6 +19,8 @@ class JsonRPCErrorCode:
     JSON_RPC_INTERNAL_ERROR = -32603
     JSON_RPC_SERVER_ERROR = -32000
     JSON_RPC_NOT_RFC_ERROR = -32001
+    JSON_RPC_TIMEOUT_ERROR = -32002
+    JSON_RPC_CONNECTION_ERROR = -32003
 
 
 class Request:
@@ -88,12 +90,34 @@ class Response:
 
 
 # rpc functions
-def parse_response_or_request(data: str) -> (Request, Response):
+def parse_response_or_request(data, serializer=None) -> (Request, Response):
+    # data: str or bytes, serializer: IJsonSerializer to decode bytes without str round trip
     try:
-        resp_req = json.loads(data)
+        resp_req = serializer.loads(data) if serializer else json.loads(data)
     except ValueError:
         return None, None
 
+    return _make_response_or_request(resp_req)
+
+
+def parse_responses_or_requests(data, serializer=None) -> list:
+    """
+    Parses single message or JSON-RPC batch (array), returns list of (Request, Response)
+    """
+    try:
+        resp_req = serializer.loads(data) if serializer else json.loads(data)
+    except ValueError:
+        return []
+
+    if isinstance(resp_req, list):
+        return [_make_response_or_request(item) for item in resp_req]
+    return [_make_response_or_request(resp_req)]
+
+
+def _make_response_or_request(resp_req) -> (Request, Response):
+    if not isinstance(resp_req, dict):
+        return None, None
+
     if _METHOD_FIELD in resp_req:
         params = None
         if _PARAMS_FIELD in resp_req:
@@ -0,0 +1,59 @@
+import json
+from abc import ABC, abstractmethod
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# json encoder/decoder for json-rpc messages
+class IJsonSerializer(ABC):
+    @abstractmethod
+    def dumps(self, obj) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes):
+        pass
+
+    @abstractmethod
+    def name(self) -> str:
+        pass
+
+
+class JsonStdSerializer(IJsonSerializer):
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def loads(self, data: bytes):
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        return json.loads(data)
+
+    def name(self) -> str:
+        return 'json'
+
+
+class JsonOrjsonSerializer(IJsonSerializer):
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson package required')
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+    def name(self) -> str:
+        return 'orjson'
+
+
+def make_json_serializer() -> IJsonSerializer:
+    """
+    orjson if installed, stdlib json otherwise
+    """
+    if orjson is not None:
+        return JsonOrjsonSerializer()
+    return JsonStdSerializer()
@@ -0,0 +1,249 @@
+import codecs
+import json
+import re
+
+from pyfastocloud.compressor import ICompressor
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# top level id as last member of response object: ..."id":"0000000000000003"} or ..."id":"...","jsonrpc":"2.0"}
+_TAIL_ID = re.compile(rb'"id"\s*:\s*("(?:[^"\\]|\\.)*"|null|-?\d+)\s*(?:,\s*"jsonrpc"\s*:\s*"2\.0"\s*)?}\s*$')
+_TAIL_SIZE = 4096
+_DECODER = json.JSONDecoder()
+_NUMBER_CHARS = frozenset('.eE+-0123456789')
+
+
+class _Reader:
+    """
+    Text window over iterator of utf-8 byte chunks, consumed text is dropped on every refill
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def fill(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._utf8.decode(b'', True)
+        else:
+            text = self._utf8.decode(chunk)
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        # next non whitespace char, '' at end of data
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError('Expecting {0}'.format(char))
+        self._pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except ValueError:
+                # value continues in next chunk
+                if not self.fill():
+                    raise
+                continue
+
+            # number at end of window may be cut, e.g. 12. or 1e
+            if not self._eof and self._may_continue(end) and self.fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def items(self, read=None):
+        """
+        Values of array after opening bracket, read() consumes items not complete in window (default value())
+        """
+        if read is None:
+            read = self.value
+        scan = _DECODER.scan_once
+        skip = _WHITESPACE.match
+        while True:
+            # fast path: value and separator complete in window
+            buf = self._buf
+            size = len(buf)
+            pos = skip(buf, self._pos).end()
+            try:
+                value, end = scan(buf, pos)
+            except (StopIteration, ValueError):
+                end = size
+            if end < size:
+                end = skip(buf, end).end()
+            if end < size and buf[end] in ',]':
+                self._pos = end + 1
+                yield value
+                if buf[end] == ']':
+                    return
+                continue
+
+            self._pos = pos
+            item = read()
+            char = self.peek()
+            if char not in (',', ']'):
+                raise ValueError('Expecting , or ]')
+            self._pos += 1
+            yield item
+            if char == ']':
+                return
+
+    def skip(self):
+        """
+        Skips value at current position, items complete in window are scanned once by C scanner
+        and only containers spanning refills are descended, so large values are not re-decoded
+        """
+        char = self.peek()
+        if char == '{':
+            for _ in self.members():
+                self._skip_item()
+            return
+        if char != '[':
+            self.value()
+            return
+
+        self._pos += 1
+        if self.peek() == ']':
+            self._pos += 1
+            return
+
+        for _ in self.items(self._skip_item):
+            pass
+
+    def rest(self) -> bytes:
+        return self._buf[self._pos:].encode()
+
+    def members(self):
+        """
+        Keys of object starting at current position, value must be consumed (value() or skip) by caller
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError('Expecting , or }')
+
+    def _skip_item(self):
+        self.peek()
+        buf = self._buf
+        try:
+            _, end = _DECODER.scan_once(buf, self._pos)
+        except (StopIteration, ValueError):
+            end = len(buf)
+        if self._may_continue(end):
+            self.skip()
+        else:
+            self._pos = end
+
+    def _may_continue(self, end: int) -> bool:
+        return end == len(self._buf) or self._buf[end] in _NUMBER_CHARS
+
+
+def iter_array(chunks, path: tuple):
+    """
+    Generator of items of JSON array found by keys path from top level object, e.g. ('result', 'vods').
+    Input is iterable of utf-8 byte chunks, memory is bounded by chunk size plus biggest item
+    (sibling values passed on the way are scanned once and dropped).
+    Nothing is yielded if path doesn't exist, ValueError is raised for malformed data.
+    """
+    reader = _Reader(chunks)
+    if not _seek(reader, path):
+        return
+
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+
+    yield from reader.items()
+
+
+def response_id(chunks):
+    """
+    Top level id of JSON-RPC result response without parsing result: read from members before result,
+    otherwise from tail of data. None if not found or error response.
+    """
+    reader = _Reader(chunks)
+    try:
+        for key in reader.members():
+            if key == 'id':
+                return reader.value()
+            if key == 'result':
+                break
+            if key in ('error', 'method'):
+                # error replies are small and requests are never streamed, parsed as usual
+                return None
+            reader.skip()
+        else:
+            return None
+    except ValueError:
+        return None
+
+    tail = reader.rest()[-_TAIL_SIZE:]
+    for chunk in reader.chunks:
+        tail = (tail + chunk)[-_TAIL_SIZE:]
+    match = _TAIL_ID.search(tail)
+    return json.loads(match.group(1)) if match else None
+
+
+class StreamedArray:
+    """
+    Lazy array of compressed JSON-RPC message, every iteration inflates frame chunk by chunk
+    and yields items of array at path, compressed frame is kept instead of parsed items
+    """
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, compressor: ICompressor, data: bytes, path: tuple, chunk_size=DEFAULT_CHUNK_SIZE):
+        self._compressor = compressor
+        self._data = data
+        self._path = path
+        self._chunk_size = chunk_size
+
+    @property
+    def path(self) -> tuple:
+        return self._path
+
+    def __iter__(self):
+        return iter_array(self._compressor.decompress_chunks(self._data, self._chunk_size), self._path)
+
+
+# private
+def _seek(reader: _Reader, path: tuple) -> bool:
+    for name in path:
+        if reader.peek() != '{':
+            return False
+
+        for key in reader.members():
+            if key == name:
+                break
+            reader.skip()
+        else:
+            return False
+    return reader.peek() == '['
@@ -0,0 +1,291 @@
+import random
+import time
+from enum import IntEnum
+
+from pyfastocloud.client import Client, generate_seq_id, generate_json_rpc_response_error
+from pyfastocloud.client_constants import ClientStatus
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.json_rpc import Request, Response, JsonRPCErrorCode
+
+# session commands, same names for stream, LB and EPG nodes
+ACTIVATE_COMMAND = 'activate_request'
+PREPARE_SERVICE_COMMAND = 'prepare_service'
+SYNC_SERVICE_COMMAND = 'sync_service'
+STOP_SERVICE_COMMAND = 'stop_service'
+
+STREAMS_FIELD = 'streams'
+REMOVED_STREAMS_FIELD = 'removed_streams'
+DELTA_FIELD = 'delta'
+STREAM_ID_FIELD = 'id'
+
+
+class PendingPolicy(IntEnum):
+    FAIL = 0  # requests in flight are reported to handler as connection errors
+    REPLAY = 1  # requests in flight are sent again with same ids once session is restored
+
+
+class Backoff:
+    """
+    Exponential backoff with full jitter, delay is uniform in [0, min(maximum, initial * factor ** attempt)].
+    Jitter spreads reconnects of many clients after network blip.
+    """
+    DEFAULT_INITIAL = 0.25
+    DEFAULT_MAXIMUM = 30
+    DEFAULT_FACTOR = 2
+
+    def __init__(self, initial=DEFAULT_INITIAL, maximum=DEFAULT_MAXIMUM, factor=DEFAULT_FACTOR, rand=random.random):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self._rand = rand
+        self._attempt = 0
+
+    @property
+    def attempt(self) -> int:
+        return self._attempt
+
+    def next_delay(self) -> float:
+        ceiling = min(self.maximum, self.initial * self.factor ** min(self._attempt, 64))
+        self._attempt += 1
+        return ceiling * self._rand()
+
+    def reset(self):
+        self._attempt = 0
+
+
+class ManagedSession(IClientHandler):
+    """
+    Keeps client connected: reconnects with jittered exponential backoff and restores last confirmed
+    activation, prepare_service params and stream set (sync_service) on new connection.
+    Responses of restore requests are not forwarded to handler, state changes and other traffic are.
+    maintain() drives blocking reconnects (limited by connect_timeout), ClientPool.add_session reconnects
+    without blocking when is_due() and reports results with connected() and connect_failed().
+
+    session = ManagedSession(FastoCloudClient, host, port, handler, socket_mod, policy=PendingPolicy.REPLAY)
+    pool.add_session(session)
+    session.client.activate(0, license_key)
+    """
+
+    DEFAULT_CONNECT_TIMEOUT = 5
+
+    def __init__(self, client_cls, host: str, port: int, handler: IClientHandler, socket_mod,
+                 policy=PendingPolicy.FAIL, backoff: Backoff = None, max_attempts=None, clock=time.monotonic,
+                 **kwargs):
+        kwargs.setdefault('connect_timeout', ManagedSession.DEFAULT_CONNECT_TIMEOUT)
+        self._client = client_cls(host, port, self, socket_mod, **kwargs)
+        self._handler = handler
+        self._policy = policy
+        self._backoff = backoff if backoff else Backoff()
+        self._max_attempts = max_attempts
+        self._clock = clock
+        self._enabled = True
+        self._next_attempt = None  # reconnect time while connection is lost
+        self._steps = []  # restore requests not yet sent
+        self._internal = set()  # ids of restore requests in flight
+        self._replay = []
+        self._restoring = False
+        # last confirmed session
+        self._activate_params = None
+        self._prepare_params = None
+        self._streams = None  # id: config
+
+    @property
+    def client(self) -> Client:
+        return self._client
+
+    @property
+    def policy(self) -> PendingPolicy:
+        return self._policy
+
+    def is_restoring(self) -> bool:
+        return self._restoring
+
+    def is_reconnecting(self) -> bool:
+        return self._next_attempt is not None
+
+    def close(self):
+        """
+        Stops reconnects, disconnects client and fails requests waiting for replay
+        """
+        self._enabled = False
+        self._next_attempt = None
+        self._client.disconnect()
+        self._fail_replay()
+
+    def is_due(self, now=None) -> bool:
+        """
+        True if connection is lost and backoff delay passed
+        """
+        if self._next_attempt is None or not self._enabled:
+            return False
+
+        if now is None:
+            now = self._clock()
+        return now >= self._next_attempt
+
+    def maintain(self, now=None) -> bool:
+        """
+        Reconnects if due, returns True if connect was attempted
+        """
+        if now is None:
+            now = self._clock()
+        if not self.is_due(now):
+            return False
+
+        if self._client.connect():
+            self.connected()
+        else:
+            self.connect_failed(now)
+        return True
+
+    def connected(self):
+        """
+        Connect completed, session is restored
+        """
+        self._next_attempt = None
+        self._restore()
+
+    def connect_failed(self, now=None):
+        """
+        Connect refused or timed out, next attempt is scheduled after backoff delay
+        """
+        if not self._enabled:
+            return
+
+        self._schedule(self._clock() if now is None else now)
+
+    # handler
+    def process_response(self, client, req: Request, resp: Response):
+        if req is not None and req.id in self._internal:
+            self._internal.discard(req.id)
+            self._on_restore_response(req, resp)
+            return
+
+        if req is not None and resp.is_error() and self._enabled:
+            code = resp.error.get('code') if isinstance(resp.error, dict) else None
+            if code == JsonRPCErrorCode.JSON_RPC_CONNECTION_ERROR and self._is_replayable(req):
+                self._replay.append(req)
+                return
+
+        if req is not None and resp.is_message():
+            self._remember(req)
+
+        if self._handler:
+            self._handler.process_response(self, req, resp)
+
+    def process_request(self, client, req: Request):
+        if self._handler:
+            self._handler.process_request(self, req)
+
+    def on_client_state_changed(self, client, status: ClientStatus):
+        if status == ClientStatus.INIT:
+            self._steps = []
+            self._internal.clear()
+            self._restoring = False
+            if self._enabled and self._next_attempt is None:
+                self._schedule(self._clock())
+
+        if self._handler:
+            self._handler.on_client_state_changed(self, status)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    # private
+    def _is_replayable(self, req: Request) -> bool:
+        # session commands are restored from confirmed state instead
+        if self._policy != PendingPolicy.REPLAY:
+            return False
+        return req.method not in (ACTIVATE_COMMAND, PREPARE_SERVICE_COMMAND, SYNC_SERVICE_COMMAND,
+                                  STOP_SERVICE_COMMAND)
+
+    def _remember(self, req: Request):
+        if req.method == ACTIVATE_COMMAND:
+            self._activate_params = req.params
+        elif req.method == PREPARE_SERVICE_COMMAND:
+            self._prepare_params = req.params
+        elif req.method == SYNC_SERVICE_COMMAND:
+            self._remember_streams(req.params)
+        elif req.method == STOP_SERVICE_COMMAND:
+            # node is stopped on purpose
+            self._enabled = False
+            self._next_attempt = None
+            self._fail_replay()
+
+    def _remember_streams(self, params: dict):
+        if not params or not isinstance(params.get(STREAMS_FIELD), list):
+            return
+
+        if params.get(DELTA_FIELD) and self._streams is not None:
+            for sid in params.get(REMOVED_STREAMS_FIELD, []):
+                self._streams.pop(sid, None)
+        else:
+            self._streams = {}
+
+        for stream in params[STREAMS_FIELD]:
+            self._streams[stream[STREAM_ID_FIELD]] = stream
+
+    def _schedule(self, now: float):
+        if self._max_attempts is not None and self._backoff.attempt >= self._max_attempts:
+            self._next_attempt = None
+            self._enabled = False
+            self._fail_replay()
+            return
+
+        self._next_attempt = now + self._backoff.next_delay()
+
+    def _restore(self):
+        steps = []
+        if self._activate_params is not None:
+            steps.append((ACTIVATE_COMMAND, self._activate_params))
+            if self._prepare_params is not None:
+                steps.append((PREPARE_SERVICE_COMMAND, self._prepare_params))
+            if self._streams is not None:
+                steps.append((SYNC_SERVICE_COMMAND, {STREAMS_FIELD: list(self._streams.values())}))
+
+        self._steps = steps
+        self._restoring = True
+        self._next_step()
+
+    def _next_step(self):
+        # one request per round trip, node accepts service commands only after activation
+        if not self._steps:
+            self._restoring = False
+            self._backoff.reset()
+            self._send_replay()
+            return
+
+        method, params = self._steps.pop(0)
+        req = Request(generate_seq_id(self._client.next_command_id()), method, params)
+        res, cid = self._client.send_request(req)
+        if res:
+            self._internal.add(cid)
+        else:
+            self._client.disconnect()
+
+    def _on_restore_response(self, req: Request, resp: Response):
+        if resp.is_error():
+            # refused by node, connection is dropped and restore retried after backoff
+            self._client.disconnect()
+            return
+
+        self._next_step()
+
+    def _send_replay(self):
+        replay = self._replay
+        self._replay = []
+        for req in replay:
+            res, _ = self._client.send_request(req)
+            if not res:
+                self._fail_request(req, 'Replay failed')
+
+    def _fail_replay(self):
+        replay = self._replay
+        self._replay = []
+        for req in replay:
+            self._fail_request(req, 'Connection lost')
+
+    def _fail_request(self, req: Request, message: str):
+        if self._handler:
+            resp = generate_json_rpc_response_error(message, JsonRPCErrorCode.JSON_RPC_CONNECTION_ERROR, req.id)
+            self._handler.process_response(self, req, resp)
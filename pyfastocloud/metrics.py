@@ -0,0 +1,161 @@
+import weakref
+
+
+class ClientMetrics:
+    """
+    Plain counters of one client, updated from the owner thread only
+    """
+    __slots__ = ('frames_in', 'frames_out', 'bytes_in', 'bytes_out', 'payload_bytes_in', 'payload_bytes_out',
+                 'encode_seconds', 'decode_seconds')
+
+    def __init__(self):
+        self.frames_in = 0
+        self.frames_out = 0
+        self.bytes_in = 0  # on wire, compressed
+        self.bytes_out = 0
+        self.payload_bytes_in = 0  # json
+        self.payload_bytes_out = 0
+        self.encode_seconds = 0.0
+        self.decode_seconds = 0.0
+
+    def on_encode(self, payload_size: int, frame_size: int, seconds: float):
+        self.frames_out += 1
+        self.payload_bytes_out += payload_size
+        self.bytes_out += frame_size
+        self.encode_seconds += seconds
+
+    def on_decode(self, frame_size: int, payload_size: int, seconds: float):
+        self.frames_in += 1
+        self.bytes_in += frame_size
+        self.payload_bytes_in += payload_size
+        self.decode_seconds += seconds
+
+
+class MetricsRegistry:
+    """
+    Registry of client metrics rendered in Prometheus text exposition format,
+    labelled by client class and node (host:port). Clients are held by weak references.
+
+    metrics = MetricsRegistry()
+    client = FastoCloudClient(host, port, handler, socket_mod, metrics=metrics)
+    ...
+    body = metrics.render()
+    """
+    PREFIX = 'pyfastocloud_'
+    DEFAULT_RTT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    COUNTERS = (('frames_received_total', 'frames_in', 'Frames received'),
+                ('frames_sent_total', 'frames_out', 'Frames sent'),
+                ('bytes_received_total', 'bytes_in', 'Compressed bytes received'),
+                ('bytes_sent_total', 'bytes_out', 'Compressed bytes sent'),
+                ('payload_bytes_received_total', 'payload_bytes_in', 'JSON bytes received'),
+                ('payload_bytes_sent_total', 'payload_bytes_out', 'JSON bytes sent'),
+                ('decode_seconds_total', 'decode_seconds', 'Time spent decompressing and parsing frames'),
+                ('encode_seconds_total', 'encode_seconds', 'Time spent serializing and compressing frames'))
+
+    def __init__(self, rtt_buckets=DEFAULT_RTT_BUCKETS):
+        self.rtt_buckets = tuple(rtt_buckets)
+        self._clients = weakref.WeakKeyDictionary()  # client: ClientMetrics
+
+    def __len__(self):
+        return len(self._clients)
+
+    def register(self, client) -> ClientMetrics:
+        metrics = self._clients.get(client)
+        if metrics is None:
+            metrics = self._clients[client] = ClientMetrics()
+        return metrics
+
+    def unregister(self, client):
+        self._clients.pop(client, None)
+
+    def snapshot(self) -> dict:
+        """
+        Aggregated values per (client class, node) labels
+        """
+        result = {}
+        for client, metrics in list(self._clients.items()):
+            labels = MetricsRegistry._labels(client)
+            entry = result.get(labels)
+            if entry is None:
+                entry = result[labels] = {'send_calls': 0, 'pending_requests': 0, 'requests': {}}
+                for _, attr, _ in MetricsRegistry.COUNTERS:
+                    entry[attr] = 0
+
+            for _, attr, _ in MetricsRegistry.COUNTERS:
+                entry[attr] += getattr(metrics, attr)
+            entry['send_calls'] += client.send_calls
+            entry['pending_requests'] += client.pending_requests_count
+            for method, stats in client.request_stats.items():
+                requests = entry['requests'].get(method)
+                if requests is None:
+                    requests = entry['requests'][method] = {'count': 0, 'sum': 0.0, 'timeouts': 0,
+                                                            'buckets': [0] * (len(self.rtt_buckets) + 1)}
+                requests['count'] += stats.count
+                requests['sum'] += stats.total
+                requests['timeouts'] += stats.timeouts
+                if stats.bucket_counts is not None:
+                    requests['buckets'] = [a + b for a, b in zip(requests['buckets'], stats.bucket_counts)]
+        return result
+
+    def render(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        for name, attr, description in MetricsRegistry.COUNTERS:
+            self._header(lines, name, description, 'counter')
+            for labels, entry in snapshot.items():
+                lines.append(self._sample(name, labels, entry[attr]))
+
+        self._header(lines, 'compression_ratio', 'JSON bytes per compressed byte, both directions', 'gauge')
+        for labels, entry in snapshot.items():
+            wire = entry['bytes_in'] + entry['bytes_out']
+            payload = entry['payload_bytes_in'] + entry['payload_bytes_out']
+            lines.append(self._sample('compression_ratio', labels, payload / wire if wire else 0))
+
+        self._header(lines, 'send_calls_total', 'Send syscalls', 'counter')
+        for labels, entry in snapshot.items():
+            lines.append(self._sample('send_calls_total', labels, entry['send_calls']))
+
+        self._header(lines, 'pending_requests', 'Requests waiting for response', 'gauge')
+        for labels, entry in snapshot.items():
+            lines.append(self._sample('pending_requests', labels, entry['pending_requests']))
+
+        self._header(lines, 'request_timeouts_total', 'Requests expired without response', 'counter')
+        for labels, entry in snapshot.items():
+            for method, requests in entry['requests'].items():
+                lines.append(self._sample('request_timeouts_total', labels + (('method', method),),
+                                          requests['timeouts']))
+
+        name = 'request_duration_seconds'
+        self._header(lines, name, 'Request send to response latency', 'histogram')
+        for labels, entry in snapshot.items():
+            for method, requests in entry['requests'].items():
+                method_labels = labels + (('method', method),)
+                cumulative = 0
+                for bound, count in zip(self.rtt_buckets + ('+Inf',), requests['buckets']):
+                    cumulative += count
+                    lines.append(self._sample(name + '_bucket', method_labels + (('le', str(bound)),), cumulative))
+                lines.append(self._sample(name + '_sum', method_labels, requests['sum']))
+                lines.append(self._sample(name + '_count', method_labels, requests['count']))
+        return '\n'.join(lines) + '\n'
+
+    # private
+    @staticmethod
+    def _labels(client) -> tuple:
+        host = getattr(client, 'host', None)
+        node = '' if host is None else '{0}:{1}'.format(host, getattr(client, 'port', ''))
+        return ('client', type(client).__name__), ('node', node)
+
+    @staticmethod
+    def _header(lines: list, name: str, description: str, kind: str):
+        lines.append('# HELP {0}{1} {2}'.format(MetricsRegistry.PREFIX, name, description))
+        lines.append('# TYPE {0}{1} {2}'.format(MetricsRegistry.PREFIX, name, kind))
+
+    @staticmethod
+    def _sample(name: str, labels: tuple, value) -> str:
+        rendered = ','.join('{0}="{1}"'.format(key, MetricsRegistry._escape(val)) for key, val in labels)
+        return '{0}{1}{{{2}}} {3}'.format(MetricsRegistry.PREFIX, name, rendered, value)
+
+    @staticmethod
+    def _escape(value) -> str:
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,202 @@
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pyfastocloud.fastocloud_client import Commands
+from pyfastocloud.json_rpc import Request
+from pyfastocloud.structs.ml.image_box_batch import ImageBoxBatch
+
+
+def iou(first, second):
+    """
+    Intersection over union of boxes, arrays of shape (4, n): left, top, width, height
+    """
+    left = np.maximum(first[0], second[0])
+    top = np.maximum(first[1], second[1])
+    right = np.minimum(first[0] + first[2], second[0] + second[2])
+    bottom = np.minimum(first[1] + first[3], second[1] + second[3])
+    intersection = np.clip(right - left, 0, None) * np.clip(bottom - top, 0, None)
+    union = first[2] * first[3] + second[2] * second[3] - intersection
+    return np.divide(intersection, union, out=np.zeros(intersection.shape), where=union > 0)
+
+
+class DetectionWindow:
+    """
+    Last capacity detections of one stream in a preallocated structured ring,
+    ingest cost is O(detections) and memory does not depend on notifications rate.
+    """
+    DTYPE = [('timestamp', 'f8'), ('frame', 'i8'), ('class_id', 'i4'), ('object_id', 'i8'), ('confidence', 'f4'),
+             ('left', 'i4'), ('top', 'i4'), ('width', 'i4'), ('height', 'i4')]
+    BATCH_COLUMNS = ('class_id', 'object_id', 'confidence', 'left', 'top', 'width', 'height')
+
+    def __init__(self, capacity: int):
+        if np is None:
+            raise ImportError('numpy package required')
+
+        self.capacity = capacity
+        self._rows = np.zeros(capacity, dtype=DetectionWindow.DTYPE)
+        self._head = 0
+        self._count = 0
+        self._frame = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def frame(self) -> int:
+        return self._frame
+
+    def append(self, batch: ImageBoxBatch, timestamp: float):
+        self._frame += 1
+        size = len(batch)
+        if not size:
+            return
+
+        columns = batch.columns()
+        skip = max(0, size - self.capacity)
+        size -= skip
+        positions = (self._head + np.arange(size)) % self.capacity
+        self._rows['timestamp'][positions] = timestamp
+        self._rows['frame'][positions] = self._frame
+        for name in DetectionWindow.BATCH_COLUMNS:
+            self._rows[name][positions] = columns[name][skip:]
+        self._head = (self._head + size) % self.capacity
+        self._count = min(self._count + size, self.capacity)
+
+    def rows(self, since=None):
+        """
+        Detections in chronological order, optionally with timestamp >= since
+        """
+        positions = (self._head - self._count + np.arange(self._count)) % self.capacity
+        rows = self._rows[positions]
+        if since is not None:
+            rows = rows[rows['timestamp'] >= since]
+        return rows
+
+    def latest(self):
+        rows = self.rows()
+        return rows[rows['frame'] == self._frame]
+
+
+class MlAnalytics:
+    """
+    Rolling per stream windows of ml_notification_stream detections with vectorised aggregates:
+    per class counts, dwell time per object_id and IoU track continuity.
+    ingest has StatisticsStore signature so it can be used with StatisticsHandler.
+    """
+    DEFAULT_CAPACITY = 4096
+    DEFAULT_IOU_THRESHOLD = 0.3
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, clock=time.monotonic):
+        if np is None:
+            raise ImportError('numpy package required')
+
+        self.capacity = capacity
+        self._clock = clock
+        self._windows = {}  # sid: DetectionWindow
+
+    def __len__(self):
+        return len(self._windows)
+
+    def __contains__(self, sid):
+        return sid in self._windows
+
+    def keys(self) -> list:
+        return list(self._windows)
+
+    def window(self, sid) -> DetectionWindow:
+        return self._windows.get(sid)
+
+    def ingest(self, client, req: Request) -> bool:
+        """
+        Records ml notification, returns False for other requests
+        """
+        if req.method != Commands.ML_NOTIFICATION_STREAM_COMMAND or not req.params:
+            return False
+
+        self.record(ImageBoxBatch.make_entry(req.params))
+        return True
+
+    def record(self, batch: ImageBoxBatch, timestamp=None):
+        if batch.sid is None:
+            return
+
+        window = self._windows.get(batch.sid)
+        if window is None:
+            window = DetectionWindow(self.capacity)
+            self._windows[batch.sid] = window
+        window.append(batch, self._clock() if timestamp is None else timestamp)
+
+    def remove(self, sid):
+        self._windows.pop(sid, None)
+
+    def class_counts(self, sid) -> dict:
+        """
+        Detections per class_id in the latest notification of stream
+        """
+        window = self._windows.get(sid)
+        if window is None:
+            return {}
+
+        classes, counts = np.unique(window.latest()['class_id'], return_counts=True)
+        return dict(zip(classes.tolist(), counts.tolist()))
+
+    def occupancy(self, sid, since=None) -> dict:
+        """
+        Distinct object_id per class_id within window
+        """
+        rows = self._rows(sid, since)
+        if not rows.size:
+            return {}
+
+        pairs = np.unique(np.stack((rows['class_id'].astype(np.int64), rows['object_id'])), axis=1)
+        classes, counts = np.unique(pairs[0], return_counts=True)
+        return dict(zip(classes.tolist(), counts.tolist()))
+
+    def dwell_times(self, sid, since=None) -> dict:
+        """
+        Seconds between first and last sighting of every object_id within window
+        """
+        rows = self._rows(sid, since)
+        if not rows.size:
+            return {}
+
+        rows = rows[np.argsort(rows['object_id'], kind='stable')]
+        objects, starts = np.unique(rows['object_id'], return_index=True)
+        first = np.minimum.reduceat(rows['timestamp'], starts)
+        last = np.maximum.reduceat(rows['timestamp'], starts)
+        return dict(zip(objects.tolist(), (last - first).tolist()))
+
+    def track_continuity(self, sid, threshold=DEFAULT_IOU_THRESHOLD, since=None) -> dict:
+        """
+        object_id: (mean IoU between consecutive sightings, breaks), a break is a skipped
+        notification or IoU below threshold
+        """
+        rows = self._rows(sid, since)
+        if not rows.size:
+            return {}
+
+        rows = rows[np.lexsort((rows['frame'], rows['object_id']))]
+        same = rows['object_id'][1:] == rows['object_id'][:-1]
+        boxes = np.stack([rows[name].astype(np.float64) for name in ('left', 'top', 'width', 'height')])
+        overlaps = iou(boxes[:, :-1], boxes[:, 1:])
+        broken = same & ((rows['frame'][1:] - rows['frame'][:-1] > 1) | (overlaps < threshold))
+
+        objects, starts = np.unique(rows['object_id'], return_index=True)
+        # transitions belong to object of their second row
+        owner = np.searchsorted(starts, np.arange(1, rows.size), side='right') - 1
+        transitions = np.bincount(owner[same], minlength=objects.size)
+        overlap_sum = np.bincount(owner[same], weights=overlaps[same], minlength=objects.size)
+        breaks = np.bincount(owner[broken], minlength=objects.size)
+        means = np.divide(overlap_sum, transitions, out=np.zeros(objects.size), where=transitions > 0)
+        return {obj: (mean, brk) for obj, mean, brk in zip(objects.tolist(), means.tolist(), breaks.tolist())}
+
+    # private
+    def _rows(self, sid, since):
+        window = self._windows.get(sid)
+        if window is None:
+            return np.zeros(0, dtype=DetectionWindow.DTYPE)
+        return window.rows(since)
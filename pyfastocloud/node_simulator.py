@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for FastoCloud media node: framed gzip JSON-RPC server for load testing clients
+
+python3 -m pyfastocloud.node_simulator --port 6317 --streams 2000 --statistic-interval 5 --ml-rate 100
+"""
+import argparse
+import asyncio
+import random
+import struct
+import time
+
+from pyfastocloud.client import Client, make_utc_timestamp_msec
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import Commands, Fields
+from pyfastocloud.frame_decoder import FrameDecoder
+from pyfastocloud.json_rpc import Request, Response, JsonRPCErrorCode, JSON_RPC_OK_RESULT, \
+    parse_responses_or_requests
+from pyfastocloud.json_serializer import make_json_serializer
+
+
+class _NodeSession(asyncio.BufferedProtocol):
+    # one client connection to simulated node
+    TICK = 0.1
+
+    def __init__(self, node):
+        self._node = node
+        self._decoder = FrameDecoder(Client.MAX_PACKET_SIZE)
+        self._transport = None
+        self._timer = None
+        self._random = random.Random(node.seed)
+        self._next_statistic = 0
+        self._next_ping = 0
+        self._ml_credit = 0.0
+        self._ping_seq = 0
+        self.activated = False
+        self.streams = {}  # id: config
+        self.requests_count = 0
+
+    # protocol
+    def connection_made(self, transport: asyncio.Transport):
+        self._transport = transport
+        now = time.monotonic()
+        self._next_statistic = now + self._node.statistic_interval
+        self._next_ping = now + self._node.ping_interval
+        self.streams = {'sim_{0:06d}'.format(i): {Fields.STREAM_ID: 'sim_{0:06d}'.format(i)}
+                        for i in range(self._node.streams_count)}
+        self._timer = asyncio.get_running_loop().call_later(_NodeSession.TICK, self._on_tick)
+        self._node.sessions.add(self)
+
+    def get_buffer(self, sizehint: int):
+        return self._decoder.get_buffer()
+
+    def buffer_updated(self, nbytes: int):
+        self._decoder.buffer_updated(nbytes)
+        try:
+            frames = self._decoder.frames()
+        except ValueError:
+            self._transport.close()
+            return
+
+        for frame in frames:
+            self._on_frame(frame)
+
+    def close(self):
+        if self._transport:
+            self._transport.close()
+
+    def connection_lost(self, exc):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._node.sessions.discard(self)
+
+    # private
+    def _on_frame(self, frame: memoryview):
+        data = self._node.compressor.decompress(frame)
+        is_batch = data[:1] == b'['
+        replies = []
+        for req, _ in parse_responses_or_requests(data, self._node.serializer):
+            if not req:
+                continue
+
+            self.requests_count += 1
+            resp = self._process(req)
+            if resp and not req.is_notification():
+                replies.append(resp.to_dict())
+
+        if not replies:
+            return
+
+        if self._node.response_delay:
+            asyncio.get_running_loop().call_later(self._node.response_delay, self._send, replies, is_batch)
+        else:
+            self._send(replies, is_batch)
+
+    def _process(self, req: Request) -> Response:
+        params = req.params if isinstance(req.params, dict) else {}
+        if req.method == Commands.ACTIVATE_COMMAND:
+            key = self._node.license_key
+            if key is not None and params.get(Fields.LICENSE_KEY) != key:
+                return self._error(req, 'Invalid license key')
+            self.activated = True
+            return Response(req.id, JSON_RPC_OK_RESULT)
+
+        if not self.activated:
+            return self._error(req, 'Not active')
+
+        if req.method == Commands.SERVICE_PING_COMMAND:
+            return Response(req.id, {Fields.TIMESTAMP: make_utc_timestamp_msec()})
+
+        if req.method == Commands.SYNC_SERVICE_COMMAND:
+            streams = {stream[Fields.STREAM_ID]: stream for stream in params.get(Fields.STREAMS, [])}
+            if params.get(Fields.DELTA):
+                for sid in params.get(Fields.REMOVED_STREAMS, []):
+                    self.streams.pop(sid, None)
+                self.streams.update(streams)
+            else:
+                self.streams = streams
+            return Response(req.id, JSON_RPC_OK_RESULT)
+
+        if req.method == Commands.START_STREAM_COMMAND:
+            config = params.get(Fields.CONFIG, {})
+            sid = config.get(Fields.STREAM_ID)
+            if sid is None:
+                return self._error(req, 'Invalid config')
+            self.streams[sid] = config
+            return Response(req.id, JSON_RPC_OK_RESULT)
+
+        if req.method == Commands.STOP_STREAM_COMMAND:
+            sid = params.get(Fields.STREAM_ID)
+            if self.streams.pop(sid, None) is None:
+                return self._error(req, 'Stream not found')
+            self._notify(Commands.QUIT_STATUS_STREAM_COMMAND, {Fields.STREAM_ID: sid, 'exit_status': 0, 'signal': 15})
+            return Response(req.id, JSON_RPC_OK_RESULT)
+
+        if req.method in (Commands.RESTART_STREAM_COMMAND, Commands.CHANGE_INPUT_STREAM_COMMAND,
+                          Commands.GET_LOG_STREAM_COMMAND, Commands.GET_PIPELINE_STREAM_COMMAND):
+            if params.get(Fields.STREAM_ID) not in self.streams:
+                return self._error(req, 'Stream not found')
+            return Response(req.id, JSON_RPC_OK_RESULT)
+
+        if req.method in (Commands.PREPARE_SERVICE_COMMAND, Commands.GET_LOG_SERVICE_COMMAND):
+            return Response(req.id, JSON_RPC_OK_RESULT)
+
+        if req.method == Commands.STOP_SERVICE_COMMAND:
+            delay = params.get(Fields.DELAY, 0)
+            asyncio.get_running_loop().call_later(max(delay, 0) + _NodeSession.TICK, self._transport.close)
+            return Response(req.id, JSON_RPC_OK_RESULT)
+
+        if req.method in (Commands.PROBE_IN_STREAM_COMMAND, Commands.PROBE_OUT_STREAM_COMMAND):
+            return Response(req.id, self._probe(params.get(Fields.URL)))
+
+        if req.method == Commands.SCAN_FOLDER_COMMAND:
+            directory = params.get(Fields.DIRECTORY, '/')
+            return Response(req.id, {'files': ['{0}/file_{1}.mp4'.format(directory, i) for i in range(10)]})
+
+        if req.method == Commands.SCAN_FOLDER_VODS_COMMAND:
+            directory = params.get(Fields.DIRECTORY, '/')
+            icon = params.get(Fields.DEFAULT_LOGO)
+            vods = [{'name': 'file_{0}'.format(i), 'path': '{0}/file_{1}.mp4'.format(directory, i), 'icon': icon,
+                     'duration': 5400000} for i in range(self._node.vods_count)]
+            return Response(req.id, {'vods': vods})
+
+        return Response(req.id, None, {'code': JsonRPCErrorCode.JSON_RPC_METHOD_NOT_FOUND, 'message': 'Not found'})
+
+    @staticmethod
+    def _error(req: Request, message: str) -> Response:
+        return Response(req.id, None, {'code': JsonRPCErrorCode.JSON_RPC_SERVER_ERROR, 'message': message})
+
+    @staticmethod
+    def _probe(url) -> dict:
+        return {'streams': [{'index': 0, 'codec_name': 'h264', 'codec_type': 'video', 'width': 1280, 'height': 720,
+                             'r_frame_rate': '25/1', 'avg_frame_rate': '25/1', 'bit_rate': '4000000'},
+                            {'index': 1, 'codec_name': 'aac', 'codec_type': 'audio', 'channels': 2,
+                             'sample_rate': '48000', 'bit_rate': '128000'}],
+                'format': {'filename': url.get('uri', '') if isinstance(url, dict) else str(url), 'nb_streams': 2,
+                           'format_name': 'mpegts', 'start_time': '0.000000'}}
+
+    def _on_tick(self):
+        now = time.monotonic()
+        if self.activated and not self._transport.is_closing():
+            if self._node.statistic_interval and now >= self._next_statistic:
+                self._next_statistic = now + self._node.statistic_interval
+                self._emit_statistics()
+
+            if self._node.ml_rate:
+                self._ml_credit += self._node.ml_rate * _NodeSession.TICK
+                self._emit_ml_notifications(int(self._ml_credit))
+                self._ml_credit -= int(self._ml_credit)
+
+            if self._node.ping_interval and now >= self._next_ping:
+                self._next_ping = now + self._node.ping_interval
+                self._ping_seq += 1
+                self._write(Request('{0:016x}'.format(self._ping_seq), Commands.CLIENT_PING_COMMAND,
+                                    {Fields.TIMESTAMP: make_utc_timestamp_msec()}).to_dict())
+        self._timer = asyncio.get_running_loop().call_later(_NodeSession.TICK, self._on_tick)
+
+    def _emit_statistics(self):
+        ts = make_utc_timestamp_msec()
+        frames = [self._frame(Request(None, Commands.STATISTIC_STREAM_COMMAND, self._stream_statistic(sid, ts))
+                              .to_dict()) for sid in self.streams]
+        service = {'cpu': self._random.uniform(0, 100), 'gpu': 0, 'load_average': '1.00 1.00 1.00',
+                   'memory_total': 16 * 1024 ** 3, 'memory_free': 8 * 1024 ** 3, 'hdd_total': 512 * 1024 ** 3,
+                   'hdd_free': 256 * 1024 ** 3, 'bandwidth_in': 4000000 * len(self.streams),
+                   'bandwidth_out': 8000000 * len(self.streams), 'uptime': int(time.monotonic()), 'timestamp': ts}
+        frames.append(self._frame(Request(None, Commands.STATISTIC_SERVICE_COMMAND, service).to_dict()))
+        self._transport.writelines(frames)
+
+    def _stream_statistic(self, sid: str, ts: int) -> dict:
+        bps = self._random.randint(1000000, 8000000)
+        return {Fields.STREAM_ID: sid, 'type': 1, 'cpu': self._random.uniform(0, 20),
+                'rss': self._random.randint(50, 500) * 1024 * 1024, 'status': 4, 'restarts': 0,
+                'loop_start_time': ts, 'start_time': ts, Fields.TIMESTAMP: ts, 'idle_time': 0, 'quality': 100,
+                'input_streams': [{'id': 0, 'last_update': ts, 'total_bytes': bps, 'bps': bps, 'dbps': bps}],
+                'output_streams': [{'id': 0, 'last_update': ts, 'total_bytes': bps, 'bps': bps, 'dbps': bps}]}
+
+    def _emit_ml_notifications(self, count: int):
+        if not count or not self.streams:
+            return
+
+        sids = list(self.streams)
+        frames = []
+        for _ in range(count):
+            images = [{'unique_component_id': 1, 'class_id': self._random.randint(0, 3),
+                       'object_id': self._random.randint(0, 1000), 'confidence': self._random.random(),
+                       'left': self._random.randint(0, 1200), 'top': self._random.randint(0, 600),
+                       'width': 64, 'height': 128} for _ in range(self._node.ml_boxes)]
+            params = {Fields.STREAM_ID: self._random.choice(sids), 'images': images}
+            frames.append(self._frame(Request(None, Commands.ML_NOTIFICATION_STREAM_COMMAND, params).to_dict()))
+        self._transport.writelines(frames)
+
+    def _notify(self, method: str, params: dict):
+        self._write(Request(None, method, params).to_dict())
+
+    def _send(self, replies: list, is_batch: bool):
+        if is_batch:
+            self._write(replies)
+        else:
+            self._transport.writelines([self._frame(reply) for reply in replies])
+
+    def _write(self, message):
+        if not self._transport.is_closing():
+            self._transport.write(self._frame(message))
+
+    def _frame(self, message) -> bytes:
+        compressed = self._node.compressor.compress(self._node.serializer.dumps(message))
+        return struct.pack('>I', len(compressed)) + compressed
+
+
+class NodeSimulator:
+    """
+    Asyncio server speaking FastoCloud node protocol, every connection is independent simulated node
+    with streams_count synthetic streams plus streams started by client.
+    Emits statistic_stream/statistic_service every statistic_interval seconds for all streams,
+    ml_rate ml_notification_stream messages per second and ping_client every ping_interval seconds.
+    """
+    DEFAULT_STATISTIC_INTERVAL = 5
+
+    def __init__(self, host='127.0.0.1', port=0, streams_count=0, statistic_interval=DEFAULT_STATISTIC_INTERVAL,
+                 ml_rate=0, ml_boxes=8, ping_interval=0, license_key=None, response_delay=0, vods_count=100, seed=0):
+        self.host = host
+        self.port = port
+        self.streams_count = streams_count
+        self.statistic_interval = statistic_interval
+        self.ml_rate = ml_rate
+        self.ml_boxes = ml_boxes
+        self.ping_interval = ping_interval
+        self.license_key = license_key
+        self.response_delay = response_delay
+        self.vods_count = vods_count
+        self.seed = seed
+        self.compressor = CompressorZlib(True)
+        self.serializer = make_json_serializer()
+        self.sessions = set()
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.get_running_loop().create_server(lambda: _NodeSession(self), self.host,
+                                                                      self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if not self._server:
+            return
+
+        self._server.close()
+        for session in list(self.sessions):
+            session.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def serve_forever(self):
+        if not self._server:
+            await self.start()
+        await self._server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FastoCloud node simulator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6317)
+    parser.add_argument('--streams', type=int, default=0, help='synthetic streams per connection')
+    parser.add_argument('--statistic-interval', type=float, default=NodeSimulator.DEFAULT_STATISTIC_INTERVAL)
+    parser.add_argument('--ml-rate', type=float, default=0, help='ml notifications per second')
+    parser.add_argument('--ml-boxes', type=int, default=8, help='detections per ml notification')
+    parser.add_argument('--ping-interval', type=float, default=0, help='ping_client interval, 0 disables')
+    parser.add_argument('--license-key', help='accept only this license key')
+    parser.add_argument('--response-delay', type=float, default=0, help='seconds before each reply')
+    args = parser.parse_args()
+
+    node = NodeSimulator(args.host, args.port, args.streams, args.statistic_interval, args.ml_rate, args.ml_boxes,
+                         args.ping_interval, args.license_key, args.response_delay)
+    try:
+        asyncio.run(node.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
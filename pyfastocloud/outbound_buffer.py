@@ -0,0 +1,58 @@
+from collections import deque
+from itertools import islice
+
+
+class OutboundBuffer:
+    """
+    Queue of outgoing frames written with gather writes (sendmsg), tail of partially written frame stays queued
+    """
+    MAX_IOV = 512  # IOV_MAX is 1024 on Linux
+
+    def __init__(self):
+        self._frames = deque()
+        self._size = 0
+        self.send_calls = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, frame: bytes):
+        if frame:
+            self._frames.append(frame)
+            self._size += len(frame)
+
+    def clear(self):
+        self._frames.clear()
+        self._size = 0
+
+    def flush(self, sock) -> bool:
+        """
+        Writes queued frames, returns True if buffer drained, False if socket would block.
+        Socket errors are raised to the caller.
+        """
+        sendmsg = getattr(sock, 'sendmsg', None)
+        while self._frames:
+            self.send_calls += 1
+            try:
+                if sendmsg and len(self._frames) > 1:
+                    sent = sendmsg(list(islice(self._frames, OutboundBuffer.MAX_IOV)))
+                else:
+                    sent = sock.send(self._frames[0])
+            except (BlockingIOError, InterruptedError):
+                return False
+
+            self._consume(sent)
+        return True
+
+    # private
+    def _consume(self, sent: int):
+        self._size -= sent
+        frames = self._frames
+        while sent:
+            frame_size = len(frames[0])
+            if sent < frame_size:
+                frames[0] = memoryview(frames[0])[sent:]
+                return
+
+            frames.popleft()
+            sent -= frame_size
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from pyfastocloud.client_asyncio import AsyncioClient
+from pyfastocloud.streams_sync import config_hash
+from pyfastocloud.structs.ffprobe_result import FFprobeResult
+
+
+class ProbeCache:
+    """
+    Client side cache of probe_in_stream/probe_out_stream results keyed by url, TTL + LRU eviction.
+    Concurrent probes of the same url share one request to node (single-flight).
+    Failed probes are not cached.
+    """
+    DEFAULT_TTL = 60
+    DEFAULT_MAX_SIZE = 1024
+
+    def __init__(self, client: AsyncioClient, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE, clock=time.monotonic):
+        self._client = client
+        self._ttl = ttl
+        self._max_size = max_size
+        self._clock = clock
+        self._entries = OrderedDict()  # key: (expire time, FFprobeResult)
+        self._inflight = {}  # key: task
+        self.hits = 0
+        self.misses = 0
+        self.joins = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def probe_in_stream(self, url: dict) -> FFprobeResult:
+        return await self._probe('probe_in_stream', url)
+
+    async def probe_out_stream(self, url: dict) -> FFprobeResult:
+        return await self._probe('probe_out_stream', url)
+
+    def invalidate(self, url=None):
+        if url is None:
+            self._entries.clear()
+            return
+
+        digest = config_hash(url)
+        for method in ('probe_in_stream', 'probe_out_stream'):
+            self._entries.pop((method, digest), None)
+
+    # private
+    async def _probe(self, method: str, url) -> FFprobeResult:
+        key = (method, config_hash(url))
+        entry = self._entries.get(key)
+        if entry:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task:
+            self.joins += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(method, url, key))
+            self._inflight[key] = task
+        # caller cancellation must not cancel probe shared with other callers
+        return await asyncio.shield(task)
+
+    async def _fetch(self, method: str, url, key) -> FFprobeResult:
+        try:
+            resp = await getattr(self._client, method)(self._client.next_command_id(), url)
+            if not resp or not resp.is_message():
+                return None
+
+            result = FFprobeResult.make_entry(resp.result)
+            self._entries[key] = (self._clock() + self._ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            return result
+        finally:
+            del self._inflight[key]
@@ -0,0 +1,175 @@
+import time
+from bisect import bisect_left
+
+
+class RequestStats:
+    """
+    Send -> reply latency statistics of one JSON-RPC method, seconds.
+    With buckets (sorted upper bounds) latencies are also counted into histogram, last bucket is +Inf.
+    """
+    __slots__ = ('count', 'total', 'min', 'max', 'timeouts', 'buckets', 'bucket_counts')
+
+    def __init__(self, buckets=None):
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1) if buckets else None
+
+    def __str__(self):
+        return 'count: {0}, mean: {1:.6f}, min: {2:.6f}, max: {3:.6f}, timeouts: {4}'.format(
+            self.count, self.mean, self.min, self.max, self.timeouts)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, latency: float):
+        if not self.count or latency < self.min:
+            self.min = latency
+        if latency > self.max:
+            self.max = latency
+        self.count += 1
+        self.total += latency
+        if self.bucket_counts is not None:
+            self.bucket_counts[bisect_left(self.buckets, latency)] += 1
+
+
+class _Entry:
+    __slots__ = ('request', 'sent', 'deadline', 'tick', 'size')
+
+    def __init__(self, request, sent: float, deadline: float, tick: int, size: int):
+        self.request = request
+        self.sent = sent
+        self.deadline = deadline
+        self.tick = tick
+        self.size = size
+
+
+class RequestQueue:
+    """
+    Bounded table of requests waiting for response.
+    Deadlines are kept in hashed timer wheel, push/pop are O(1) and expire touches only elapsed slots.
+    """
+    DEFAULT_TIMEOUT = 60
+    DEFAULT_MAX_SIZE = 64 * 1024
+    RESOLUTION = 0.1
+    SLOTS = 1024
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_size=DEFAULT_MAX_SIZE, clock=time.monotonic, buckets=None):
+        self.timeout = timeout
+        self.max_size = max_size
+        self.buckets = buckets  # latency histogram bounds of method stats
+        self._clock = clock
+        self._entries = {}
+        self._wheel = [{} for _ in range(RequestQueue.SLOTS)]
+        self._tick = self._to_tick(clock())
+        self._stats = {}
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, command_id):
+        return command_id in self._entries
+
+    @property
+    def stats(self) -> dict:
+        return self._stats
+
+    @property
+    def bytes(self) -> int:
+        """
+        Total frame size of pending requests
+        """
+        return self._bytes
+
+    def is_full(self) -> bool:
+        return len(self._entries) >= self.max_size
+
+    def get(self, command_id, default=None):
+        entry = self._entries.get(command_id)
+        return entry.request if entry else default
+
+    def push(self, command_id, request, timeout=None, size=0) -> bool:
+        # id of pending request is refused, its response could not be told apart
+        if command_id in self._entries or self.is_full():
+            return False
+
+        now = self._clock()
+        deadline = now + (self.timeout if timeout is None else timeout)
+        tick = max(self._to_tick(deadline), self._tick + 1)
+        entry = _Entry(request, now, deadline, tick, size)
+        self._entries[command_id] = entry
+        self._bytes += size
+        self._wheel[tick % RequestQueue.SLOTS][command_id] = entry
+        return True
+
+    def pop(self, command_id, default=None):
+        # response arrived, latency is recorded for request method
+        entry = self._remove(command_id)
+        if not entry:
+            return default
+
+        self._method_stats(entry.request.method).add(self._clock() - entry.sent)
+        return entry.request
+
+    def remove(self, command_id):
+        entry = self._remove(command_id)
+        return entry.request if entry else None
+
+    def expire(self, now=None) -> list:
+        """
+        Removes and returns requests with passed deadlines
+        """
+        if now is None:
+            now = self._clock()
+
+        current = self._to_tick(now)
+        if current <= self._tick:
+            return []
+
+        first = max(self._tick + 1, current - RequestQueue.SLOTS + 1)
+        self._tick = current
+        expired = []
+        for tick in range(first, current + 1):
+            slot = self._wheel[tick % RequestQueue.SLOTS]
+            if not slot:
+                continue
+
+            for command_id, entry in list(slot.items()):
+                if entry.tick <= current:
+                    del slot[command_id]
+                    del self._entries[command_id]
+                    self._bytes -= entry.size
+                    self._method_stats(entry.request.method).timeouts += 1
+                    expired.append(entry.request)
+        return expired
+
+    def clear(self) -> list:
+        requests = [entry.request for entry in self._entries.values()]
+        self._entries.clear()
+        self._bytes = 0
+        for slot in self._wheel:
+            slot.clear()
+        return requests
+
+    # private
+    def _remove(self, command_id):
+        entry = self._entries.pop(command_id, None)
+        if entry:
+            del self._wheel[entry.tick % RequestQueue.SLOTS][command_id]
+            self._bytes -= entry.size
+        return entry
+
+    def _method_stats(self, method: str) -> RequestStats:
+        stats = self._stats.get(method)
+        if stats is None:
+            stats = self._stats[method] = RequestStats(self.buckets)
+        return stats
+
+    @staticmethod
+    def _to_tick(ts: float) -> int:
+        return int(ts / RequestQueue.RESOLUTION)
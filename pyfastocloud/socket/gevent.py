@@ -1,9 +1,11 @@
 import gevent
 from gevent import select
+from gevent import selectors
 from gevent import socket
 
 Sleep = gevent.sleep
 Select = select.select
+Selector = selectors.DefaultSelector
 Socket = socket.socket
 
 
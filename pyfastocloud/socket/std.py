@@ -1,9 +1,11 @@
 import select
+import selectors
 import socket
 import time
 
 Sleep = time.sleep
 Select = select.select
+Selector = selectors.DefaultSelector
 Socket = socket.socket
 
 
@@ -0,0 +1,231 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pyfastocloud.client_constants import ClientStatus
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.fastocloud_client import Commands
+from pyfastocloud.json_rpc import Request, Response
+
+
+class StatisticsRing:
+    """
+    Fixed size columnar ring buffers (NumPy) for many keys, one preallocated slot per key.
+    Memory per key is columns * capacity * 8 bytes regardless of notifications rate.
+    """
+    INITIAL_SLOTS = 64
+
+    def __init__(self, columns: tuple, capacity: int):
+        if np is None:
+            raise ImportError('numpy package required')
+
+        self.columns = columns
+        self.capacity = capacity
+        self._indexes = {name: i for i, name in enumerate(columns)}
+        self._values = np.zeros((StatisticsRing.INITIAL_SLOTS, len(columns), capacity))
+        self._heads = np.zeros(StatisticsRing.INITIAL_SLOTS, dtype=np.int64)
+        self._counts = np.zeros(StatisticsRing.INITIAL_SLOTS, dtype=np.int64)
+        self._slots = {}  # key: slot
+        self._free = []
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def keys(self) -> list:
+        return list(self._slots)
+
+    def append(self, key, row):
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+
+        head = self._heads[slot]
+        self._values[slot, :, head] = row
+        self._heads[slot] = (head + 1) % self.capacity
+        if self._counts[slot] < self.capacity:
+            self._counts[slot] += 1
+
+    def remove(self, key):
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._heads[slot] = 0
+            self._counts[slot] = 0
+            self._free.append(slot)
+
+    def count(self, key) -> int:
+        slot = self._slots.get(key)
+        return 0 if slot is None else int(self._counts[slot])
+
+    def last(self, key, n=None):
+        """
+        Last n rows in chronological order, array of shape (columns, n)
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            return np.empty((len(self.columns), 0))
+
+        count = int(self._counts[slot])
+        n = count if n is None else min(n, count)
+        positions = (self._heads[slot] - n + np.arange(n)) % self.capacity
+        return self._values[slot][:, positions]
+
+    def column(self, key, name: str, n=None):
+        return self.last(key, n)[self._indexes[name]]
+
+    def window(self, key, since: float, timestamp='timestamp'):
+        """
+        Rows with timestamp column >= since, array of shape (columns, m)
+        """
+        rows = self.last(key)
+        return rows[:, rows[self._indexes[timestamp]] >= since]
+
+    def mean(self, key, name: str, since: float):
+        values = self.window(key, since)[self._indexes[name]]
+        return float(values.mean()) if values.size else None
+
+    def max(self, key, name: str, since: float):
+        values = self.window(key, since)[self._indexes[name]]
+        return float(values.max()) if values.size else None
+
+    def latest(self, name: str) -> (list, object):
+        """
+        Most recent value of column for every key: (keys, values array)
+        """
+        keys = list(self._slots)
+        slots = np.fromiter(self._slots.values(), dtype=np.int64, count=len(keys))
+        positions = (self._heads[slots] - 1) % self.capacity
+        return keys, self._values[slots, self._indexes[name], positions]
+
+    def top(self, name: str, k: int) -> list:
+        """
+        Keys with k biggest latest values of column: [(key, value)], descending
+        """
+        if k <= 0:
+            return []
+
+        keys, values = self.latest(name)
+        if not keys:
+            return []
+
+        k = min(k, len(keys))
+        best = np.argpartition(values, len(keys) - k)[len(keys) - k:]
+        best = best[np.argsort(values[best])[::-1]]
+        return [(keys[i], float(values[i])) for i in best]
+
+    # private
+    def _allocate(self, key) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._slots)
+            if slot == self._values.shape[0]:
+                self._grow()
+        self._slots[key] = slot
+        return slot
+
+    def _grow(self):
+        size = self._values.shape[0] * 2
+        values = np.zeros((size, len(self.columns), self.capacity))
+        values[:self._values.shape[0]] = self._values
+        self._values = values
+        self._heads = np.resize(self._heads, size)
+        self._heads[size // 2:] = 0
+        self._counts = np.resize(self._counts, size)
+        self._counts[size // 2:] = 0
+
+
+class StatisticsStore:
+    """
+    Decodes statistic_stream/statistic_service notifications into columnar ring buffers
+    per stream id and per node
+    """
+    STREAM_COLUMNS = ('timestamp', 'input_bps', 'output_bps', 'cpu', 'rss', 'restarts', 'status')
+    SERVICE_COLUMNS = ('timestamp', 'cpu', 'gpu', 'memory_total', 'memory_free', 'hdd_total', 'hdd_free',
+                       'bandwidth_in', 'bandwidth_out', 'uptime')
+    DEFAULT_CAPACITY = 360
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.streams = StatisticsRing(StatisticsStore.STREAM_COLUMNS, capacity)
+        self.nodes = StatisticsRing(StatisticsStore.SERVICE_COLUMNS, capacity)
+
+    def ingest(self, client, req: Request) -> bool:
+        """
+        Records statistics notification, returns False for other requests
+        """
+        if not req.params:
+            return False
+
+        if req.method == Commands.STATISTIC_STREAM_COMMAND:
+            self.record_stream(req.params)
+            return True
+
+        if req.method == Commands.STATISTIC_SERVICE_COMMAND:
+            self.record_service(StatisticsStore.node_key(client), req.params)
+            return True
+
+        return False
+
+    def record_stream(self, params: dict):
+        sid = params.get('id')
+        if sid is None:
+            return
+
+        number = StatisticsStore._number
+        self.streams.append(sid, (number(params.get('timestamp', 0)),
+                                  StatisticsStore._sum_bps(params.get('input_streams')),
+                                  StatisticsStore._sum_bps(params.get('output_streams')),
+                                  number(params.get('cpu', 0)), number(params.get('rss', 0)),
+                                  number(params.get('restarts', 0)), number(params.get('status', 0))))
+
+    def record_service(self, node, params: dict):
+        self.nodes.append(node, tuple(StatisticsStore._number(params.get(name, 0))
+                                      for name in StatisticsStore.SERVICE_COLUMNS))
+
+    def top_streams_by_bitrate(self, k: int) -> list:
+        return self.streams.top('input_bps', k)
+
+    @staticmethod
+    def node_key(client) -> str:
+        return '{0}:{1}'.format(client.host, client.port)
+
+    # private
+    @staticmethod
+    def _sum_bps(streams) -> int:
+        if not isinstance(streams, list):
+            return 0
+        return sum(StatisticsStore._number(stream.get('bps', 0)) for stream in streams if isinstance(stream, dict))
+
+    @staticmethod
+    def _number(value):
+        return value if isinstance(value, (int, float)) else 0
+
+
+class StatisticsHandler(IClientHandler):
+    """
+    Ingestion stage in front of handler, statistics notifications are consumed by store
+    and forwarded only if forward=True
+    """
+
+    def __init__(self, store: StatisticsStore, handler: IClientHandler, forward=False):
+        self.store = store
+        self._handler = handler
+        self._forward = forward
+
+    def process_response(self, client, req: Request, resp: Response):
+        if self._handler:
+            self._handler.process_response(client, req, resp)
+
+    def process_request(self, client, req: Request):
+        if self.store.ingest(client, req) and not self._forward:
+            return
+
+        if self._handler:
+            self._handler.process_request(client, req)
+
+    def on_client_state_changed(self, client, status: ClientStatus):
+        if self._handler:
+            self._handler.on_client_state_changed(client, status)
@@ -0,0 +1,68 @@
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def config_hash(config: dict) -> bytes:
+    # canonical json (sorted keys) digest of stream config
+    if orjson is not None:
+        data = orjson.dumps(config, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(config, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class StreamsSyncState:
+    """
+    Content hashes of stream configs applied by node, id: hash.
+    State is unknown until sync_service response confirms snapshot,
+    any failure, timeout or reconnect leaves it unknown and next sync is full.
+    """
+
+    def __init__(self, id_field: str):
+        self._id_field = id_field
+        self._hashes = None
+        self._pending = None  # (command_id, snapshot)
+
+    def is_known(self) -> bool:
+        return self._hashes is not None
+
+    def invalidate(self):
+        self._hashes = None
+        self._pending = None
+
+    def snapshot(self, streams: list) -> dict:
+        return {stream[self._id_field]: config_hash(stream) for stream in streams}
+
+    def diff(self, streams: list) -> (list, list, dict):
+        """
+        Returns (added or changed configs, removed ids, snapshot)
+        """
+        snapshot = {}
+        changed = []
+        for stream in streams:
+            sid = stream[self._id_field]
+            digest = config_hash(stream)
+            snapshot[sid] = digest
+            if self._hashes.get(sid) != digest:
+                changed.append(stream)
+
+        removed = [sid for sid in self._hashes if sid not in snapshot]
+        return changed, removed, snapshot
+
+    def begin(self, command_id: str, snapshot: dict):
+        self._hashes = None
+        self._pending = (command_id, snapshot)
+
+    def commit(self, command_id: str):
+        if self._pending and self._pending[0] == command_id:
+            self._hashes = self._pending[1]
+        self._pending = None
+
+    def abort(self, command_id: str):
+        if self._pending and self._pending[0] == command_id:
+            self._pending = None
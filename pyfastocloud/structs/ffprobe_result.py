@@ -1,38 +1,178 @@
+class Rational:
+    __slots__ = ('num', 'den')
+
+    def __init__(self, num: int, den: int):
+        self.num = num
+        self.den = den
+
+    def __str__(self):
+        return '{0}/{1}'.format(self.num, self.den)
+
+    def __eq__(self, other):
+        return isinstance(other, Rational) and self.num * other.den == other.num * self.den
+
+    def __float__(self):
+        return self.num / self.den
+
+    @classmethod
+    def parse(cls, value):
+        # '25/1' -> Rational(25, 1), None for invalid or '0/0'
+        if not isinstance(value, str):
+            return None
+
+        num, sep, den = value.partition('/')
+        try:
+            num = int(num)
+            den = int(den) if sep else 1
+        except ValueError:
+            return None
+
+        if not num or not den:
+            return None
+        return cls(num, den)
+
+
+def _to_int(value):
+    if value is None:
+        return None
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_msec(value):
+    if value is None:
+        return None
+
+    try:
+        return int(float(value) * 1000)
+    except (TypeError, ValueError):
+        return None
+
+
+class StreamInfo:
+    """
+    Typed ffprobe stream record, parsed once
+    """
+    VIDEO = 'video'
+    AUDIO = 'audio'
+
+    __slots__ = ('index', 'codec_type', 'codec_name', 'profile', 'width', 'height', 'fps', 'bit_rate', 'channels',
+                 'sample_rate', 'duration')
+
+    def __init__(self):
+        self.index = 0
+        self.codec_type = None
+        self.codec_name = None
+        self.profile = None
+        self.width = None
+        self.height = None
+        self.fps = None  # Rational
+        self.bit_rate = None
+        self.channels = None
+        self.sample_rate = None
+        self.duration = None  # msec
+
+    def __str__(self):
+        return '{0}: {1} {2}'.format(self.index, self.codec_type, self.codec_name)
+
+    @classmethod
+    def make_entry(cls, json: dict):
+        stream = cls()
+        stream.index = json.get('index', 0)
+        stream.codec_type = json.get('codec_type')
+        stream.codec_name = json.get('codec_name')
+        stream.profile = json.get('profile')
+        stream.width = json.get('width')
+        stream.height = json.get('height')
+        stream.fps = Rational.parse(json.get('avg_frame_rate')) or Rational.parse(json.get('r_frame_rate'))
+        stream.bit_rate = _to_int(json.get('bit_rate'))
+        stream.channels = json.get('channels')
+        stream.sample_rate = _to_int(json.get('sample_rate'))
+        stream.duration = _to_msec(json.get('duration'))
+        return stream
+
+    def is_video(self) -> bool:
+        return self.codec_type == StreamInfo.VIDEO
+
+    def is_audio(self) -> bool:
+        return self.codec_type == StreamInfo.AUDIO
+
+
 class FFprobeResult:
+    """
+    Parsed ffprobe output: typed streams, format dict and precomputed duration, primary video/audio streams.
+    Raw payload is dropped unless keep_payload=True.
+    """
     MAX_DURATION = 24 * 60 * 60 * 1000
 
+    __slots__ = ('_streams', '_format', '_duration', '_video_index', '_audio_index', '_payload')
+
     def __init__(self):
-        self._payload = {}
+        self._streams = ()
+        self._format = {}
+        self._duration = None
+        self._video_index = None
+        self._audio_index = None
+        self._payload = None
 
     def __str__(self):
-        return str(self._payload)
+        if self._payload is not None:
+            return str(self._payload)
+        return str({'streams': [str(stream) for stream in self._streams], 'format': self._format})
 
     @classmethod
-    def make_entry(cls, json: dict):
+    def make_entry(cls, json: dict, keep_payload=False):
         cl = cls()
-        cl.update_entry(json)
+        cl.update_entry(json, keep_payload)
         return cl
 
-    def update_entry(self, json: dict):
+    def update_entry(self, json: dict, keep_payload=False):
         if json is None:
             raise ValueError('Invalid input')
 
-        self._payload = json
+        self._streams = tuple(StreamInfo.make_entry(stream) for stream in json['streams'])
+        self._format = json['format']
+        self._duration = _to_msec(self._format.get('duration'))
+        self._video_index = self._find(StreamInfo.VIDEO)
+        self._audio_index = self._find(StreamInfo.AUDIO)
+        self._payload = json if keep_payload else None
 
     @property
-    def streams(self) -> dict:
-        return self._payload['streams']
+    def streams(self) -> tuple:
+        return self._streams
 
     @property
     def format(self) -> dict:
-        return self._payload['format']
+        return self._format
+
+    @property
+    def payload(self) -> dict:
+        return self._payload
+
+    @property
+    def video_stream(self) -> StreamInfo:
+        return None if self._video_index is None else self._streams[self._video_index]
+
+    @property
+    def audio_stream(self) -> StreamInfo:
+        return None if self._audio_index is None else self._streams[self._audio_index]
 
     def is_live(self):
-        return not 'duration' in self.format
+        return self._duration is None
 
     @property
     def duration(self) -> int:
-        if 'duration' in self.format:
-            return int(float(self.format['duration']) * 1000)
+        if self._duration is not None:
+            return self._duration
 
         return FFprobeResult.MAX_DURATION
+
+    # private
+    def _find(self, codec_type: str):
+        for i, stream in enumerate(self._streams):
+            if stream.codec_type == codec_type:
+                return i
+        return None
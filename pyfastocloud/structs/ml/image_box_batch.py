@@ -0,0 +1,157 @@
+from array import array
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Rect:
+    x = 0
+    y = 0
+    width = 0
+    height = 0
+
+
+class ImageBoxView:
+    """
+    Lazy view of one detection inside ImageBoxBatch, same fields as ImageBox
+    """
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch, index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def unique_component_id(self) -> int:
+        return self._batch.unique_component_id[self._index]
+
+    @property
+    def class_id(self) -> int:
+        return self._batch.class_id[self._index]
+
+    @property
+    def object_id(self) -> int:
+        return self._batch.object_id[self._index]
+
+    @property
+    def confidence(self) -> float:
+        return self._batch.confidence[self._index]
+
+    @property
+    def rect(self) -> Rect:
+        rect = Rect()
+        rect.x = self._batch.left[self._index]
+        rect.y = self._batch.top[self._index]
+        rect.width = self._batch.width[self._index]
+        rect.height = self._batch.height[self._index]
+        return rect
+
+
+class ImageBoxBatch:
+    """
+    Detections of one ml_notification_stream message decoded into packed columns (array module),
+    constant number of allocations per message regardless of detections count.
+    """
+    UNIQUE_COMPONENT_ID = 'unique_component_id'
+    CLASS_ID_FIELD = 'class_id'
+    CONFIDENCE_FIELD = 'confidence'
+    OBJECT_ID_FIELD = 'object_id'
+    # rect
+    LEFT_FIELD = 'left'
+    TOP_FIELD = 'top'
+    WIDTH_FIELD = 'width'
+    HEIGHT_FIELD = 'height'
+    ID_FIELD = 'id'
+    IMAGES_FIELD = 'images'
+
+    # attribute, json field, typecode
+    COLUMNS = (('unique_component_id', UNIQUE_COMPONENT_ID, 'i'), ('class_id', CLASS_ID_FIELD, 'i'),
+               ('object_id', OBJECT_ID_FIELD, 'q'), ('confidence', CONFIDENCE_FIELD, 'f'),
+               ('left', LEFT_FIELD, 'i'), ('top', TOP_FIELD, 'i'), ('width', WIDTH_FIELD, 'i'),
+               ('height', HEIGHT_FIELD, 'i'))
+    _GETTERS = tuple(itemgetter(field) for _, field, _ in COLUMNS)
+
+    __slots__ = ('sid', 'unique_component_id', 'class_id', 'object_id', 'confidence', 'left', 'top', 'width',
+                 'height')
+
+    def __init__(self):
+        self.sid = None
+        for name, _, typecode in ImageBoxBatch.COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.class_id)
+
+    def __getitem__(self, index: int) -> ImageBoxView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('ImageBoxBatch index out of range')
+        return ImageBoxView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ImageBoxView(self, index)
+
+    @classmethod
+    def make_entry(cls, json: dict):
+        batch = cls()
+        batch.update_entry(json)
+        return batch
+
+    def update_entry(self, json: dict):
+        if json is None:
+            raise ValueError('Invalid input')
+
+        sid = json.get(ImageBoxBatch.ID_FIELD)
+        self.sid = sid if isinstance(sid, str) else None
+        images = json.get(ImageBoxBatch.IMAGES_FIELD)
+        if not isinstance(images, list):
+            images = []
+
+        try:
+            # fast path: every box complete and well typed, one C level pass per column
+            for (name, _, typecode), getter in zip(ImageBoxBatch.COLUMNS, ImageBoxBatch._GETTERS):
+                setattr(self, name, array(typecode, map(getter, images)))
+        except (KeyError, TypeError, OverflowError):
+            self._update_checked(images)
+
+    def columns(self) -> dict:
+        """
+        Column name: array, or zero-copy numpy arrays if numpy installed
+        """
+        if np is None:
+            return {name: getattr(self, name) for name, _, _ in ImageBoxBatch.COLUMNS}
+        return {name: np.frombuffer(getattr(self, name), dtype=typecode) if len(self) else
+                np.empty(0, dtype=typecode) for name, _, typecode in ImageBoxBatch.COLUMNS}
+
+    def to_numpy(self):
+        """
+        NumPy structured array with one record per detection
+        """
+        if np is None:
+            raise ImportError('numpy package required')
+
+        dtype = [(name, typecode) for name, _, typecode in ImageBoxBatch.COLUMNS]
+        result = np.empty(len(self), dtype=dtype)
+        for name, column in self.columns().items():
+            result[name] = column
+        return result
+
+    # private
+    def _update_checked(self, images: list):
+        # missing field or wrong type keeps default 0 as ImageBox does
+        for name, field, typecode in ImageBoxBatch.COLUMNS:
+            expected = float if typecode == 'f' else int
+            column = array(typecode, bytes(array(typecode).itemsize * len(images)))
+            for index, image in enumerate(images):
+                value = image.get(field) if isinstance(image, dict) else None
+                if isinstance(value, expected):
+                    try:
+                        column[index] = value
+                    except OverflowError:
+                        pass
+            setattr(self, name, column)
@@ -1,11 +1,6 @@
 from pyfastogt.maker import Maker
 
-
-class Rect:
-    x = 0
-    y = 0
-    width = 0
-    height = 0
+from pyfastocloud.structs.ml.image_box_batch import Rect
 
 
 class ImageBox(Maker):
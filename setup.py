@@ -23,6 +23,13 @@ VERSION = '1.2.0'
 # What packages are required for this module to be executed?
 REQUIRED = ['pyfastogt @ git+git://github.com/fastogt/pyfastogt@master']
 
+# What packages are optional?
+EXTRAS = {
+    'orjson': ['orjson'],
+    'numpy': ['numpy'],
+    'gevent': ['gevent'],
+}
+
 # The rest you shouldn't have to touch too much :)
 # ------------------------------------------------
 # Except, perhaps the License and Trove Classifiers!
@@ -91,7 +98,7 @@ setup(
     author_email=EMAIL,
     python_requires=REQUIRES_PYTHON,
     url=URL,
-    packages=find_packages(exclude=('tests',)),
+    packages=find_packages(exclude=('tests', 'benchmarks')),
     # If your package is a single module, use this instead of 'packages':
     # py_modules=['mypackage'],
 
@@ -99,6 +106,7 @@ setup(
     #     'console_scripts': ['mycli=mymodule:cli'],
     # },
     install_requires=REQUIRED,
+    extras_require=EXTRAS,
     include_package_data=True,
     license='LGPL',
     classifiers=[
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import json
+import struct
+import unittest
+
+from pyfastocloud.broadcast import Broadcast, Pool
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.json_rpc import JsonRPCErrorCode
+
+if Pool is not None:
+    import gevent
+    from gevent.server import StreamServer
+    from pyfastocloud.socket import gevent as gevent_socket
+
+
+def _serve(mode: str):
+    compressor = CompressorZlib(True)
+
+    def recv_exactly(sock, size):
+        data = b''
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def handle(sock, address):
+        while True:
+            header = recv_exactly(sock, 4)
+            data = recv_exactly(sock, struct.unpack('>I', header)[0]) if header else None
+            if data is None:
+                break
+
+            req = json.loads(compressor.decompress(data))
+            if req['method'] != 'activate_request' and mode == 'slow':
+                gevent.sleep(1)
+            if req['method'] != 'activate_request' and mode == 'error':
+                resp = {'jsonrpc': '2.0', 'id': req['id'], 'error': {'code': -32000, 'message': 'Failed'}}
+            else:
+                resp = {'jsonrpc': '2.0', 'id': req['id'], 'result': 'OK'}
+            data = compressor.compress(json.dumps(resp).encode())
+            sock.sendall(struct.pack('>I', len(data)) + data)
+        sock.close()
+
+    server = StreamServer(('127.0.0.1', 0), handle)
+    server.start()
+    return server
+
+
+@unittest.skipIf(Pool is None, 'gevent not installed')
+class BroadcastTest(unittest.TestCase):
+    def test_send(self):
+        modes = ['ok', 'ok', 'ok', 'slow', 'error']
+        servers = [_serve(mode) for mode in modes]
+        clients = [FastoCloudClient('127.0.0.1', server.server_port, None, gevent_socket) for server in servers]
+        for client in clients:
+            self.assertTrue(client.connect())
+        offline = FastoCloudClient('127.0.0.1', 0, None, gevent_socket)
+
+        broadcast = Broadcast(concurrency=2, timeout=0.3)
+        result = broadcast.send(clients, 'activate', '123')
+        self.assertTrue(result.is_ok())
+        self.assertEqual(len(result.successes), len(clients))
+        self.assertTrue(all(client.is_active() for client in clients))
+
+        result = broadcast.send(clients + [offline], 'get_log_service', 'http://localhost/log')
+        self.assertEqual(len(result), len(clients) + 1)
+        self.assertEqual(set(result.successes), set(clients[:3]))
+        self.assertEqual(result.errors[clients[3]].error['code'], JsonRPCErrorCode.JSON_RPC_TIMEOUT_ERROR)
+        self.assertEqual(result.errors[clients[4]].error['message'], 'Failed')
+        self.assertEqual(result.errors[offline].error['code'], JsonRPCErrorCode.JSON_RPC_SERVER_ERROR)
+        self.assertEqual(len(result.latencies), 4)
+        self.assertLess(result.max_latency(), 0.3)
+        self.assertLess(result.elapsed, 1)
+
+        def command(client):
+            if client is clients[1]:
+                raise ValueError('Bad params')
+            return client.ping(client.next_command_id())
+
+        result = broadcast.send(clients[:3], command)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(set(result.successes), {clients[0], clients[2]})
+        self.assertEqual(result.errors[clients[1]].error['code'], JsonRPCErrorCode.JSON_RPC_INTERNAL_ERROR)
+        self.assertEqual(result.errors[clients[1]].error['message'], 'Bad params')
+        self.assertIn(clients[1], result.latencies)
+
+        for client in clients:
+            client.disconnect()
+        for server in servers:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
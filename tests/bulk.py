@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import asyncio
+import threading
+import unittest
+
+from pyfastocloud.client_asyncio import AsyncioClient
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.node_simulator import NodeSimulator
+from pyfastocloud.socket import std
+
+RESPONSE_DELAY = 0.05
+
+
+class _NodeThread:
+    # simulator served from its own event loop for synchronous clients
+    def __init__(self, **kwargs):
+        self.node = NodeSimulator(**kwargs)
+        self._loop = asyncio.new_event_loop()
+        self.port = self._loop.run_until_complete(self.node.start())
+        self._thread = threading.Thread(target=self._loop.run_forever)
+        self._thread.start()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.node.stop(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop.close()
+
+
+class BulkTest(unittest.TestCase):
+    def test_restart_streams(self):
+        node = _NodeThread(streams_count=20, statistic_interval=0, response_delay=RESPONSE_DELAY)
+        client = FastoCloudClient('127.0.0.1', node.port, None, std, max_in_flight=4)
+        self.assertTrue(client.connect())
+        res, cid = client.activate(client.next_command_id(), '123')
+        self.assertTrue(res)
+        self.assertTrue(client.wait_response(cid, 5).is_message())
+        self.assertTrue(client.is_active())
+
+        sids = ['sim_{0:06d}'.format(i) for i in range(20)] + ['unknown']
+        op = client.restart_streams(sids)
+        self.assertEqual(client.pending_requests_count, 4)
+        self.assertFalse(op.is_done())
+        self.assertTrue(op.wait(5))
+        self.assertEqual(list(op.results), sids)
+        self.assertEqual(set(op.successes()), set(sids[:-1]))
+        self.assertEqual(op.errors()['unknown'].error['message'], 'Stream not found')
+        self.assertTrue(all(item.latency >= RESPONSE_DELAY for item in op.results.values()))
+        # window of 4 requests in flight, sequential round trips would take len(sids) delays
+        self.assertLess(op.elapsed, len(sids) * RESPONSE_DELAY)
+
+        op = client.change_input_sources({'sim_000001': 2, 'sim_000003': 4})
+        self.assertTrue(op.wait(5))
+        self.assertEqual(len(op.successes()), 2)
+
+        client.disconnect()
+        op = client.stop_streams(['sim_000001', 'sim_000002'])
+        self.assertTrue(op.is_done())
+        self.assertEqual(len(op.errors()), 2)
+        node.stop()
+
+    def test_asyncio(self):
+        async def run():
+            node = NodeSimulator(statistic_interval=0, response_delay=RESPONSE_DELAY)
+            port = await node.start()
+            client = AsyncioClient(FastoCloudClient, '127.0.0.1', port, None, max_in_flight=8)
+            self.assertTrue(await client.connect())
+            await client.activate(0, '123')
+
+            configs = [{'id': '{0}'.format(sid), 'type': 0} for sid in range(50)]
+            op = await client.start_streams(configs)
+            self.assertTrue(op.is_done())
+            self.assertEqual(len(op.successes()), 50)
+
+            op = await client.stop_streams(['0', 'unknown'])
+            self.assertEqual(list(op.successes()), ['0'])
+            self.assertEqual(op.errors()['unknown'].error['message'], 'Stream not found')
+
+            client.disconnect()
+            await node.stop()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,34 @@
 #!/usr/bin/env python3
+import json
+import os
+import select
+import socket
+import struct
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
+from pyfastocloud.client_constants import WindowPolicy
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.compressor_zlib import CompressorZlib
 from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.socket import std
+
+
+class _Handler(IClientHandler):
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+
+    def process_response(self, client, req, resp):
+        self.responses.append((req, resp))
+
+    def process_request(self, client, req):
+        self.requests.append(req)
+
+    def on_client_state_changed(self, client, status):
+        pass
 
 
 class ClientTest(unittest.TestCase):
@@ -25,6 +52,192 @@ class ClientTest(unittest.TestCase):
         self.assertFalse(res)
         self.assertEqual(oid, None)
 
+    def test_next_command_id(self):
+        left, right = socket.socketpair()
+        handler = _Handler()
+        client = FastoCloudClient('localhost', 0, handler, None)
+        client.attach_socket(left)
+        self.assertEqual(client.activate(1, '123'), (True, '0000000000000001'))
+        res, cid = client.activate(client.next_command_id(), '123')
+        self.assertTrue(res)
+        self.assertEqual(cid, '8000000000000001')
+        self.assertEqual(client.pending_requests_count, 2)
+        client.disconnect()
+        right.close()
+
+    def test_read_command(self):
+        left, right = socket.socketpair()
+        handler = _Handler()
+        compressor = CompressorZlib(True)
+        client = FastoCloudClient('localhost', 0, handler, None)
+        client.attach_socket(left)
+        data = b''
+        for sid in ('first', 'second', 'third'):
+            message = {'jsonrpc': '2.0', 'method': 'statistic_stream', 'params': {'id': sid}}
+            compressed = compressor.compress(json.dumps(message).encode())
+            data += struct.pack('>I', len(compressed)) + compressed
+        right.sendall(data)
+
+        # several frames in one write, socket stays readable until all are read
+        while len(handler.requests) < 3:
+            readable, _, _ = select.select([client.socket], [], [], 1)
+            self.assertTrue(readable)
+            client.process_commands(client.read_command())
+        self.assertEqual([req.params['id'] for req in handler.requests], ['first', 'second', 'third'])
+        client.disconnect()
+        right.close()
+
+    def test_batch(self):
+        left, right = socket.socketpair()
+        handler = _Handler()
+        client = FastoCloudClient('localhost', 0, handler, None)
+        client.attach_socket(left)
+        with client.batch():
+            self.assertEqual(client.activate(1, '123'), (True, '0000000000000001'))
+            self.assertEqual(client.activate(2, '123'), (True, '0000000000000002'))
+        self.assertEqual(client.pending_requests_count, 2)
+
+        compressor = CompressorZlib(True)
+        data_size = struct.unpack('>I', right.recv(4))[0]
+        batch = json.loads(compressor.decompress(right.recv(data_size, socket.MSG_WAITALL)))
+        self.assertEqual([req['id'] for req in batch], ['0000000000000001', '0000000000000002'])
+        self.assertEqual(batch[0]['method'], 'activate_request')
+
+        responses = [{'jsonrpc': '2.0', 'id': req['id'], 'result': 'OK'} for req in batch]
+        client.process_commands(compressor.compress(json.dumps(responses).encode()))
+        self.assertTrue(client.is_active())
+        self.assertEqual(client.pending_requests_count, 0)
+        self.assertEqual([req.method for req, _ in handler.responses], ['activate_request', 'activate_request'])
+        client.disconnect()
+        right.close()
+
+    def test_route(self):
+        left, right = socket.socketpair()
+        handler = _Handler()
+        client = FastoCloudClient('localhost', 0, handler, None)
+        client.attach_socket(left)
+        compressor = CompressorZlib(True)
+        routed = []
+        client.route('statistic_stream', lambda cl, req, params: routed.append(params), lambda params: params['id'])
+        client.route('quit_status_stream', lambda cl, req, params: routed.append(params))
+
+        def notify(method, params):
+            message = {'jsonrpc': '2.0', 'method': method, 'params': params}
+            client.process_commands(compressor.compress(json.dumps(message).encode()))
+
+        notify('statistic_stream', {'id': 'a'})
+        notify('statistic_stream', {'cpu': 1})
+        notify('quit_status_stream', {'id': 'b'})
+        notify('changed_source_stream', {'id': 'c'})
+        self.assertEqual(routed, ['a', {'id': 'b'}])
+        self.assertEqual([req.params for req in handler.requests], [{'cpu': 1}, {'id': 'c'}])
+
+        client.unroute('quit_status_stream')
+        notify('quit_status_stream', {'id': 'b'})
+        self.assertEqual(len(handler.requests), 3)
+
+        # ping from service is answered by client and forwarded
+        client.activate(1, '123')
+        data_size = struct.unpack('>I', right.recv(4))[0]
+        right.recv(data_size, socket.MSG_WAITALL)
+        resp = {'jsonrpc': '2.0', 'id': '0000000000000001', 'result': 'OK'}
+        client.process_commands(compressor.compress(json.dumps(resp).encode()))
+        self.assertTrue(client.is_active())
+        ping = {'jsonrpc': '2.0', 'id': '00000000000000ff', 'method': 'ping_client', 'params': {}}
+        client.process_commands(compressor.compress(json.dumps(ping).encode()))
+        data_size = struct.unpack('>I', right.recv(4))[0]
+        pong = json.loads(compressor.decompress(right.recv(data_size, socket.MSG_WAITALL)))
+        self.assertEqual(pong['id'], '00000000000000ff')
+        self.assertIn('timestamp', pong['result'])
+        self.assertEqual(handler.requests[-1].method, 'ping_client')
+        client.disconnect()
+        right.close()
+
+    def test_offload(self):
+        handler = _Handler()
+        compressor = CompressorZlib(True)
+        executor = ThreadPoolExecutor(2)
+        client = FastoCloudClient('localhost', 0, handler, None, decode_executor=executor, offload_threshold=256)
+        client.attach_socket(socket.socketpair()[0])
+        decoded = threading.Event()
+        client.set_decoded_callback(decoded.set)
+
+        def frame(sid, size):
+            params = {'id': sid, 'data': os.urandom(size).hex()}
+            message = {'jsonrpc': '2.0', 'method': 'statistic_stream', 'params': params}
+            return compressor.compress(json.dumps(message).encode())
+
+        client.process_commands(frame('big', 1024))
+        client.process_commands(frame('small', 0))
+        self.assertTrue(decoded.wait(5))
+        for _ in range(100):
+            if not client.has_pending_decodes():
+                break
+            client.process_decoded()
+            time.sleep(0.01)
+        self.assertEqual([req.params['id'] for req in handler.requests], ['big', 'small'])
+
+        client.process_commands(frame('small', 0))
+        self.assertEqual(handler.requests[-1].params['id'], 'small')
+        client.process_commands(frame('lost', 1024))
+        client.disconnect()
+        self.assertFalse(client.has_pending_decodes())
+        executor.shutdown()
+
+    def test_window(self):
+        left, right = socket.socketpair()
+        handler = _Handler()
+        compressor = CompressorZlib(True)
+        client = FastoCloudClient('localhost', 0, handler, None, max_in_flight=2)
+        client.attach_socket(left)
+        self.assertEqual(client.activate(1, '123'), (True, '0000000000000001'))
+        self.assertEqual(client.activate(2, '123'), (True, '0000000000000002'))
+        self.assertFalse(client.is_window_open())
+        self.assertEqual(client.activate(3, '123'), (False, None))
+        self.assertGreater(client.in_flight_bytes, 0)
+
+        resp = {'jsonrpc': '2.0', 'id': '0000000000000001', 'result': 'OK'}
+        client.process_commands(compressor.compress(json.dumps(resp).encode()))
+        self.assertTrue(client.is_window_open())
+        self.assertEqual(client.activate(3, '123'), (True, '0000000000000003'))
+        client.disconnect()
+        self.assertEqual(client.in_flight_bytes, 0)
+        right.close()
+
+    def test_window_block(self):
+        left, right = socket.socketpair()
+        handler = _Handler()
+        compressor = CompressorZlib(True)
+        client = FastoCloudClient('localhost', 0, handler, std, max_in_flight_bytes=1,
+                                  window_policy=WindowPolicy.BLOCK)
+        client.attach_socket(left)
+
+        def node():
+            # answers requests one by one
+            try:
+                while True:
+                    header = right.recv(4, socket.MSG_WAITALL)
+                    if len(header) < 4:
+                        return
+                    data = right.recv(struct.unpack('>I', header)[0], socket.MSG_WAITALL)
+                    req = json.loads(compressor.decompress(data))
+                    resp = {'jsonrpc': '2.0', 'id': req['id'], 'result': 'OK'}
+                    data = compressor.compress(json.dumps(resp).encode())
+                    right.sendall(struct.pack('>I', len(data)) + data)
+            except socket.error:
+                pass
+
+        thread = threading.Thread(target=node)
+        thread.start()
+        for command_id in range(1, 4):
+            res, _ = client.activate(command_id, '123')
+            self.assertTrue(res)
+            self.assertLessEqual(client.pending_requests_count, 1)
+        self.assertEqual([resp.id for _, resp in handler.responses], ['0000000000000001', '0000000000000002'])
+        client.disconnect()
+        thread.join(5)
+        right.close()
+
 
 if __name__ == '__main__':
     unittest.main()
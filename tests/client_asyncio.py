@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import struct
+import unittest
+
+from pyfastocloud.client_asyncio import AsyncioClient
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import FastoCloudClient
+
+
+async def _serve_node(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    compressor = CompressorZlib(True)
+    while True:
+        try:
+            header = await reader.readexactly(4)
+            data = await reader.readexactly(struct.unpack('>I', header)[0])
+        except asyncio.IncompleteReadError:
+            break
+
+        req = json.loads(compressor.decompress(data).decode())
+        if req['method'] == 'activate_request':
+            resp = {'jsonrpc': '2.0', 'id': req['id'], 'result': 'OK'}
+        else:
+            resp = {'jsonrpc': '2.0', 'id': req['id'], 'result': req['params']}
+        compressed = compressor.compress(json.dumps(resp).encode())
+        writer.write(struct.pack('>I', len(compressed)) + compressed)
+    writer.close()
+
+
+class AsyncioClientTest(unittest.TestCase):
+    def test_requests(self):
+        async def run():
+            server = await asyncio.start_server(_serve_node, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            clients = [AsyncioClient(FastoCloudClient, '127.0.0.1', port, None) for _ in range(3)]
+
+            for client in clients:
+                self.assertTrue(await client.connect())
+                self.assertTrue(client.is_connected())
+
+            activated = await asyncio.gather(*[client.activate(0, '123') for client in clients])
+            for resp in activated:
+                self.assertEqual(resp.result, 'OK')
+            for client in clients:
+                self.assertTrue(client.is_active())
+
+            resp = await clients[0].stop_stream(1, 'stream', True)
+            self.assertEqual(resp.result, {'id': 'stream', 'force': True})
+
+            clients[1].disconnect()
+            self.assertIsNone(await clients[1].ping(2))
+
+            for client in clients:
+                client.disconnect()
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(run())
+
+    def test_window(self):
+        async def run():
+            server = await asyncio.start_server(_serve_node, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            client = AsyncioClient(FastoCloudClient, '127.0.0.1', port, None, max_in_flight=2)
+            self.assertTrue(await client.connect())
+
+            futures = [client.activate(command_id, '123') for command_id in range(1, 7)]
+            self.assertEqual(client.pending_requests_count, 2)
+            # plain calls are not deferred behind requests waiting for window
+            self.assertIsInstance(client.is_active(), bool)
+            self.assertIsInstance(client.next_command_id(), int)
+            responses = await asyncio.gather(*futures)
+            self.assertEqual([resp.id for resp in responses], ['{0:016x}'.format(cid) for cid in range(1, 7)])
+            self.assertEqual(client.pending_requests_count, 0)
+
+            waiting = [client.activate(command_id, '123') for command_id in range(7, 10)]
+            client.disconnect()
+            self.assertEqual(await asyncio.gather(*waiting), [None, None, None])
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
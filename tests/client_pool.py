@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+import unittest
+
+import pyfastocloud.socket.std as socket_mod
+from pyfastocloud.client_constants import ClientStatus
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.client_pool import ClientPool
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import FastoCloudClient
+
+
+class _NodeHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        compressor = CompressorZlib(True)
+        stream = self.request.makefile('rb')
+        while True:
+            header = stream.read(4)
+            if len(header) < 4:
+                break
+            req = json.loads(compressor.decompress(stream.read(struct.unpack('>I', header)[0])))
+            if req['method'] == 'stop_service':
+                break
+            compressed = compressor.compress(json.dumps({'jsonrpc': '2.0', 'id': req['id'], 'result': 'OK'}).encode())
+            self.request.sendall(struct.pack('>I', len(compressed)) + compressed)
+        self.request.shutdown(socket.SHUT_RDWR)
+
+
+class _Handler(IClientHandler):
+    def __init__(self):
+        self.responses = []
+        self.states = []
+
+    def process_response(self, client, req, resp):
+        self.responses.append(resp)
+
+    def process_request(self, client, req):
+        pass
+
+    def on_client_state_changed(self, client, status: ClientStatus):
+        self.states.append(status)
+
+
+class ClientPoolTest(unittest.TestCase):
+    def _poll(self, pool, predicate):
+        for _ in range(50):
+            if predicate():
+                return True
+            pool.poll(0.1)
+        return predicate()
+
+    def test_pool(self):
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _NodeHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+
+        handler = _Handler()
+        pool = ClientPool(socket_mod)
+        clients = [FastoCloudClient('127.0.0.1', port, handler, socket_mod) for _ in range(5)]
+        for client in clients:
+            self.assertTrue(pool.connect(client))
+        self.assertEqual(len(pool), 5)
+        self.assertTrue(self._poll(pool, lambda: all(client.is_connected() for client in clients)))
+        for client in clients:
+            client.activate(0, '123')
+
+        for _ in range(50):
+            if all(client.is_active() for client in clients):
+                break
+            pool.poll(0.1)
+        self.assertTrue(all(client.is_active() for client in clients))
+        self.assertEqual(len(handler.responses), 5)
+
+        clients[0].stop_service(1, 0)
+        for _ in range(50):
+            if not clients[0].is_connected():
+                break
+            pool.poll(0.1)
+        self.assertFalse(clients[0].is_connected())
+        self.assertIn(clients[0], pool)
+
+        self.assertTrue(pool.connect(clients[0]))
+        pool.disconnect_all()
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+    def test_slow_peer(self):
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _NodeHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        # accepted by backlog, never read
+        stalled = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        stalled.bind(('127.0.0.1', 0))
+        stalled.listen(1)
+
+        handler = _Handler()
+        pool = ClientPool(socket_mod, connect_timeout=1)
+        slow = FastoCloudClient('127.0.0.1', stalled.getsockname()[1], handler, socket_mod)
+        fast = FastoCloudClient('127.0.0.1', server.server_address[1], handler, socket_mod)
+        for client in (slow, fast):
+            self.assertTrue(pool.connect(client))
+        self.assertTrue(self._poll(pool, lambda: slow.is_connected() and fast.is_connected()))
+        slow.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+
+        start = time.monotonic()
+        self.assertTrue(slow.activate(0, os.urandom(1024 * 1024).hex())[0])
+        self.assertTrue(slow.has_pending_output())
+        fast.activate(0, '123')
+        self.assertTrue(self._poll(pool, fast.is_active))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertTrue(slow.has_pending_output())
+
+        pool.close()
+        stalled.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+import unittest
+
+from pyfastocloud.compressor_zlib import CompressorZlib, CompressorZlibThreshold
+
+
+class CompressorZlibTest(unittest.TestCase):
+    def test_round_trip(self):
+        small = b'{"method": "ping_service", "params": {"timestamp": 1610534848000}}'
+        big = small * 100
+        codecs = [CompressorZlib(True), CompressorZlib(False, 1), CompressorZlib(False, 6, raw=True),
+                  CompressorZlibThreshold(True, 9, 1024, 0)]
+        for codec in codecs:
+            self.assertEqual(codec.decompress(codec.compress(small)), small)
+            self.assertEqual(codec.decompress(memoryview(codec.compress(big))), big)
+
+        self.assertEqual(codecs[0].name(), 'gzip')
+        self.assertEqual(codecs[1].name(), 'zlib')
+        self.assertEqual(codecs[2].name(), 'deflate')
+        self.assertEqual(codecs[0].compress(small)[:2], b'\x1f\x8b')
+
+    def test_threshold(self):
+        codec = CompressorZlibThreshold(True, 9, 1024, 0)
+        data = b'a' * 512
+        self.assertGreater(len(codec.compress(data)), len(data))
+        self.assertLess(len(codec.compress(data * 4)), 512)
+
+
+if __name__ == '__main__':
+    unittest.main()
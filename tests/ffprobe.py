@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import unittest
 
-from pyfastocloud.structs.ffprobe_result import FFprobeResult
+from pyfastocloud.structs.ffprobe_result import FFprobeResult, Rational
 
 
 class FFprobeTest(unittest.TestCase):
@@ -137,6 +137,13 @@ class FFprobeTest(unittest.TestCase):
         self.assertEqual(len(ffprobe.streams), 3)
         self.assertEqual(ffprobe.format['nb_streams'], 3)
         self.assertTrue(ffprobe.is_live())
+        self.assertIsNone(ffprobe.payload)
+        self.assertEqual(ffprobe.video_stream.index, 1)
+        self.assertEqual((ffprobe.video_stream.width, ffprobe.video_stream.height), (720, 576))
+        self.assertEqual(ffprobe.video_stream.fps, Rational(25, 1))
+        self.assertEqual(ffprobe.audio_stream.channels, 2)
+        self.assertEqual(ffprobe.audio_stream.sample_rate, 48000)
+        self.assertIsNone(ffprobe.streams[0].fps)
 
         json2 = {
             "streams": [
@@ -266,6 +273,10 @@ class FFprobeTest(unittest.TestCase):
         self.assertEqual(ffprobe2.format['nb_streams'], 2)
         self.assertFalse(ffprobe2.is_live())
         self.assertEqual(ffprobe2.duration, 74048)
+        self.assertEqual(ffprobe2.video_stream.bit_rate, 4451073)
+        self.assertEqual(ffprobe2.audio_stream.duration, 74048)
+        self.assertEqual(float(ffprobe2.video_stream.fps), 30.0)
+        self.assertIs(FFprobeResult.make_entry(json2, True).payload, json2)
 
 
 if __name__ == '__main__':
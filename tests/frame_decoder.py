@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+import socket
+import struct
+import unittest
+
+from pyfastocloud.frame_decoder import FrameDecoder
+
+
+def _frame(body: bytes) -> bytes:
+    return struct.pack('>I', len(body)) + body
+
+
+class FrameDecoderTest(unittest.TestCase):
+    def test_feed(self):
+        decoder = FrameDecoder(1024, 16)
+        data = _frame(b'first') + _frame(b'') + _frame(b'x' * 100) + _frame(b'tail')
+        decoder.feed(data[:3])
+        self.assertEqual(decoder.frames(), [])
+        decoder.feed(data[3:-2])
+        frames = [bytes(frame) for frame in decoder.frames()]
+        self.assertEqual(frames, [b'first', b'', b'x' * 100])
+        decoder.feed(data[-2:])
+        self.assertEqual(bytes(decoder.next_frame()), b'tail')
+        self.assertIsNone(decoder.next_frame())
+        self.assertEqual(decoder.buffered(), 0)
+
+    def test_max_size(self):
+        decoder = FrameDecoder(10)
+        decoder.feed(_frame(b'a' * 11))
+        self.assertRaises(ValueError, decoder.next_frame)
+
+    def test_recv_into(self):
+        left, right = socket.socketpair()
+        decoder = FrameDecoder(1024 * 1024, 64)
+        bodies = [b'a' * 10, b'b' * 200000, b'c']
+        left.sendall(b''.join(_frame(body) for body in bodies))
+        left.close()
+
+        frames = []
+        while decoder.recv_into(right):
+            frames.extend(bytes(frame) for frame in decoder.frames())
+        right.close()
+        self.assertEqual(frames, bodies)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import json
+import socket
+import struct
+import time
+import unittest
+
+from pyfastocloud.client import make_utc_timestamp_msec
+from pyfastocloud.client_constants import ClientStatus
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.heartbeat import Heartbeat
+
+
+def _read_request(sock: socket.socket, compressor: CompressorZlib) -> dict:
+    data_size = struct.unpack('>I', sock.recv(4, socket.MSG_WAITALL))[0]
+    return json.loads(compressor.decompress(sock.recv(data_size, socket.MSG_WAITALL)))
+
+
+class HeartbeatTest(unittest.TestCase):
+    def test_timestamp(self):
+        self.assertAlmostEqual(make_utc_timestamp_msec(), time.time() * 1000, delta=50)
+
+    def test_rtt(self):
+        left, right = socket.socketpair()
+        compressor = CompressorZlib(True)
+        client = FastoCloudClient('localhost', 0, None, None)
+        client.attach_socket(left)
+        client._set_state(ClientStatus.ACTIVE)
+        res, cid = client.ping(1)
+        self.assertTrue(res)
+        req = _read_request(right, compressor)
+
+        sent = req['params']['timestamp']
+        time.sleep(0.02)
+        remote = make_utc_timestamp_msec() + 5000
+        reply = {'jsonrpc': '2.0', 'id': cid, 'result': {'timestamp': remote}}
+        client.process_commands(compressor.compress(json.dumps(reply).encode()))
+        self.assertGreaterEqual(client.rtt, 20)
+        self.assertLess(client.rtt, 1000)
+        self.assertAlmostEqual(client.clock_offset, 5000 + client.rtt // 2, delta=5)
+        self.assertEqual(remote - (2 * sent + client.rtt) // 2, client.clock_offset)
+        self.assertGreater(client.last_seen, 0)
+        left.close()
+        right.close()
+
+    def test_dead(self):
+        left, right = socket.socketpair()
+        compressor = CompressorZlib(True)
+        clients = [FastoCloudClient('localhost', i, None, None) for i in range(3)]
+        clients[0].attach_socket(left)
+        clients[0]._set_state(ClientStatus.ACTIVE)
+
+        now = time.monotonic()
+        heartbeat = Heartbeat(interval=1, max_missed=2, clock=lambda: now)
+        for client in clients:
+            heartbeat.add(client)
+        self.assertEqual(len(heartbeat), 3)
+        heartbeat.remove(clients[2])
+        self.assertNotIn(clients[2], heartbeat)
+
+        # client 0 sits in first slot, ping on every full interval
+        self.assertEqual(heartbeat.tick(now + 1), [])
+        self.assertEqual(_read_request(right, compressor)['method'], 'ping_service')
+        self.assertEqual(heartbeat.tick(now + 2), [])
+        self.assertEqual(heartbeat.missed(clients[0]), 1)
+
+        _read_request(right, compressor)
+        clients[0]._last_seen = now + 2.5
+        self.assertEqual(heartbeat.tick(now + 3), [])
+        self.assertEqual(heartbeat.missed(clients[0]), 0)
+
+        self.assertEqual(heartbeat.tick(now + 4), [])
+        self.assertEqual(heartbeat.tick(now + 5), [clients[0]])
+        self.assertFalse(clients[0].is_connected())
+        right.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import unittest
+
+from pyfastocloud.structs.ml.image_box_batch import ImageBoxBatch, np
+
+
+def _image(i: int) -> dict:
+    return {'unique_component_id': 1, 'class_id': i % 3, 'object_id': 1000 + i, 'confidence': 0.5,
+            'left': i, 'top': 2 * i, 'width': 64, 'height': 128}
+
+
+class ImageBoxBatchTest(unittest.TestCase):
+    def test_decode(self):
+        batch = ImageBoxBatch.make_entry({'id': 'stream', 'images': [_image(i) for i in range(10)]})
+        self.assertEqual(batch.sid, 'stream')
+        self.assertEqual(len(batch), 10)
+        self.assertEqual(list(batch.class_id), [i % 3 for i in range(10)])
+        box = batch[-1]
+        self.assertEqual(box.object_id, 1009)
+        self.assertAlmostEqual(box.confidence, 0.5)
+        self.assertEqual((box.rect.x, box.rect.y, box.rect.width, box.rect.height), (9, 18, 64, 128))
+        self.assertEqual([box.rect.y for box in batch][:3], [0, 2, 4])
+        self.assertRaises(IndexError, batch.__getitem__, 10)
+
+    def test_invalid(self):
+        images = [_image(0), {'class_id': 2.5, 'object_id': 7}, 'broken']
+        batch = ImageBoxBatch.make_entry({'id': 1, 'images': images})
+        self.assertIsNone(batch.sid)
+        self.assertEqual(list(batch.class_id), [0, 0, 0])
+        self.assertEqual(list(batch.object_id), [1000, 7, 0])
+        self.assertEqual(len(ImageBoxBatch.make_entry({})), 0)
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def test_numpy(self):
+        batch = ImageBoxBatch.make_entry({'id': 'stream', 'images': [_image(i) for i in range(4)]})
+        records = batch.to_numpy()
+        self.assertEqual(list(records['object_id']), [1000, 1001, 1002, 1003])
+        self.assertEqual(int(batch.columns()['width'].sum()), 256)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+import unittest
+
+from pyfastocloud.json_rpc import Request, Response, parse_response_or_request
+from pyfastocloud.json_serializer import JsonStdSerializer, JsonOrjsonSerializer, make_json_serializer, orjson
+
+
+class JsonSerializerTest(unittest.TestCase):
+    def _check(self, serializer):
+        req = Request('0000000000000001', 'start_stream', {'config': {'id': 'abc', 'input': [{'id': 0}]}})
+        data = serializer.dumps(req.to_dict())
+        self.assertIsInstance(data, bytes)
+        parsed_req, parsed_resp = parse_response_or_request(memoryview(data), serializer)
+        self.assertIsNone(parsed_resp)
+        self.assertEqual(parsed_req.id, req.id)
+        self.assertEqual(parsed_req.method, req.method)
+        self.assertEqual(parsed_req.params, req.params)
+
+        resp = Response('0000000000000001', None, {'code': -32000, 'message': 'fail'})
+        parsed_req, parsed_resp = parse_response_or_request(serializer.dumps(resp.to_dict()), serializer)
+        self.assertIsNone(parsed_req)
+        self.assertTrue(parsed_resp.is_error())
+
+        self.assertEqual(parse_response_or_request(b'{broken', serializer), (None, None))
+        self.assertEqual(parse_response_or_request(b'1', serializer), (None, None))
+
+    def test_std(self):
+        self._check(JsonStdSerializer())
+
+    @unittest.skipIf(orjson is None, 'orjson not installed')
+    def test_orjson(self):
+        self._check(JsonOrjsonSerializer())
+        self.assertEqual(make_json_serializer().name(), 'orjson')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import json
+import unittest
+
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.json_rpc import Request
+from pyfastocloud.json_stream import StreamedArray, iter_array, response_id
+
+
+def _chunks(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class _Handler(IClientHandler):
+    def __init__(self):
+        self.responses = []
+
+    def process_response(self, client, req, resp):
+        self.responses.append((req, resp, list(resp.result) if isinstance(resp.result, StreamedArray) else None))
+
+    def process_request(self, client, req):
+        pass
+
+    def on_client_state_changed(self, client, status):
+        pass
+
+
+class _CountingCompressor(CompressorZlib):
+    def __init__(self):
+        super(_CountingCompressor, self).__init__(True)
+        self.inflated = 0
+
+    def decompress(self, data: bytes) -> bytes:
+        self.inflated += len(data)
+        return super(_CountingCompressor, self).decompress(data)
+
+    def decompress_chunks(self, data: bytes, chunk_size: int):
+        self.inflated += len(data)
+        return super(_CountingCompressor, self).decompress_chunks(data, chunk_size)
+
+
+class JsonStreamTest(unittest.TestCase):
+    VODS = [{'name': 'Movie é {0}'.format(i), 'duration': 5400000 + i, 'rating': i / 4} for i in range(500)]
+
+    def test_iter_array(self):
+        skip = [1, {'a': 'b]}"\\', 'c': [[], {}, -1.5e3, None]}, 'é\\"[', [[[2]]]]
+        message = {'jsonrpc': '2.0', 'skip': skip, 'result': {'count': 500, 'vods': self.VODS + [7, 88]},
+                   'id': '0000000000000003'}
+        data = json.dumps(message).encode()
+        for size in (1, 5, 64, len(data)):
+            chunks = _chunks(data, size)
+            self.assertEqual(list(iter_array(chunks, ('result', 'vods'))), self.VODS + [7, 88])
+            self.assertEqual(response_id(chunks), '0000000000000003')
+
+        self.assertEqual(list(iter_array([b'{"result": {"vods": [ ]}}'], ('result', 'vods'))), [])
+        self.assertEqual(list(iter_array([b'{"result": {"vods": 1}}'], ('result', 'vods'))), [])
+        self.assertEqual(list(iter_array([b'[1, 2]'], ('result',))), [])
+        self.assertRaises(ValueError, list, iter_array([b'{"a": [1 2]}'], ('a',)))
+        # numbers cut at chunk boundary after . or e
+        chunks = [b'{"result": {"total": 12.', b'5, "vods": [1.', b'25, 2e', b'3, 4]}}']
+        self.assertEqual(list(iter_array(chunks, ('result', 'vods'))), [1.25, 2000.0, 4])
+        self.assertEqual(response_id([b'{"id": "01", "result": []}']), '01')
+        self.assertIsNone(response_id([b'{"error": {"code": 1}, "id": "01"}']))
+        self.assertIsNone(response_id([b'{"result": [], "id": "01"']))
+        self.assertIsNone(response_id([b'{"method": "statistic_service", "params": {"id": "01"}}']))
+
+    def test_chunks(self):
+        compressor = CompressorZlib(True)
+        data = json.dumps(self.VODS).encode()
+        chunks = list(compressor.decompress_chunks(compressor.compress(data), 1024))
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+        self.assertEqual(b''.join(chunks), data)
+
+    def test_client(self):
+        compressor = CompressorZlib(True)
+        handler = _Handler()
+        client = FastoCloudClient('localhost', 0, handler, None, stream_threshold=256)
+        for cid, method in (('0000000000000003', 'scan_folder_vods'), ('0000000000000004', 'get_log_service')):
+            client._request_queue.push(cid, Request(cid, method, {}))
+        client.stream_results('scan_folder_vods', ('result', 'vods'))
+
+        reply = {'result': {'vods': self.VODS}, 'jsonrpc': '2.0', 'id': '0000000000000003'}
+        client.process_commands(compressor.compress(json.dumps(reply).encode()))
+        reply = {'result': {'vods': self.VODS}, 'jsonrpc': '2.0', 'id': '0000000000000004'}
+        client.process_commands(compressor.compress(json.dumps(reply).encode()))
+
+        (req, resp, items), (other_req, other_resp, _) = handler.responses
+        self.assertEqual(req.method, 'scan_folder_vods')
+        self.assertEqual(items, self.VODS)
+        self.assertEqual(next(iter(resp.result)), self.VODS[0])
+        self.assertEqual(other_req.method, 'get_log_service')
+        self.assertEqual(other_resp.result, {'vods': self.VODS})
+
+    def test_client_inflates_once(self):
+        compressor = _CountingCompressor()
+        handler = _Handler()
+        client = FastoCloudClient('localhost', 0, handler, None, compressor=compressor, stream_threshold=256)
+        cid = '0000000000000004'
+        client._request_queue.push(cid, Request(cid, 'get_log_service', {}))
+        client.stream_results('scan_folder_vods', ('result', 'vods'))
+
+        # id after result, whole frame is inflated to find it and reused by parser
+        frame = compressor.compress(json.dumps({'result': {'vods': self.VODS}, 'jsonrpc': '2.0', 'id': cid}).encode())
+        client.process_commands(frame)
+        self.assertEqual(compressor.inflated, len(frame))
+        self.assertEqual(handler.responses[0][1].result, {'vods': self.VODS})
+
+
+if __name__ == '__main__':
+    unittest.main()
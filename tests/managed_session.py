@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import json
+import socket
+import socketserver
+import struct
+import threading
+import unittest
+
+import pyfastocloud.socket.std as socket_mod
+from pyfastocloud.client_constants import ClientStatus
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.client_pool import ClientPool
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.managed_session import ManagedSession, PendingPolicy, Backoff
+
+
+class _NodeHandler(socketserver.BaseRequestHandler):
+    # first start_stream drops connection without reply
+    connections = []
+
+    def handle(self):
+        methods = []
+        _NodeHandler.connections.append(methods)
+        compressor = CompressorZlib(True)
+        stream = self.request.makefile('rb')
+        while True:
+            header = stream.read(4)
+            if len(header) < 4:
+                break
+            req = json.loads(compressor.decompress(stream.read(struct.unpack('>I', header)[0])))
+            methods.append((req['method'], req['id'], req['params']))
+            if req['method'] == 'start_stream' and len(_NodeHandler.connections) == 1:
+                break
+            compressed = compressor.compress(json.dumps({'jsonrpc': '2.0', 'id': req['id'], 'result': 'OK'}).encode())
+            self.request.sendall(struct.pack('>I', len(compressed)) + compressed)
+        self.request.shutdown(socket.SHUT_RDWR)
+
+
+class _Handler(IClientHandler):
+    def __init__(self):
+        self.responses = []
+        self.states = []
+
+    def process_response(self, client, req, resp):
+        self.responses.append((req.method, resp))
+
+    def process_request(self, client, req):
+        pass
+
+    def on_client_state_changed(self, client, status: ClientStatus):
+        self.states.append(status)
+
+
+class ManagedSessionTest(unittest.TestCase):
+    def test_backoff(self):
+        backoff = Backoff(1, 10, 2, rand=lambda: 1.0)
+        self.assertEqual([backoff.next_delay() for _ in range(6)], [1, 2, 4, 8, 10, 10])
+        backoff.reset()
+        self.assertEqual(backoff.next_delay(), 1)
+
+    def _poll(self, pool, predicate):
+        for _ in range(100):
+            if predicate():
+                return True
+            pool.poll(0.05)
+        return predicate()
+
+    def test_restore(self):
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _NodeHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+
+        handler = _Handler()
+        pool = ClientPool(socket_mod)
+        session = ManagedSession(FastoCloudClient, '127.0.0.1', port, handler, socket_mod,
+                                 policy=PendingPolicy.REPLAY, backoff=Backoff(0.01))
+        pool.add_session(session)
+        client = session.client
+        self.assertTrue(pool.connect(client))
+        self.assertTrue(self._poll(pool, client.is_connected))
+        client.activate(1, '123')
+        self.assertTrue(self._poll(pool, client.is_active))
+        client.prepare_service(2, '/f', '/t', '/h', '/v', '/c', '/p', '/d')
+        client.sync_service(3, [{'id': 'a'}, {'id': 'b'}])
+        self.assertTrue(self._poll(pool, lambda: len(handler.responses) == 3))
+        client.sync_service(4, [{'id': 'b'}, {'id': 'c'}], delta=True)
+        self.assertTrue(self._poll(pool, lambda: len(handler.responses) == 4))
+
+        res, cid = client.start_stream(5, {'id': 'c'})
+        self.assertTrue(res)
+        self.assertTrue(self._poll(pool, lambda: len(handler.responses) == 5))
+        method, resp = handler.responses[-1]
+        self.assertEqual(method, 'start_stream')
+        self.assertEqual(resp.id, cid)
+        self.assertTrue(resp.is_message())
+
+        restored = _NodeHandler.connections[1]
+        self.assertEqual([method for method, _, _ in restored],
+                         ['activate_request', 'prepare_service', 'sync_service', 'start_stream'])
+        self.assertEqual(restored[2][2], {'streams': [{'id': 'b'}, {'id': 'c'}]})
+        self.assertEqual(restored[3][1], cid)
+        self.assertEqual(handler.states.count(ClientStatus.ACTIVE), 2)
+        self.assertFalse(session.is_restoring())
+
+        session.close()
+        self.assertFalse(session.maintain(float('inf')))
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+    def test_connect_failed(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(('127.0.0.1', 0))
+        port = listener.getsockname()[1]
+        listener.close()
+
+        handler = _Handler()
+        pool = ClientPool(socket_mod)
+        backoff = Backoff(0.01)
+        session = ManagedSession(FastoCloudClient, '127.0.0.1', port, handler, socket_mod, backoff=backoff,
+                                 max_attempts=3)
+        self.assertEqual(session.client.connect_timeout, ManagedSession.DEFAULT_CONNECT_TIMEOUT)
+        pool.add_session(session)
+        # refused connects are retried by pool after backoff until attempts are exhausted
+        pool.connect(session.client)
+        self.assertTrue(self._poll(pool, lambda: backoff.attempt == 3 and not session.is_reconnecting()))
+        self.assertFalse(session.client.is_connected())
+        self.assertFalse(session.maintain(float('inf')))
+        pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+import json
+import socket
+import struct
+import unittest
+
+from pyfastocloud.compressor_zlib import CompressorZlib
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.metrics import MetricsRegistry
+
+
+class MetricsTest(unittest.TestCase):
+    def test_render(self):
+        left, right = socket.socketpair()
+        metrics = MetricsRegistry(rtt_buckets=(0.5, 1))
+        client = FastoCloudClient('localhost', 6317, None, None, metrics=metrics)
+        client.attach_socket(left)
+        self.assertEqual(client.activate(1, '123'), (True, '0000000000000001'))
+        self.assertEqual(client.activate(2, '123'), (True, '0000000000000002'))
+
+        compressor = CompressorZlib(True)
+        data_size = struct.unpack('>I', right.recv(4))[0]
+        right.recv(data_size, socket.MSG_WAITALL)
+        reply = json.dumps({'jsonrpc': '2.0', 'id': '0000000000000001', 'result': 'OK'}).encode()
+        compressed = compressor.compress(reply)
+        client.process_commands(compressed)
+
+        text = metrics.render()
+        labels = 'client="FastoCloudClient",node="localhost:6317"'
+        self.assertIn('pyfastocloud_frames_sent_total{%s} 2' % labels, text)
+        self.assertIn('pyfastocloud_frames_received_total{%s} 1' % labels, text)
+        self.assertIn('pyfastocloud_bytes_received_total{%s} %d' % (labels, len(compressed) + 4), text)
+        self.assertIn('pyfastocloud_send_calls_total{%s} 2' % labels, text)
+        self.assertIn('pyfastocloud_pending_requests{%s} 1' % labels, text)
+        method = labels + ',method="activate_request"'
+        self.assertIn('pyfastocloud_request_duration_seconds_bucket{%s,le="0.5"} 1' % method, text)
+        self.assertIn('pyfastocloud_request_duration_seconds_bucket{%s,le="+Inf"} 1' % method, text)
+        self.assertIn('pyfastocloud_request_duration_seconds_count{%s} 1' % method, text)
+        self.assertIn('# TYPE pyfastocloud_request_duration_seconds histogram', text)
+
+        del client
+        self.assertEqual(len(metrics), 0)
+        left.close()
+        right.close()
+
+    def test_disabled(self):
+        client = FastoCloudClient('localhost', 6317, None, None)
+        self.assertIsNone(client._metrics)
+        self.assertIsNone(client._request_queue.buckets)
+
+
+if __name__ == '__main__':
+    unittest.main()
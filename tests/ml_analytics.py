@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import unittest
+
+from pyfastocloud.json_rpc import Request
+from pyfastocloud.ml_analytics import MlAnalytics, iou, np
+
+
+def _notification(sid: str, boxes: list) -> Request:
+    images = [{'unique_component_id': 1, 'class_id': class_id, 'object_id': object_id, 'confidence': 0.9,
+               'left': left, 'top': 0, 'width': 10, 'height': 10} for class_id, object_id, left in boxes]
+    return Request(None, 'ml_notification_stream', {'id': sid, 'images': images})
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class MlAnalyticsTest(unittest.TestCase):
+    def test_iou(self):
+        boxes = np.array([[0, 0], [0, 0], [10, 10], [10, 10]], dtype=float)
+        moved = np.array([[0, 5], [0, 0], [10, 10], [10, 10]], dtype=float)
+        self.assertEqual(list(iou(boxes, moved)), [1.0, 50 / 150])
+
+    def test_analytics(self):
+        now = [0.0]
+        analytics = MlAnalytics(capacity=64, clock=lambda: now[0])
+        self.assertFalse(analytics.ingest(None, Request(None, 'ping_client', {})))
+        # object 1 moves slowly, object 2 jumps, object 3 disappears for one notification
+        frames = [[(0, 1, 0), (0, 2, 0), (1, 3, 0)],
+                  [(0, 1, 1), (0, 2, 50)],
+                  [(0, 1, 2), (0, 2, 51), (1, 3, 0)]]
+        for boxes in frames:
+            self.assertTrue(analytics.ingest(None, _notification('s', boxes)))
+            now[0] += 1
+
+        self.assertEqual(analytics.class_counts('s'), {0: 2, 1: 1})
+        self.assertEqual(analytics.occupancy('s'), {0: 2, 1: 1})
+        self.assertEqual(analytics.occupancy('s', since=1), {0: 2, 1: 1})
+        self.assertEqual(analytics.dwell_times('s'), {1: 2.0, 2: 2.0, 3: 2.0})
+        tracks = analytics.track_continuity('s', threshold=0.5)
+        self.assertEqual(tracks[1][1], 0)
+        self.assertEqual(tracks[2][1], 1)
+        self.assertEqual(tracks[3], (1.0, 1))
+        self.assertEqual(analytics.dwell_times('unknown'), {})
+
+    def test_bounded(self):
+        analytics = MlAnalytics(capacity=8)
+        for i in range(10):
+            analytics.ingest(None, _notification('s', [(0, i, 0), (0, i + 100, 0), (0, i + 200, 0)]))
+        window = analytics.window('s')
+        self.assertEqual(len(window), 8)
+        self.assertEqual(window.frame, 10)
+        self.assertEqual(sorted(analytics.dwell_times('s')), [8, 9, 107, 108, 109, 207, 208, 209])
+        analytics.remove('s')
+        self.assertNotIn('s', analytics)
+
+
+if __name__ == '__main__':
+    unittest.main()
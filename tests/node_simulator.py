@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import asyncio
+import unittest
+
+from pyfastocloud.client_asyncio import AsyncioClient
+from pyfastocloud.client_handler import IClientHandler
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.node_simulator import NodeSimulator
+
+
+class _Handler(IClientHandler):
+    def __init__(self):
+        self.methods = []
+
+    def process_response(self, client, req, resp):
+        pass
+
+    def process_request(self, client, req):
+        self.methods.append(req.method)
+
+    def on_client_state_changed(self, client, status):
+        pass
+
+
+class NodeSimulatorTest(unittest.TestCase):
+    def test_session(self):
+        async def run():
+            node = NodeSimulator(streams_count=10, statistic_interval=0.1, ml_rate=20, ping_interval=0.1,
+                                 license_key='123')
+            port = await node.start()
+            handler = _Handler()
+            client = AsyncioClient(FastoCloudClient, '127.0.0.1', port, handler)
+            self.assertTrue(await client.connect())
+
+            self.assertTrue((await client.activate(0, 'wrong')).is_error())
+            self.assertEqual((await client.activate(1, '123')).result, 'OK')
+            self.assertIn('timestamp', (await client.ping(2)).result)
+
+            with client.batch():
+                futures = [client.start_stream(10 + i, {'id': 'test_{0}'.format(i)}) for i in range(5)]
+            responses = await asyncio.gather(*futures)
+            self.assertTrue(all(resp.result == 'OK' for resp in responses))
+            self.assertEqual(len(next(iter(node.sessions)).streams), 15)
+
+            self.assertEqual((await client.stop_stream(20, 'test_0', False)).result, 'OK')
+            self.assertTrue((await client.stop_stream(21, 'test_0', False)).is_error())
+            result = (await client.scan_folder_vods(22, '/vods', ['mp4'], '')).result
+            self.assertEqual(len(result['vods']), 100)
+
+            await asyncio.sleep(0.5)
+            for method in ('quit_status_stream', 'statistic_stream', 'statistic_service', 'ml_notification_stream',
+                           'ping_client'):
+                self.assertIn(method, handler.methods)
+
+            client.disconnect()
+            await node.stop()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
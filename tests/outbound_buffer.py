@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import socket
+import unittest
+
+from pyfastocloud.outbound_buffer import OutboundBuffer
+
+
+class _ShortWriteSocket:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.data = b''
+        self.calls = 0
+
+    def sendmsg(self, buffers: list) -> int:
+        self.calls += 1
+        chunk = b''.join(bytes(buffer) for buffer in buffers)[:self.limit]
+        self.data += chunk
+        return len(chunk)
+
+    def send(self, data: bytes) -> int:
+        return self.sendmsg([data])
+
+
+class OutboundBufferTest(unittest.TestCase):
+    def test_short_writes(self):
+        sock = _ShortWriteSocket(7)
+        buffer = OutboundBuffer()
+        frames = [b'first', b'second', b'', b'third frame']
+        for frame in frames:
+            buffer.append(frame)
+        self.assertEqual(len(buffer), 22)
+        self.assertTrue(buffer.flush(sock))
+        self.assertEqual(sock.data, b''.join(frames))
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(sock.calls, 4)
+
+    def test_would_block(self):
+        left, right = socket.socketpair()
+        left.setblocking(False)
+        buffer = OutboundBuffer()
+        frame = b'x' * 65536
+        for _ in range(64):
+            buffer.append(frame)
+        self.assertFalse(buffer.flush(left))
+        self.assertGreater(len(buffer), 0)
+
+        received = 0
+        while len(buffer):
+            received += len(right.recv(1024 * 1024))
+            buffer.flush(left)
+        left.close()
+        while True:
+            data = right.recv(1024 * 1024)
+            if not data:
+                break
+            received += len(data)
+        right.close()
+        self.assertEqual(received, 64 * 65536)
+
+
+if __name__ == '__main__':
+    unittest.main()
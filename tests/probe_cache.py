@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import asyncio
+import unittest
+
+from pyfastocloud.client_asyncio import AsyncioClient
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.node_simulator import NodeSimulator
+from pyfastocloud.probe_cache import ProbeCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProbeCacheTest(unittest.TestCase):
+    def test_cache(self):
+        async def run():
+            node = NodeSimulator(response_delay=0.05)
+            port = await node.start()
+            client = AsyncioClient(FastoCloudClient, '127.0.0.1', port, None)
+            await client.connect()
+            await client.activate(client.next_command_id(), '123')
+            session = next(iter(node.sessions))
+
+            clock = _Clock()
+            cache = ProbeCache(client, 10, 2, clock)
+            url = {'id': 0, 'uri': 'udp://239.0.0.1:1234'}
+            results = await asyncio.gather(*[cache.probe_in_stream(dict(url)) for _ in range(10)])
+            self.assertEqual(session.requests_count, 2)
+            self.assertTrue(all(result is results[0] for result in results))
+            self.assertEqual((cache.misses, cache.joins), (1, 9))
+            self.assertEqual(len(results[0].streams), 2)
+
+            self.assertIs(await cache.probe_in_stream(url), results[0])
+            self.assertEqual(cache.hits, 1)
+            await cache.probe_out_stream(url)
+            self.assertEqual(session.requests_count, 3)
+
+            clock.now += 11
+            self.assertIsNot(await cache.probe_in_stream(url), results[0])
+            self.assertEqual(session.requests_count, 4)
+
+            await cache.probe_in_stream({'id': 0, 'uri': 'udp://239.0.0.2:1234'})
+            self.assertEqual(len(cache), 2)
+
+            client.disconnect()
+            await node.stop()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
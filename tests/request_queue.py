@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import unittest
+
+from pyfastocloud.json_rpc import Request
+from pyfastocloud.request_queue import RequestQueue
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RequestQueueTest(unittest.TestCase):
+    def test_pop(self):
+        clock = _Clock()
+        queue = RequestQueue(10, 2, clock)
+        self.assertTrue(queue.push('01', Request('01', 'ping_service', {})))
+        self.assertTrue(queue.push('02', Request('02', 'start_stream', {})))
+        self.assertFalse(queue.push('03', Request('03', 'start_stream', {})))
+        self.assertEqual(len(queue), 2)
+
+        clock.now += 0.5
+        req = queue.pop('01')
+        self.assertEqual(req.method, 'ping_service')
+        self.assertIsNone(queue.pop('01'))
+        self.assertEqual(queue.stats['ping_service'].count, 1)
+        self.assertAlmostEqual(queue.stats['ping_service'].mean, 0.5)
+        self.assertEqual(queue.remove('02').method, 'start_stream')
+        self.assertEqual(len(queue), 0)
+
+    def test_expire(self):
+        clock = _Clock()
+        queue = RequestQueue(5, 100, clock)
+        queue.push('01', Request('01', 'ping_service', {}))
+        queue.push('02', Request('02', 'sync_service', {}), 200)
+        clock.now += 3
+        queue.push('03', Request('03', 'ping_service', {}))
+        self.assertEqual(queue.expire(), [])
+
+        clock.now += 3
+        self.assertEqual([req.id for req in queue.expire()], ['01'])
+        clock.now += 3
+        self.assertEqual([req.id for req in queue.expire()], ['03'])
+        self.assertEqual(queue.stats['ping_service'].timeouts, 2)
+
+        clock.now += 150
+        self.assertEqual(queue.expire(), [])
+        self.assertIn('02', queue)
+        clock.now += 50
+        self.assertEqual([req.id for req in queue.expire()], ['02'])
+        self.assertEqual(len(queue), 0)
+
+    def test_bytes(self):
+        clock = _Clock()
+        queue = RequestQueue(5, 100, clock)
+        queue.push('01', Request('01', 'ping_service', {}), size=100)
+        queue.push('02', Request('02', 'start_stream', {}), size=50)
+        queue.push('03', Request('03', 'start_stream', {}), 20, size=10)
+        self.assertEqual(queue.bytes, 160)
+        self.assertFalse(queue.push('01', Request('01', 'stop_stream', {}), size=10))
+        self.assertEqual(queue.get('01').method, 'ping_service')
+        self.assertEqual(queue.bytes, 160)
+        queue.pop('02')
+        self.assertEqual(queue.bytes, 110)
+        clock.now += 6
+        queue.expire()
+        self.assertEqual(queue.bytes, 10)
+        queue.clear()
+        self.assertEqual(queue.bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import unittest
+
+from pyfastocloud.json_rpc import Request
+from pyfastocloud.statistics_store import StatisticsStore, StatisticsRing, np
+
+
+class _Node:
+    host = 'localhost'
+    port = 6317
+
+
+def _stream_stat(sid: str, ts: int, bps: int) -> Request:
+    return Request(None, 'statistic_stream', {'id': sid, 'timestamp': ts, 'cpu': 1.5, 'rss': 100, 'restarts': 0,
+                                              'status': 4, 'input_streams': [{'id': 0, 'bps': bps}],
+                                              'output_streams': [{'id': 0, 'bps': bps // 2}]})
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class StatisticsStoreTest(unittest.TestCase):
+    def test_ring(self):
+        ring = StatisticsRing(('timestamp', 'value'), 4)
+        for i in range(6):
+            ring.append('a', (i * 1000, i))
+        self.assertEqual(ring.count('a'), 4)
+        self.assertEqual(list(ring.column('a', 'value')), [2, 3, 4, 5])
+        self.assertEqual(list(ring.column('a', 'value', 2)), [4, 5])
+        self.assertEqual(ring.mean('a', 'value', 4000), 4.5)
+        self.assertEqual(ring.max('a', 'value', 0), 5)
+        self.assertIsNone(ring.mean('b', 'value', 0))
+
+        for i in range(100):
+            ring.append(i, (0, i))
+        self.assertEqual(ring.top('value', 3), [(99, 99.0), (98, 98.0), (97, 97.0)])
+        self.assertEqual(ring.top('value', 0), [])
+        self.assertEqual(ring.top('value', -1), [])
+        ring.remove('a')
+        self.assertNotIn('a', ring)
+        self.assertEqual(len(ring), 100)
+
+    def test_store(self):
+        store = StatisticsStore(8)
+        for ts in range(10):
+            for sid in range(5):
+                self.assertTrue(store.ingest(_Node(), _stream_stat(str(sid), ts * 1000, (sid + 1) * 1000 + ts)))
+        self.assertTrue(store.ingest(_Node(), Request(None, 'statistic_service', {'timestamp': 1, 'cpu': 12.5})))
+        self.assertFalse(store.ingest(_Node(), Request(None, 'quit_status_stream', {'id': '1'})))
+
+        self.assertEqual(store.streams.count('0'), 8)
+        self.assertEqual([sid for sid, _ in store.top_streams_by_bitrate(2)], ['4', '3'])
+        self.assertEqual(store.streams.column('1', 'output_bps', 1)[0], (2000 + 9) // 2)
+        self.assertEqual(store.nodes.column('localhost:6317', 'cpu')[0], 12.5)
+
+        # malformed values of node payload are recorded as zeros
+        self.assertTrue(store.ingest(_Node(), Request(None, 'statistic_stream', {
+            'id': 'bad', 'timestamp': 1, 'cpu': 'high', 'rss': None,
+            'input_streams': [{'bps': '100'}, None, {'bps': 7}], 'output_streams': {'bps': 1}})))
+        self.assertEqual(list(store.streams.column('bad', 'cpu')), [0])
+        self.assertEqual(list(store.streams.column('bad', 'rss')), [0])
+        self.assertEqual(list(store.streams.column('bad', 'input_bps')), [7])
+        self.assertEqual(list(store.streams.column('bad', 'output_bps')), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import asyncio
+import unittest
+
+from pyfastocloud.client_asyncio import AsyncioClient
+from pyfastocloud.fastocloud_client import FastoCloudClient
+from pyfastocloud.node_simulator import NodeSimulator
+from pyfastocloud.streams_sync import StreamsSyncState
+
+
+class _RecordingClient(FastoCloudClient):
+    def __init__(self, *args, **kwargs):
+        super(_RecordingClient, self).__init__(*args, **kwargs)
+        self.sent = []
+
+    def _send_request(self, command_id, method: str, params):
+        self.sent.append(params)
+        return super(_RecordingClient, self)._send_request(command_id, method, params)
+
+
+def _streams(count: int) -> list:
+    return [{'id': str(i), 'input': [{'id': 0, 'uri': 'udp://239.0.0.{0}:1234'.format(i)}]} for i in range(count)]
+
+
+class StreamsSyncTest(unittest.TestCase):
+    def test_diff(self):
+        state = StreamsSyncState('id')
+        self.assertFalse(state.is_known())
+        streams = _streams(5)
+        state.begin('01', state.snapshot(streams))
+        state.commit('01')
+        self.assertTrue(state.is_known())
+
+        streams[1] = {'id': '1', 'input': []}
+        del streams[2]
+        streams.append({'id': '10', 'input': []})
+        changed, removed, snapshot = state.diff(streams)
+        self.assertEqual([stream['id'] for stream in changed], ['1', '10'])
+        self.assertEqual(removed, ['2'])
+
+        state.begin('02', snapshot)
+        state.abort('02')
+        self.assertFalse(state.is_known())
+
+    def test_delta_sync(self):
+        async def run():
+            node = NodeSimulator()
+            port = await node.start()
+            client = AsyncioClient(_RecordingClient, '127.0.0.1', port, None)
+            await client.connect()
+            await client.activate(0, '123')
+            session = next(iter(node.sessions))
+
+            streams = _streams(100)
+            self.assertEqual((await client.sync_service(1, streams, delta=True)).result, 'OK')
+            self.assertEqual(len(session.streams), 100)
+
+            streams[5] = {'id': '5', 'input': []}
+            del streams[7]
+            self.assertEqual((await client.sync_service(2, streams, delta=True)).result, 'OK')
+            self.assertEqual(session.streams, {stream['id']: stream for stream in streams})
+            self.assertEqual(client.sent[-1], {'streams': [streams[5]], 'removed_streams': ['7'], 'delta': True})
+
+            client.disconnect()
+            await client.connect()
+            await client.activate(3, '123')
+            await client.sync_service(4, streams, delta=True)
+            self.assertEqual(client.sent[-1], {'streams': streams})
+
+            client.disconnect()
+            await node.stop()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()